@@ -0,0 +1,56 @@
+# alias_sampler.py
+import random
+from typing import Generic, List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+class AliasTable(Generic[T]):
+    """
+    Walker's alias method: after an O(n) build, each weighted draw costs one
+    random number and one table lookup, however many items there are.
+    """
+
+    def __init__(self, items: Sequence[T], weights: Sequence[float]):
+        if len(items) != len(weights) or not items:
+            raise ValueError("AliasTable needs one positive weight per item, and at least one item")
+        total = float(sum(weights))
+        if total <= 0 or any(weight < 0 for weight in weights):
+            raise ValueError("Alias weights must be non-negative with a positive total")
+
+        count = len(items)
+        self.items: List[T] = list(items)
+        self.probability: List[float] = [weight * count / total for weight in weights]
+        self.alias: List[int] = list(range(count))
+
+        small = [i for i, p in enumerate(self.probability) if p < 1.0]
+        large = [i for i, p in enumerate(self.probability) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.alias[less] = more
+            self.probability[more] -= 1.0 - self.probability[less]
+            (small if self.probability[more] < 1.0 else large).append(more)
+        for i in small + large:  # Leftovers are 1.0 up to rounding error
+            self.probability[i] = 1.0
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def index(self, rng=random) -> int:
+        u = rng.random() * len(self.items)
+        column = int(u)
+        return column if u - column < self.probability[column] else self.alias[column]
+
+    def sample(self, rng=random) -> T:
+        return self.items[self.index(rng)]
+
+    def sample_many(self, count: int, rng=random) -> List[T]:
+        items, probability, alias, n = self.items, self.probability, self.alias, len(self.items)
+        draw = rng.random
+        result = []
+        append = result.append
+        for _ in range(count):
+            u = draw() * n
+            column = int(u)
+            append(items[column] if u - column < probability[column] else items[alias[column]])
+        return result
@@ -0,0 +1,96 @@
+# async_game.py
+import asyncio
+import time
+from typing import AsyncIterator, List, Optional, Sequence
+from battle_policy import AutoPlayPolicy, BattleEvent, Decision, GamePhase, GamePolicy, NullSink
+from game_engine import GameEngine
+from game_rng import GameRNG
+
+
+class QueueSink:
+    """
+    Queues every event for async consumers, after forwarding it to `inner`.
+    """
+
+    def __init__(self, queue: asyncio.Queue, inner=None):
+        self.queue = queue
+        self.inner = inner
+
+    def emit(self, kind: str, **data):
+        if self.inner is not None:
+            self.inner.emit(kind, **data)
+        self.queue.put_nowait(BattleEvent(kind, data))
+
+
+class AsyncGame:
+    """
+    asyncio front-end for a GameEngine.
+
+    Each step runs the engine to its next decision (never waiting on input)
+    and then yields to the event loop, so one process can host many games,
+    each driven by a policy or by commands from a UI or network client.
+    """
+
+    def __init__(self, engine: GameEngine, queue_events: bool = True):
+        self.engine = engine
+        self.events: asyncio.Queue = asyncio.Queue()
+        if queue_events:
+            engine.sink = QueueSink(self.events, engine.sink)
+
+    @property
+    def pending(self) -> Optional[Decision]:
+        return self.engine.pending
+
+    async def start(self) -> Optional[Decision]:
+        decision = self.engine.start()
+        await asyncio.sleep(0)
+        return decision
+
+    async def submit(self, answer) -> Optional[Decision]:
+        decision = self.engine.submit(answer)
+        await asyncio.sleep(0)
+        return decision
+
+    async def play(self, policy: Optional[GamePolicy] = None) -> str:
+        """
+        Plays the game to the end with `policy` (default: the engine's) and
+        returns the winner, yielding to the loop after every decision.
+        """
+        policy = policy or self.engine.policy
+        decision = await self.start()
+        while decision is not None:
+            decision = await self.submit(policy.decide(self.engine, decision))
+        return self.engine.winner
+
+    async def stream(self) -> AsyncIterator[BattleEvent]:
+        """
+        Yields game events as they happen, until the game is over.
+        """
+        while True:
+            if self.events.empty() and self.engine.phase is GamePhase.GAME_OVER:
+                return
+            yield await self.events.get()
+
+
+async def play_games(tables: Sequence[Sequence[str]], seed=0,
+                     policy: Optional[GamePolicy] = None) -> List[str]:
+    """
+    Plays one headless game per table of player names concurrently in this
+    process and returns the winners.
+    """
+    policy = policy or AutoPlayPolicy()
+    games = []
+    for index, names in enumerate(tables):
+        engine = GameEngine(policy=policy, sink=NullSink(), rng=GameRNG(seed).spawn(index))
+        for name in names:
+            engine.add_player(name)
+        games.append(AsyncGame(engine, queue_events=False).play())
+    return await asyncio.gather(*games)
+
+
+if __name__ == "__main__":
+    tables = [[f"table{t}-p{p}" for p in range(4)] for t in range(500)]
+    started = time.perf_counter()
+    winners = asyncio.run(play_games(tables))
+    elapsed = time.perf_counter() - started
+    print(f"{len(winners)} concurrent games in {elapsed:.2f}s on one event loop")
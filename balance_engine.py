@@ -0,0 +1,192 @@
+# balance_engine.py
+import copy
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+import numpy as np
+from security_common import SecurityStrategy
+from security_measures import SecurityMeasures
+from threat import Threat
+from vpc_defender import VPCDefender
+
+# Measure catalog order used by the `active` masks passed to BalanceBatch.
+MEASURES = SecurityMeasures().measures
+MEASURE_KEYS: Tuple[str, ...] = tuple(m.name.lower() for m in MEASURES)
+OFFENSIVE_EFFECTIVENESS = np.array(
+    [m.effectiveness if m.strategy == SecurityStrategy.OFFENSIVE else 0 for m in MEASURES], dtype=np.int64)
+DEFENSIVE_MASK = np.array([m.strategy == SecurityStrategy.DEFENSIVE for m in MEASURES], dtype=bool)
+DEFENSIVE_EFFECTIVENESS = np.array(
+    [m.effectiveness if m.strategy == SecurityStrategy.DEFENSIVE else 0 for m in MEASURES], dtype=np.int64)
+
+# Threat.calculate_damage rolls randint(power - 5, power + 5).
+DAMAGE_SPREAD = 5
+
+
+@dataclass
+class BalanceBatch:
+    """
+    Struct-of-arrays description of N independent defender vs threat battles.
+    """
+    agility: np.ndarray
+    fault_tolerance: np.ndarray
+    resilience: np.ndarray
+    health: np.ndarray
+    active: np.ndarray  # (N, len(MEASURES)) bool mask of active measures
+    power: np.ndarray
+    persistence: np.ndarray
+    adaptability: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.power)
+
+    @classmethod
+    def from_objects(cls, defenders: Sequence[VPCDefender], threats: Sequence[Threat]) -> 'BalanceBatch':
+        """
+        Builds a batch from existing defender/threat objects (paired by index).
+        Status effects are not modelled; build batches from defenders without any.
+        """
+        active = np.zeros((len(defenders), len(MEASURES)), dtype=bool)
+        for row, defender in enumerate(defenders):
+            for measure in defender.active_measures:
+                active[row, measure.id] = True
+        return cls(
+            agility=np.array([d.stats.agility for d in defenders], dtype=np.int64),
+            fault_tolerance=np.array([d.stats.fault_tolerance for d in defenders], dtype=np.int64),
+            resilience=np.array([d.stats.resilience for d in defenders], dtype=np.int64),
+            health=np.array([d.current_health for d in defenders], dtype=np.int64),
+            active=active,
+            power=np.array([t.power for t in threats], dtype=np.int64),
+            persistence=np.array([t.persistence for t in threats], dtype=np.int64),
+            adaptability=np.array([t.adaptability for t in threats], dtype=np.int64),
+        )
+
+    @property
+    def offensive_power(self) -> np.ndarray:
+        return self.active @ OFFENSIVE_EFFECTIVENESS
+
+    @property
+    def defensive_power(self) -> np.ndarray:
+        return self.active @ DEFENSIVE_EFFECTIVENESS
+
+    @property
+    def has_defense(self) -> np.ndarray:
+        return (self.active & DEFENSIVE_MASK).any(axis=1)
+
+
+@dataclass
+class BalanceResult:
+    """
+    Per-battle outcomes of a simulated batch.
+    """
+    wins: np.ndarray
+    defender_alive: np.ndarray
+    rounds: np.ndarray
+    damage: np.ndarray
+
+    @property
+    def win_rate(self) -> float:
+        return float(self.wins.mean()) if len(self.wins) else 0.0
+
+    @property
+    def loss_rate(self) -> float:
+        return float((~self.defender_alive).mean()) if len(self.wins) else 0.0
+
+    def round_histogram(self) -> np.ndarray:
+        """
+        Number of battles that lasted 0, 1, 2, ... rounds.
+        """
+        return np.bincount(self.rounds)
+
+    def damage_histogram(self, bins=20) -> Tuple[np.ndarray, np.ndarray]:
+        return np.histogram(self.damage, bins=bins)
+
+
+def draw_damage_offsets(seed, battles: int, turns: int) -> np.ndarray:
+    """
+    Pre-draws the damage roll offsets (0..2*DAMAGE_SPREAD) for every threat turn.
+    """
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 2 * DAMAGE_SPREAD + 1, size=(battles, max(turns, 1)))
+
+
+def simulate(batch: BalanceBatch, seed=None, offsets: np.ndarray = None) -> BalanceResult:
+    """
+    Runs every battle in the batch to completion with an always-attack defender.
+
+    Mirrors SecurityBattle.player_turn/threat_turn and Threat.calculate_damage
+    step for step, so each battle matches the scalar code fed the same rolls.
+    """
+    n = len(batch)
+    power = batch.power.copy()
+    persistence = batch.persistence.copy()
+    health = batch.health.copy()
+    if offsets is None:
+        offsets = draw_damage_offsets(seed, n, int(persistence.max(initial=0)))
+
+    counter_damage = np.trunc(batch.offensive_power * (1 + batch.agility / 100)).astype(np.int64)
+    defense = batch.defensive_power
+    has_defense = batch.has_defense
+    damage_reduction = (batch.fault_tolerance + batch.resilience) / 100
+    adaptability_factor = batch.adaptability / 10
+
+    rows = np.arange(n)
+    last_turn = offsets.shape[1] - 1
+    turns = np.zeros(n, dtype=np.int64)
+    rounds = np.zeros(n, dtype=np.int64)
+    damage = np.zeros(n, dtype=np.int64)
+    active = (health > 0) & (persistence > 0)
+    while active.any():
+        # Defender attacks
+        power[active] -= counter_damage[active]
+        persistence[active] -= 1
+        rounds[active] += 1
+
+        # Threat strikes back if it still has power
+        hit = active & (power > 0)
+        roll = power - DAMAGE_SPREAD + offsets[rows, np.minimum(turns, last_turn)]
+        base = np.trunc(roll * (1 + persistence / 10 + adaptability_factor))
+        # Each defensive measure clamps at zero; with none active there is no clamp
+        base = np.where(has_defense, np.maximum(0, base - defense), base)
+        dealt = np.maximum(0, np.trunc(base * (1 - damage_reduction)).astype(np.int64))
+        dealt = np.where(hit, np.minimum(dealt, health), 0)
+        health -= dealt
+        damage += dealt
+        turns += hit
+
+        active = (health > 0) & (persistence > 0)
+
+    alive = health > 0
+    return BalanceResult(wins=alive & (power <= 0), defender_alive=alive, rounds=rounds, damage=damage)
+
+
+class _OffsetRoller:
+    """
+    Feeds pre-drawn offsets to Threat.calculate_damage in place of random.
+    """
+
+    def __init__(self, offsets: np.ndarray):
+        self.offsets = iter(offsets.tolist())
+
+    def randint(self, a: int, b: int) -> int:
+        return a + next(self.offsets)
+
+
+def scalar_mismatches(defenders: Sequence[VPCDefender], threats: Sequence[Threat], seed) -> List[int]:
+    """
+    Replays each battle through SecurityBattle with the batch's rolls and
+    returns the indices whose outcome differs from `simulate`.
+    """
+    from battle_sim import run_headless_battle
+
+    batch = BalanceBatch.from_objects(defenders, threats)
+    offsets = draw_damage_offsets(seed, len(batch), int(batch.persistence.max(initial=0)))
+    result = simulate(batch, offsets=offsets)
+    mismatches = []
+    for i, (defender, threat) in enumerate(zip(defenders, threats)):
+        outcome = run_headless_battle(copy.deepcopy(defender), copy.deepcopy(threat),
+                                      max_rounds=None, rng=_OffsetRoller(offsets[i]))
+        if (outcome.threat_defeated and outcome.defender_alive, outcome.defender_alive,
+                outcome.rounds, outcome.damage_taken) != (
+                bool(result.wins[i]), bool(result.defender_alive[i]),
+                int(result.rounds[i]), int(result.damage[i])):
+            mismatches.append(i)
+    return mismatches
@@ -0,0 +1,299 @@
+# battle_policy.py
+import random
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from security_battle import SecurityBattle
+
+ATTACK = "attack"
+CAST_SPELL = "cast spell"
+
+
+class GamePhase(Enum):
+    """
+    The decision a game is waiting for (or GAME_OVER).
+    """
+    MOVE = "move"
+    SETUP = "setup"
+    MEASURE = "measure"
+    BATTLE_ACTION = "battle_action"
+    BATTLE_SPELL = "battle_spell"
+    CONTINUE = "continue"
+    GAME_OVER = "game_over"
+
+
+@dataclass
+class Decision:
+    """
+    A pending player decision: what is being asked, of whom, and the answers
+    a front-end can offer. Policies answer it through decide().
+    """
+    phase: GamePhase
+    player: Any = None
+    defender: Any = None
+    battle: Optional['SecurityBattle'] = None
+    turn: int = 0
+    options: Tuple[str, ...] = ()
+
+
+class BattlePolicy(ABC):
+    """
+    Decides the defender's action on each of its turns in a SecurityBattle.
+    """
+
+    @abstractmethod
+    def choose_action(self, battle: 'SecurityBattle') -> str:
+        """
+        Returns ATTACK or CAST_SPELL (anything else skips the turn).
+        """
+
+    def choose_spell(self, battle: 'SecurityBattle') -> str:
+        """
+        Returns the key of the spell to cast after CAST_SPELL was chosen.
+        """
+        return next(iter(getattr(battle.defender, "spells", {})), "")
+
+    def decide(self, engine, decision: Decision):
+        """
+        Answers a pending decision by dispatching to the choose_* methods.
+        """
+        if decision.phase is GamePhase.BATTLE_ACTION:
+            return self.choose_action(decision.battle)
+        if decision.phase is GamePhase.BATTLE_SPELL:
+            return self.choose_spell(decision.battle)
+        raise ValueError(f"{type(self).__name__} cannot decide {decision.phase.value}")
+
+
+class GamePolicy(BattlePolicy):
+    """
+    Extends a battle policy with the out-of-battle decisions GameEngine asks for.
+
+    The defaults make a simple automated player: roll to move, buy the cheapest
+    affordable measure when none is active, then stop after one turn.
+    """
+
+    def choose_move(self, engine, player) -> str:
+        """
+        Returns 'roll' or 'draw'.
+        """
+        return "roll"
+
+    def choose_setup_action(self, engine, defender) -> str:
+        """
+        Returns 'measure' to implement another measure or 'done' to finish setup.
+        """
+        return "done" if defender.active_measures else "measure"
+
+    def choose_measure(self, engine, defender) -> str:
+        """
+        Returns the key of the measure to implement.
+        """
+        candidates = [m for m in defender.catalog
+                      if m not in defender.active_measures and m.cost <= defender.preparation_points]
+        return min(candidates, key=lambda m: m.cost).name.lower() if candidates else ""
+
+    def choose_continue(self, engine, player, turn: int) -> bool:
+        """
+        Returns True to play another turn in the current session.
+        """
+        return False
+
+    def decide(self, engine, decision: Decision):
+        phase = decision.phase
+        if phase is GamePhase.MOVE:
+            return self.choose_move(engine, decision.player)
+        if phase is GamePhase.SETUP:
+            return self.choose_setup_action(engine, decision.defender)
+        if phase is GamePhase.MEASURE:
+            return self.choose_measure(engine, decision.defender)
+        if phase is GamePhase.CONTINUE:
+            return self.choose_continue(engine, decision.player, decision.turn)
+        return super().decide(engine, decision)
+
+
+class ConsolePolicy(GamePolicy):
+    """
+    Interactive policy that asks the player through input().
+    """
+
+    def choose_action(self, battle: 'SecurityBattle') -> str:
+        return input("Do you want to 'attack' or 'cast spell'? ").strip().lower()
+
+    def choose_spell(self, battle: 'SecurityBattle') -> str:
+        print("Available Spells:")
+        for key, spell in battle.defender.spells.items():
+            print(f"- {key}: {spell.description}")
+        return input("Enter the spell key to cast: ").strip().lower()
+
+    def choose_move(self, engine, player) -> str:
+        return input("Do you want to 'roll' the die or 'draw' a card to move? (roll/draw): ").strip().lower()
+
+    def choose_setup_action(self, engine, defender) -> str:
+        return input("Enter 'measure' to implement a security measure or 'done' to finish setup: ").strip().lower()
+
+    def choose_measure(self, engine, defender) -> str:
+        return input("Enter the measure key to implement: ").strip().lower()
+
+    def choose_continue(self, engine, player, turn: int) -> bool:
+        return input("Do you want to continue to the next turn? (yes/no): ").strip().lower() == 'yes'
+
+
+class AlwaysAttackPolicy(GamePolicy):
+    """
+    Attacks every turn.
+    """
+
+    def choose_action(self, battle: 'SecurityBattle') -> str:
+        return ATTACK
+
+
+class AutoPlayPolicy(GamePolicy):
+    """
+    Automated player for AI-vs-AI games: attacks every turn, keeps one offensive
+    and one defensive measure active and plays `max_turns` turns per session.
+    """
+
+    def __init__(self, max_turns: int = 3):
+        self.max_turns = max_turns
+
+    def choose_action(self, battle: 'SecurityBattle') -> str:
+        return ATTACK
+
+    def _missing_measure(self, defender) -> Optional[str]:
+        strategies = {m.strategy for m in defender.active_measures}
+        for measures in (defender.offensive_measures, defender.defensive_measures):
+            affordable = [m for m in measures
+                          if m.strategy not in strategies and m.cost <= defender.preparation_points]
+            if affordable:
+                return min(affordable, key=lambda m: m.cost).name.lower()
+        return None
+
+    def choose_setup_action(self, engine, defender) -> str:
+        if self._missing_measure(defender) or not defender.active_measures:
+            return "measure"
+        return "done"
+
+    def choose_measure(self, engine, defender) -> str:
+        return self._missing_measure(defender) or super().choose_measure(engine, defender)
+
+    def choose_continue(self, engine, player, turn: int) -> bool:
+        return turn < self.max_turns
+
+
+class SpellFirstPolicy(GamePolicy):
+    """
+    Casts the first spell that is affordable and off cooldown, falling back to an attack.
+    """
+
+    def __init__(self):
+        self._next_spell: Optional[str] = None
+
+    def choose_action(self, battle: 'SecurityBattle') -> str:
+        self._next_spell = battle.defender.first_castable_spell()
+        return CAST_SPELL if self._next_spell else ATTACK
+
+    def choose_spell(self, battle: 'SecurityBattle') -> str:
+        return self._next_spell or ""
+
+
+class RandomPolicy(GamePolicy):
+    """
+    Picks uniformly between attacking and casting a random spell.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng or random.Random()
+
+    def choose_action(self, battle: 'SecurityBattle') -> str:
+        if getattr(battle.defender, "spells", None) and self.rng.random() < 0.5:
+            return CAST_SPELL
+        return ATTACK
+
+    def choose_spell(self, battle: 'SecurityBattle') -> str:
+        return self.rng.choice(list(battle.defender.spells))
+
+
+class ScriptedPolicy(GamePolicy):
+    """
+    Replays a fixed sequence of actions and spell keys, then repeats `default`.
+    """
+
+    def __init__(self, actions: Iterable[str], spells: Iterable[str] = (), default: str = ATTACK):
+        self.actions = iter(actions)
+        self.spells = iter(spells)
+        self.default = default
+
+    def choose_action(self, battle: 'SecurityBattle') -> str:
+        return next(self.actions, self.default)
+
+    def choose_spell(self, battle: 'SecurityBattle') -> str:
+        return next(self.spells, "")
+
+
+# Event sinks
+
+BATTLE_MESSAGES = {
+    "battle_start": "\nA threat '{threat}' has emerged! Preparing for battle...\n"
+                    "Defender: {defender}\nLevel: {level}\nHealth: {health}/{max_health}",
+    "round_start": "\n--- Round {round} ---",
+    "attack": "Attacked the threat! Dealt {damage} damage.",
+    "spell_cast": "{result}",
+    "invalid_action": "Invalid action. Skipping turn.",
+    "threat_attack": "The threat dealt {damage} damage to your defender.",
+    "status_expired": "{status} has worn off.",
+    "threat_neutralized": "Threat has been neutralized!",
+    "defender_defeated": "Defender has been defeated!",
+}
+
+
+@dataclass
+class BattleEvent:
+    kind: str
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+class NullSink:
+    """
+    Discards every event.
+    """
+
+    def emit(self, kind: str, **data):
+        pass
+
+
+class ConsoleSink:
+    """
+    Prints events using the same messages as the interactive game.
+    """
+
+    def __init__(self, messages: Optional[Dict[str, str]] = None):
+        self.messages = messages or BATTLE_MESSAGES
+
+    def format(self, kind: str, **data) -> Optional[str]:
+        """
+        The message for an event, or None if it has no message.
+        """
+        template = self.messages.get(kind)
+        if template is None:
+            return None
+        return template(**data) if callable(template) else template.format(**data)
+
+    def emit(self, kind: str, **data):
+        text = self.format(kind, **data)
+        if text is not None:
+            print(text)
+
+
+class RecordingSink:
+    """
+    Keeps every event in memory, e.g. for regression tests.
+    """
+
+    def __init__(self):
+        self.events: List[BattleEvent] = []
+
+    def emit(self, kind: str, **data):
+        self.events.append(BattleEvent(kind, data))
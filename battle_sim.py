@@ -0,0 +1,116 @@
+# battle_sim.py
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+from battle_policy import AlwaysAttackPolicy, BattlePolicy, NullSink
+from security_battle import SecurityBattle
+from threat import Threat
+from vpc_defender import VPCDefender
+
+NULL_SINK = NullSink()
+
+
+@dataclass
+class BattleResult:
+    """
+    Outcome of a single headless battle.
+    """
+    threat_defeated: bool
+    defender_alive: bool
+    rounds: int
+    damage_taken: int
+
+
+@dataclass
+class BattleSummary:
+    """
+    Aggregated outcome of many headless battles.
+    """
+    battles: int = 0
+    wins: int = 0
+    losses: int = 0
+    total_rounds: int = 0
+    total_damage: int = 0
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.battles if self.battles else 0.0
+
+    @property
+    def mean_rounds(self) -> float:
+        return self.total_rounds / self.battles if self.battles else 0.0
+
+    def add(self, result: BattleResult):
+        self.battles += 1
+        self.wins += result.defender_alive and result.threat_defeated
+        self.losses += not result.defender_alive
+        self.total_rounds += result.rounds
+        self.total_damage += result.damage_taken
+
+
+def run_headless_battle(defender: VPCDefender, threat: Threat,
+                        policy: Optional[BattlePolicy] = None, sink=None,
+                        max_rounds: Optional[int] = 100, rng=random) -> BattleResult:
+    """
+    Runs a battle without touching stdin/stdout and returns its outcome.
+    """
+    start_health = defender.current_health
+    battle = SecurityBattle(defender, threat,
+                            policy=policy or AlwaysAttackPolicy(),
+                            sink=sink or NULL_SINK,
+                            max_rounds=max_rounds,
+                            rng=rng)
+    battle.start_battle()
+    return BattleResult(
+        threat_defeated=battle.threat_defeated(),
+        defender_alive=defender.is_alive(),
+        rounds=battle.round - 1,
+        damage_taken=start_health - defender.current_health,
+    )
+
+
+def simulate_battles(defender_factory: Callable[[], VPCDefender],
+                     threat_factory: Callable[[], Threat],
+                     count: int,
+                     policy: Optional[BattlePolicy] = None,
+                     max_rounds: Optional[int] = 100,
+                     release_threat: Optional[Callable[[Threat], None]] = None) -> BattleSummary:
+    """
+    Runs `count` independent battles, each with a fresh defender and threat.
+    `release_threat` hands each finished threat back, e.g. to a ThreatRegistry pool.
+    """
+    summary = BattleSummary()
+    policy = policy or AlwaysAttackPolicy()
+    for _ in range(count):
+        threat = threat_factory()
+        summary.add(run_headless_battle(defender_factory(), threat,
+                                        policy=policy, max_rounds=max_rounds))
+        if release_threat is not None:
+            release_threat(threat)
+    return summary
+
+
+if __name__ == "__main__":
+    from character_stats import CharacterStats
+    from threat_generator import ThreatRegistry
+
+    template = VPCDefender(name="Benchmark Defender", stats=CharacterStats())
+    for key in ("firewall", "penetration test", "reconnaissance"):
+        template.add_active_measure(key)
+
+    def fresh_defender() -> VPCDefender:
+        template.current_health = template.max_health
+        return template
+
+    threats = ThreatRegistry.default()
+
+    def fresh_threat() -> Threat:
+        return threats.spawn("US East (N. Virginia)")
+
+    count = 100_000
+    started = time.perf_counter()
+    summary = simulate_battles(fresh_defender, fresh_threat, count, release_threat=threats.release)
+    elapsed = time.perf_counter() - started
+    print(f"{count} battles in {elapsed:.2f}s ({count / elapsed:,.0f} battles/s)")
+    print(f"Win rate: {summary.win_rate:.1%}, mean rounds: {summary.mean_rounds:.2f}")
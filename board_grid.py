@@ -0,0 +1,144 @@
+# board_grid.py
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+Cell = Tuple[int, int]  # (column, row), row 0 at the top
+
+NEIGHBOUR_OFFSETS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+@dataclass(frozen=True)
+class BoardTile:
+    """
+    One tile on the board: its index, service name, integer grid cell and
+    board-space centre.
+    """
+    index: int
+    name: str
+    cell: Cell
+    position: Tuple[float, float]
+
+
+class BoardGrid:
+    """
+    Integer-grid board model with a cell -> tile hash index and precomputed
+    adjacency, so picking and move validation are O(1). Boards may be
+    irregular: any set of cells can hold tiles.
+    """
+
+    def __init__(self, names: Sequence[str], cells: Sequence[Cell], spacing: float,
+                 origin: Tuple[float, float], half_size: Optional[float] = None):
+        self.spacing = spacing
+        self.origin = origin
+        self.half_size = spacing / 2 if half_size is None else half_size
+        ox, oy = origin
+        self.tiles: List[BoardTile] = [
+            BoardTile(index, name, cell, (ox + cell[0] * spacing, oy - cell[1] * spacing))
+            for index, (name, cell) in enumerate(zip(names, cells))
+        ]
+        self.by_cell: Dict[Cell, int] = {tile.cell: tile.index for tile in self.tiles}
+        self.by_name: Dict[str, int] = {tile.name: tile.index for tile in self.tiles}
+        self.adjacency: List[Tuple[int, ...]] = [
+            tuple(self.by_cell[(c + dc, r + dr)] for dc, dr in NEIGHBOUR_OFFSETS if (c + dc, r + dr) in self.by_cell)
+            for c, r in (tile.cell for tile in self.tiles)
+        ]
+        self._adjacent_sets: List[FrozenSet[int]] = [frozenset(n) for n in self.adjacency]
+        self._reachable: Dict[Tuple[int, int], FrozenSet[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.tiles)
+
+    @classmethod
+    def rectangular(cls, names: Sequence[str], columns: int, spacing: float,
+                    half_size: Optional[float] = None) -> 'BoardGrid':
+        """
+        Row-by-row layout centred on the origin, as create_board has always drawn it.
+        """
+        rows = math.ceil(len(names) / columns) if names else 0
+        cells = [(index % columns, index // columns) for index in range(len(names))]
+        return cls(names, cells, spacing, (-(columns * spacing) / 2, (rows * spacing) / 2), half_size)
+
+    @classmethod
+    def from_mask(cls, mask: Sequence[str], names: Sequence[str], spacing: float,
+                  half_size: Optional[float] = None) -> 'BoardGrid':
+        """
+        Irregular layout: every non-space, non-'.' character of `mask` is a tile,
+        filled with `names` in reading order.
+        """
+        cells = [(column, row) for row, line in enumerate(mask)
+                 for column, mark in enumerate(line) if mark not in " ."]
+        width = max((len(line) for line in mask), default=0)
+        names = list(names)[:len(cells)]
+        return cls(names, cells[:len(names)], spacing,
+                   (-(width * spacing) / 2, (len(mask) * spacing) / 2), half_size)
+
+    def pick(self, x: float, y: float) -> Optional[int]:
+        """
+        Index of the tile under a board-space point, or None.
+        """
+        ox, oy = self.origin
+        column = round((x - ox) / self.spacing)
+        row = round((oy - y) / self.spacing)
+        index = self.by_cell.get((column, row))
+        if index is None:
+            return None
+        tx, ty = self.tiles[index].position
+        if abs(x - tx) > self.half_size or abs(y - ty) > self.half_size:
+            return None
+        return index
+
+    def is_adjacent(self, source: int, target: int) -> bool:
+        return target in self._adjacent_sets[source]
+
+    def is_valid_move(self, source: int, target: int) -> bool:
+        """
+        A move may stay put or step to an orthogonal neighbour.
+        """
+        return source == target or target in self._adjacent_sets[source]
+
+    def reachable(self, source: int, steps: int) -> FrozenSet[int]:
+        """
+        Tiles reachable from `source` in at most `steps` moves (memoized).
+        """
+        key = (source, steps)
+        cached = self._reachable.get(key)
+        if cached is None:
+            distances = self._distances(source, limit=steps)
+            cached = self._reachable[key] = frozenset(distances)
+        return cached
+
+    def shortest_path(self, source: int, target: int) -> Optional[List[int]]:
+        """
+        Tile indices from `source` to `target` inclusive, or None if unreachable.
+        """
+        previous: Dict[int, Optional[int]] = {source: None}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            if current == target:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = previous[current]
+                return path[::-1]
+            for neighbour in self.adjacency[current]:
+                if neighbour not in previous:
+                    previous[neighbour] = current
+                    queue.append(neighbour)
+        return None
+
+    def _distances(self, source: int, limit: Optional[int] = None) -> Dict[int, int]:
+        distances = {source: 0}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            distance = distances[current]
+            if limit is not None and distance >= limit:
+                continue
+            for neighbour in self.adjacency[current]:
+                if neighbour not in distances:
+                    distances[neighbour] = distance + 1
+                    queue.append(neighbour)
+        return distances
@@ -0,0 +1,65 @@
+# board_renderer.py
+from typing import Dict, Optional, Sequence, Tuple
+from panda3d.core import (Geom, GeomNode, GeomTriangles, GeomVertexData, GeomVertexFormat,
+                          GeomVertexWriter, TransparencyAttrib)
+from board_grid import BoardGrid, BoardTile
+
+
+def build_tile_geometry(tiles: Sequence[BoardTile], uvs: Dict[str, Tuple[float, float, float, float]],
+                        half_size: float, name: str = "board_tiles") -> GeomNode:
+    """
+    Builds every tile as a textured quad inside a single Geom, so the whole
+    board is drawn with one texture bind and one draw call.
+    """
+    vdata = GeomVertexData(name, GeomVertexFormat.getV3t2(), Geom.UHStatic)
+    vdata.setNumRows(4 * len(tiles))
+    vertex = GeomVertexWriter(vdata, "vertex")
+    texcoord = GeomVertexWriter(vdata, "texcoord")
+    triangles = GeomTriangles(Geom.UHStatic)
+
+    for tile in tiles:
+        u0, v0, u1, v1 = uvs[tile.name]
+        x, y = tile.position
+        for dx, dy, u, v in ((-half_size, -half_size, u0, v0), (half_size, -half_size, u1, v0),
+                             (half_size, half_size, u1, v1), (-half_size, half_size, u0, v1)):
+            vertex.addData3(x + dx, 0, y + dy)
+            texcoord.addData2(u, v)
+        base = 4 * tile.index
+        triangles.addVertices(base, base + 1, base + 2)
+        triangles.addVertices(base, base + 2, base + 3)
+
+    geom = Geom(vdata)
+    geom.addPrimitive(triangles)
+    node = GeomNode(name)
+    node.addGeom(geom)
+    return node
+
+
+class BoardRenderer:
+    """
+    Renders a BoardGrid as one flattened, atlas-textured node; picking goes
+    through the grid's tile index.
+    """
+
+    def __init__(self, uvs: Dict[str, Tuple[float, float, float, float]], grid: BoardGrid):
+        self.uvs = uvs
+        self.grid = grid
+        self.tiles = grid.tiles
+        self.node = None
+
+    def attach(self, parent, texture):
+        """
+        Creates the board node under `parent` and returns it.
+        """
+        self.node = parent.attachNewNode(build_tile_geometry(self.tiles, self.uvs, self.grid.half_size))
+        if texture is not None:
+            self.node.setTexture(texture)
+        self.node.setTransparency(TransparencyAttrib.MAlpha)
+        return self.node
+
+    def tile_at(self, x: float, y: float) -> Optional[BoardTile]:
+        """
+        Returns the tile under a board-space point, if any.
+        """
+        index = self.grid.pick(x, y)
+        return None if index is None else self.tiles[index]
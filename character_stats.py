@@ -4,6 +4,11 @@ from resources import Resources
 
 
 class CharacterStats:
+    __slots__ = ("elasticity", "agility", "fault_tolerance", "availability", "resilience",
+                 "intelligence", "adaptability", "start_health", "current_health",
+                 "security_status", "inventory", "level", "max_health", "preparation_points",
+                 "resources")
+
     def __init__(self):
         # Core attributes that map to system properties
         self.elasticity: int = 70      # Maps to strength
@@ -71,21 +76,22 @@ class CharacterStats:
         }
 
 
-# Create a new character
-player = CharacterStats()
+if __name__ == "__main__":
+    # Create a new character
+    player = CharacterStats()
 
-# Check initial stats
-print(player.get_stats())  # Full health, Safe status, empty inventory
+    # Check initial stats
+    print(player.get_stats())  # Full health, Safe status, empty inventory
 
-# Add items to inventory
-player.add_to_inventory("Health Potion")
-player.add_to_inventory("Sword")
+    # Add items to inventory
+    player.add_to_inventory("Health Potion")
+    player.add_to_inventory("Sword")
 
-# Take some damage
-# Health will be 70/100, status will change to "Caution"
-player.take_damage(30)
+    # Take some damage
+    # Health will be 70/100, status will change to "Caution"
+    player.take_damage(30)
 
-# Use a healing item
-player.heal(20)  # Health will be 90/100, status will return to "Safe"
+    # Use a healing item
+    player.heal(20)  # Health will be 90/100, status will return to "Safe"
 
-print(player.intelligence)
+    print(player.intelligence)
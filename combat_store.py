@@ -0,0 +1,120 @@
+# combat_store.py
+from array import array
+from typing import List, Sequence, Tuple
+from security_common import SecurityStrategy
+from security_measures import SecurityMeasure, SecurityMeasures
+from threat import Threat
+from vpc_defender import VPCDefender
+
+
+class CombatStore:
+    """
+    Optional struct-of-arrays store for mass simulations: one typed array per
+    field instead of one object per defender or threat. Active measures are a
+    row of per-measure flags, referencing the shared catalog by measure id.
+
+    A defender costs roughly 7 * 4 bytes plus one byte per catalog measure,
+    a threat 4 * 4 bytes, against several hundred bytes for the objects.
+    """
+
+    DEFENDER_FIELDS = ("level", "current_health", "max_health", "agility", "fault_tolerance",
+                       "resilience", "preparation_points")
+    THREAT_FIELDS = ("power", "persistence", "adaptability", "scale")
+
+    def __init__(self, catalog: Sequence[SecurityMeasure] = ()):
+        self.catalog: Tuple[SecurityMeasure, ...] = tuple(catalog) or SecurityMeasures().measures
+        self.width = len(self.catalog)
+        self.defender_names: List[str] = []
+        self.active = bytearray()  # width flags per defender
+        for field in self.DEFENDER_FIELDS:
+            setattr(self, field, array("i"))
+
+        self.threat_names: List[str] = []
+        self.threat_attack_types: List[str] = []
+        for field in self.THREAT_FIELDS:
+            setattr(self, f"threat_{field}", array("i"))
+
+    @property
+    def defender_count(self) -> int:
+        return len(self.defender_names)
+
+    @property
+    def threat_count(self) -> int:
+        return len(self.threat_names)
+
+    def nbytes(self) -> int:
+        """
+        Bytes held by the numeric columns and measure flags.
+        """
+        columns = [getattr(self, f) for f in self.DEFENDER_FIELDS]
+        columns += [getattr(self, f"threat_{f}") for f in self.THREAT_FIELDS]
+        return sum(c.itemsize * len(c) for c in columns) + len(self.active)
+
+    def add_defender(self, defender: VPCDefender) -> int:
+        row = self.defender_count
+        self.defender_names.append(defender.name)
+        self.level.append(defender.level)
+        self.current_health.append(defender.current_health)
+        self.max_health.append(defender.max_health)
+        self.agility.append(defender.stats.agility)
+        self.fault_tolerance.append(defender.stats.fault_tolerance)
+        self.resilience.append(defender.stats.resilience)
+        self.preparation_points.append(defender.preparation_points)
+        flags = bytearray(self.width)
+        for measure in defender.active_measures:
+            flags[measure.id] = 1
+        self.active += flags
+        return row
+
+    def add_threat(self, threat: Threat) -> int:
+        row = self.threat_count
+        self.threat_names.append(threat.name)
+        self.threat_attack_types.append(threat.attack_type)
+        self.threat_power.append(threat.power)
+        self.threat_persistence.append(threat.persistence)
+        self.threat_adaptability.append(threat.adaptability)
+        self.threat_scale.append(threat.scale)
+        return row
+
+    def active_measures(self, row: int) -> List[SecurityMeasure]:
+        start = row * self.width
+        flags = self.active[start:start + self.width]
+        return [self.catalog[index] for index, flag in enumerate(flags) if flag]
+
+    def set_active(self, row: int, measure: SecurityMeasure, active: bool = True):
+        self.active[row * self.width + measure.id] = active
+
+    def effectiveness(self, row: int, strategy: SecurityStrategy) -> int:
+        return sum(m.effectiveness for m in self.active_measures(row) if m.strategy == strategy)
+
+    def threat(self, row: int) -> Threat:
+        """
+        Materializes one stored threat as a regular Threat.
+        """
+        return Threat(self.threat_names[row], self.threat_attack_types[row], self.threat_power[row],
+                      self.threat_persistence[row], self.threat_adaptability[row], self.threat_scale[row])
+
+    def to_balance_batch(self, defender_rows: Sequence[int], threat_rows: Sequence[int]):
+        """
+        Pairs stored defenders and threats (by position) into a BalanceBatch
+        for the vectorized engine. Needs numpy.
+        """
+        import numpy as np
+        from balance_engine import MEASURES, BalanceBatch
+        if len(MEASURES) != self.width:
+            raise ValueError("CombatStore catalog does not match the balance engine's measure catalog")
+
+        d = np.asarray(defender_rows, dtype=np.intp)
+        t = np.asarray(threat_rows, dtype=np.intp)
+        column = lambda values, rows: np.frombuffer(values, dtype=np.int32)[rows].astype(np.int64)
+        active = np.frombuffer(bytes(self.active), dtype=np.uint8).reshape(-1, self.width)[d].astype(bool)
+        return BalanceBatch(
+            agility=column(self.agility, d),
+            fault_tolerance=column(self.fault_tolerance, d),
+            resilience=column(self.resilience, d),
+            health=column(self.current_health, d),
+            active=active,
+            power=column(self.threat_power, t),
+            persistence=column(self.threat_persistence, t),
+            adaptability=column(self.threat_adaptability, t),
+        )
@@ -0,0 +1,227 @@
+# content_pack.py
+import hashlib
+import json
+import marshal
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from game_board import AvailabilityZone, Region
+from security_common import SecurityStrategy
+from security_measures import MeasureCatalog, SecurityMeasure
+from threat import ThreatTemplate
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+CONTENT_DIR = SCRIPT_DIR / "content"
+DEFAULT_PACK = CONTENT_DIR / "base.json"
+CACHE_DIR = SCRIPT_DIR / ".cache"
+PACK_VERSION = 3
+PACK_ENV = "DANDD_CONTENT_PACK"  # Overrides DEFAULT_PACK for ContentPack.default()
+
+THREAT_FIELDS = ("name", "attack_type", "power", "persistence", "adaptability", "scale", "weight")
+TemplateTuple = Tuple[str, str, int, int, int, int, float]
+
+
+class ContentPackError(ValueError):
+    pass
+
+
+def _read_source(path: Path) -> dict:
+    if path.suffix.lower() == ".toml":
+        import tomllib  # Python 3.11+; only needed for TOML packs
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _threat_template(source: dict, where: str) -> TemplateTuple:
+    missing = [field for field in THREAT_FIELDS[:5] if field not in source]
+    if missing:
+        raise ContentPackError(f"{where}: missing {', '.join(missing)}")
+    try:
+        template = (str(source["name"]), str(source["attack_type"]), int(source["power"]),
+                    int(source["persistence"]), int(source["adaptability"]), int(source.get("scale", 1)),
+                    float(source.get("weight", 1.0)))
+    except (TypeError, ValueError) as e:
+        raise ContentPackError(f"{where}: {e!r}") from e
+    if template[-1] <= 0:
+        raise ContentPackError(f"{where}: weight must be positive")
+    return template
+
+
+def compile_source(source: dict) -> dict:
+    """
+    Validates a parsed JSON/TOML pack and flattens it to marshal-friendly tuples.
+    """
+    try:
+        regions = tuple(
+            (str(region["name"]),
+             tuple((str(az["name"]), az.get("bonus")) for az in region["azs"]),
+             bool(region.get("special_access_required", False)))
+            for region in source.get("regions", ())
+        )
+        measures = tuple(
+            (str(measure["name"]), str(measure.get("description", "")), int(measure["cost"]),
+             SecurityStrategy(measure["strategy"]).value, int(measure.get("effectiveness", 10)))
+            for measure in source.get("measures", ())
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise ContentPackError(f"Invalid content pack: {e!r}") from e
+    if any(effectiveness < 0 for *_, effectiveness in measures):
+        raise ContentPackError("Measure effectiveness cannot be negative")
+    if not regions or any(not azs for _, azs, _ in regions):
+        raise ContentPackError("A content pack needs at least one region, each with at least one AZ")
+
+    archetypes = {str(key): _threat_template(archetype, f"archetype {key}")
+                  for key, archetype in source.get("archetypes", {}).items()}
+
+    def region_threat(entry: dict, region: str) -> TemplateTuple:
+        # {"archetype": "ddos", "weight": 3} reuses an archetype under a region-specific weight.
+        if "archetype" not in entry:
+            return _threat_template(entry, f"threat for {region}")
+        template = archetypes.get(entry["archetype"])
+        if template is None:
+            raise ContentPackError(f"threat for {region}: unknown archetype {entry['archetype']!r}")
+        try:
+            weight = float(entry.get("weight", template[-1]))
+        except (TypeError, ValueError) as e:
+            raise ContentPackError(f"threat for {region}: {e!r}") from e
+        if weight <= 0:
+            raise ContentPackError(f"threat for {region}: weight must be positive")
+        return template[:-1] + (weight,)
+
+    # A region lists one threat, or a weighted spawn table.
+    threats = {
+        str(region): tuple(region_threat(entry, region)
+                           for entry in (entries if isinstance(entries, list) else [entries]))
+        for region, entries in source.get("threats", {}).items()
+    }
+    default_threat = _threat_template(source["default_threat"], "default_threat") \
+        if "default_threat" in source else ("Generic Threat", "Unknown", 20, 2, 50, 1, 1.0)
+    return {
+        "version": PACK_VERSION,
+        "name": str(source.get("name", "")),
+        "regions": regions,
+        "archetypes": archetypes,
+        "threats": threats,
+        "default_threat": default_threat,
+        "measures": measures,
+    }
+
+
+class ContentPack:
+    """
+    Board, threat and security measure definitions loaded from a content pack.
+
+    Packs are written as JSON (or TOML) and compiled to a marshal snapshot in
+    CACHE_DIR, keyed on the source's mtime/size and content hash, so a warm
+    start skips parsing and validation. A pack is read-only once loaded and
+    shared by every game in the process; battles get mutable threats from
+    threat_generator.ThreatRegistry.
+    """
+
+    def __init__(self, compiled: dict):
+        self.name: str = compiled["name"]
+        self.regions: Tuple[Region, ...] = tuple(
+            Region(name=name, azs=[AvailabilityZone(name=az, bonus=bonus) for az, bonus in azs],
+                   special_access_required=special)
+            for name, azs, special in compiled["regions"]
+        )
+        self.archetypes: Dict[str, ThreatTemplate] = {
+            key: ThreatTemplate(*template) for key, template in compiled["archetypes"].items()
+        }
+        self.threat_templates: Dict[str, Tuple[ThreatTemplate, ...]] = {
+            region: tuple(ThreatTemplate(*template) for template in templates)
+            for region, templates in compiled["threats"].items()
+        }
+        self.default_threat = ThreatTemplate(*compiled["default_threat"])
+        self.measures: Tuple[SecurityMeasure, ...] = tuple(
+            SecurityMeasure(name, description, cost, SecurityStrategy(strategy), effectiveness, index)
+            for index, (name, description, cost, strategy, effectiveness) in enumerate(compiled["measures"])
+        )
+        try:
+            self.catalog = MeasureCatalog(self.measures)
+        except ValueError as e:
+            raise ContentPackError(str(e)) from e
+
+    @classmethod
+    def load(cls, path=DEFAULT_PACK, cache_dir: Optional[Path] = CACHE_DIR) -> 'ContentPack':
+        """
+        Loads a pack source (.json/.toml), using and refreshing its compiled
+        snapshot, or a compiled .pack file directly.
+        """
+        path = Path(path)
+        if path.suffix == ".pack":
+            compiled = _read_snapshot(path)
+            if compiled is None:
+                raise ContentPackError(f"{path} is not a version {PACK_VERSION} content pack")
+            return cls(compiled)
+
+        stat = path.stat()
+        # Named by the source's full path, so same-named packs in different directories don't collide
+        source_id = hashlib.sha1(str(path.resolve()).encode()).hexdigest()[:12]
+        cache_path = Path(cache_dir) / f"content-{path.stem}-{source_id}.v{PACK_VERSION}.pack" if cache_dir else None
+        cached = _read_snapshot(cache_path)
+        if cached and (cached.get("mtime_ns"), cached.get("size")) == (stat.st_mtime_ns, stat.st_size):
+            return cls(cached)
+
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if cached and cached.get("sha256") == digest:
+            compiled = cached  # Touched but unchanged
+        else:
+            compiled = compile_source(_read_source(path))
+        if cache_path:
+            compiled.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size, sha256=digest)
+            try:
+                _write_snapshot(compiled, cache_path)
+            except OSError:
+                pass  # The cache is only an optimisation
+        return cls(compiled)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def default(cls) -> 'ContentPack':
+        """
+        The shared pack for this process: $DANDD_CONTENT_PACK, else content/base.json.
+        """
+        return cls.load(os.environ.get(PACK_ENV) or DEFAULT_PACK)
+
+    def measures_for(self, strategy: SecurityStrategy) -> Tuple[SecurityMeasure, ...]:
+        return self.catalog.for_strategy(strategy)
+
+
+def _read_snapshot(path: Optional[Path]) -> Optional[dict]:
+    if not path:
+        return None
+    try:
+        with open(path, "rb") as f:
+            compiled = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return compiled if isinstance(compiled, dict) and compiled.get("version") == PACK_VERSION else None
+
+
+def _write_snapshot(compiled: dict, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        marshal.dump(compiled, f)
+    os.replace(tmp_path, path)
+
+
+def compile_pack(source_path, output_path) -> Path:
+    """
+    Compiles a pack source into a standalone .pack snapshot for shipping.
+    """
+    output_path = Path(output_path)
+    _write_snapshot(compile_source(_read_source(Path(source_path))), output_path)
+    return output_path
+
+
+if __name__ == "__main__":
+    import sys
+    source = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PACK
+    output = sys.argv[2] if len(sys.argv) > 2 else Path(source).with_suffix(".pack")
+    print(f"Compiled {source} -> {compile_pack(source, output)}")
@@ -44,6 +44,7 @@ def run_game(player: Player, defender: VPCDefender) -> int:
 
         # Move the player and identify where they landed
         landed_region, landed_az = player.move(steps)
+        print(f"{player.name} landed on {landed_region.name} - {landed_az.name}.")
 
         # Apply regional charges if not in home region
         if landed_region != player.home_region:
@@ -103,6 +104,7 @@ def run_game(player: Player, defender: VPCDefender) -> int:
         elif battle.threat_defeated():
             print(f"Successfully defeated the threat: {threat.name}!")
             defender.level_up()
+            print(f"{defender.name} has leveled up to Level {defender.level}!")
             session_points += 100  # Award points for defeating the threat
         else:
             print("The threat remains active.")
@@ -138,6 +140,7 @@ def continuous_game_loop(max_sessions: int = 5, winning_score: int = 500):
         game_board = GameBoard()
         player = Player(name=player_name, game_board=game_board)
         player.set_home_region()
+        print(f"{player.name}'s home region is {player.home_region.name} - {player.home_az.name}.")
         players.append(player)
 
         # Initialize defender stats
@@ -164,7 +167,8 @@ def continuous_game_loop(max_sessions: int = 5, winning_score: int = 500):
             # Reset defender's health and preparation points for the next session
             defenders[idx].current_health = defenders[idx].max_health
             defenders[idx].preparation_points = 100
-            defenders[idx].active_measures.clear()
+            defenders[idx].clear_active_measures()
+            defenders[idx].status_effects.clear()
 
             # Check for winning condition
             if player_points[player.name] >= winning_score:
@@ -1,7 +1,14 @@
 # game_board.py
 
 from dataclasses import dataclass
-from typing import List, Optional
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+from game_rng import GameRNG
+
+MAX_MOVE = 6  # Highest die roll / card value
+
+# (region index, AZ node id, probability)
+Landing = Tuple[int, int, float]
 
 
 @dataclass
@@ -23,44 +30,118 @@ class Region:
     special_access_required: bool = False  # Indicates if special access is needed
 
 
+class EdgeType(Enum):
+    NEXT = "next"          # Movement track: region -> following region
+    CONTAINS = "contains"  # Region -> one of its AZs
+
+
 class GameBoard:
     """
     Represents the game board with all regions and their AZs.
+    `rng` is the game's random number service, shared by everything on the board.
+
+    The board is a graph: node ids 0..len(regions)-1 are regions, the rest
+    are AZs, joined by typed edges. Movement follows NEXT edges, and the
+    landing tables for every position and move value are precomputed, so
+    moving and AI look-ahead are table lookups.
     """
 
-    def __init__(self):
-        self.regions: List[Region] = self.create_regions()
+    def __init__(self, rng: Optional[GameRNG] = None, regions: Optional[List[Region]] = None):
+        self.rng = rng or GameRNG()
+        self.regions: List[Region] = regions if regions is not None else self.create_regions()
+        self.build_graph()
 
-    def create_regions(self) -> List[Region]:
+    def build_graph(self):
+        """
+        Builds the region/AZ graph with the regions joined in a ring, in list order.
+        """
+        region_count = len(self.regions)
+        self.nodes: List[object] = list(self.regions)
+        self.az_nodes: List[Tuple[int, ...]] = []
+        self.node_region: Dict[int, int] = {}
+        for index, region in enumerate(self.regions):
+            first = len(self.nodes)
+            self.nodes.extend(region.azs)
+            self.az_nodes.append(tuple(range(first, len(self.nodes))))
+            for node in self.az_nodes[-1]:
+                self.node_region[node] = index
+
+        self.edges: List[List[Tuple[EdgeType, int]]] = [[] for _ in self.nodes]
+        for index in range(region_count):
+            self.add_edge(index, (index + 1) % region_count, EdgeType.NEXT)
+            for node in self.az_nodes[index]:
+                self.add_edge(index, node, EdgeType.CONTAINS)
+        self.build_tables()
+
+    def add_edge(self, source: int, target: int, edge_type: EdgeType):
+        """
+        Adds a typed edge. The movement track does not branch, so a node has
+        at most one NEXT edge; call build_tables() after changing it.
+        """
+        if edge_type is EdgeType.NEXT and self.neighbours(source, EdgeType.NEXT):
+            raise ValueError(f"Node {source} already has a NEXT edge; the movement track cannot branch")
+        self.edges[source].append((edge_type, target))
+
+    def neighbours(self, node: int, edge_type: EdgeType) -> List[int]:
+        return [target for kind, target in self.edges[node] if kind is edge_type]
+
+    def build_tables(self):
         """
-        Initializes and returns a list of regions with their AZs.
+        Precomputes, for every region position and move value 0..MAX_MOVE,
+        the landing region and its AZ distribution, plus the distribution
+        over a uniform 1..MAX_MOVE roll.
         """
-        regions = [
-            Region(
-                name="US East (N. Virginia)",
-                azs=[
-                    AvailabilityZone(name="us-east-1a", bonus="Agility"),
-                    AvailabilityZone(name="us-east-1b", bonus="Elasticity"),
-                    AvailabilityZone(name="us-east-1c"),
-                ]
-            ),
-            Region(
-                name="US West (Oregon)",
-                azs=[
-                    AvailabilityZone(name="us-west-2a", bonus="Resilience"),
-                    AvailabilityZone(name="us-west-2b"),
-                    AvailabilityZone(name="us-west-2c",
-                                     bonus="Fault Tolerance"),
-                ]
-            ),
-            Region(
-                name="Special Region",
-                azs=[
-                    AvailabilityZone(name="special-az-1",
-                                     bonus="Availability"),
-                ],
-                special_access_required=True
-            ),
-            # Add more regions and AZs as needed
+        region_count = len(self.regions)
+        self.move_table: List[Tuple[int, ...]] = [
+            tuple(self._walk(position, steps) for steps in range(MAX_MOVE + 1))
+            for position in range(region_count)
         ]
-        return regions
+        self.landing_table: List[Tuple[Tuple[Landing, ...], ...]] = [
+            tuple(self._landings(region) for region in row) for row in self.move_table
+        ]
+        self.roll_distribution: List[Tuple[Landing, ...]] = []
+        for position in range(region_count):
+            totals: Dict[int, float] = {}
+            for steps in range(1, MAX_MOVE + 1):
+                for _, node, probability in self.landing_table[position][steps]:
+                    totals[node] = totals.get(node, 0.0) + probability / MAX_MOVE
+            self.roll_distribution.append(
+                tuple((self.node_region[node], node, probability) for node, probability in totals.items()))
+
+    def _walk(self, position: int, steps: int) -> int:
+        for _ in range(steps):
+            following = self.neighbours(position, EdgeType.NEXT)
+            if not following:
+                break
+            position = following[0]
+        return position
+
+    def _landings(self, region: int) -> Tuple[Landing, ...]:
+        azs = self.az_nodes[region]
+        return tuple((region, node, 1 / len(azs)) for node in azs)
+
+    def landing_position(self, position: int, steps: int) -> int:
+        """
+        Region index reached by moving `steps` from `position`.
+        """
+        if 0 <= steps <= MAX_MOVE:
+            return self.move_table[position][steps]
+        return self._walk(position, steps)
+
+    def landing_distribution(self, position: int, steps: Optional[int] = None) -> Tuple[Landing, ...]:
+        """
+        (region index, AZ node, probability) outcomes for a move of `steps`,
+        or for a uniform 1..MAX_MOVE roll when `steps` is None.
+        """
+        if steps is None:
+            return self.roll_distribution[position]
+        if 0 <= steps <= MAX_MOVE:
+            return self.landing_table[position][steps]
+        return self._landings(self._walk(position, steps))
+
+    def create_regions(self) -> List[Region]:
+        """
+        Returns the regions of the shared content pack (content/base.json by default).
+        """
+        from content_pack import ContentPack  # content_pack builds on this module's dataclasses
+        return list(ContentPack.default().regions)
@@ -1,162 +1,350 @@
+import logging
+from typing import Dict, Optional, Sequence
 from game_board import GameBoard
+from game_rng import GameRNG
 from player import Player
 from vpc_defender import VPCDefender
-from threat_generator import generate_threat_for_region
+from threat_generator import ThreatRegistry
 from security_battle import SecurityBattle
 from character_stats import CharacterStats
-from security_measures import SecurityMeasure
-from opening_scene import start_interview
-import time
+from battle_policy import BATTLE_MESSAGES, ConsolePolicy, ConsoleSink, Decision, GamePhase, GamePolicy
+from game_log import EventLogSink, event_log
+
+
+def _format_setup_phase(preparation_points, measures) -> str:
+    lines = ["\n--- Setup Phase ---", f"Preparation Points: {preparation_points}", "Available Defensive Measures:"]
+    lines += [f"- {m.name}: {m.description} (Cost: {m.cost}, Effectiveness: {m.effectiveness})" for m in measures]
+    return "\n".join(lines)
+
+
+def _format_final_scores(player_points) -> str:
+    lines = ["\n=== Game Over ===", "Final Scores:"]
+    lines += [f"- {name}: {points} points" for name, points in player_points.items()]
+    return "\n".join(lines)
+
+
+GAME_MESSAGES = {
+    **BATTLE_MESSAGES,
+    "welcome": "=== Welcome to the Cloud Security Battle ===",
+    "home_region": "{player}'s home region is {region} - {az}.",
+    "turn_start": "\n=== New Turn ===",
+    "moved": "{text}",
+    "landed": "{player} landed on {region} - {az}.",
+    "regional_charge": "Operating in {region} incurs a charge of {charge} preparation points.",
+    "regional_charge_unpaid": "Insufficient preparation points to cover regional charges.",
+    "setup_phase": _format_setup_phase,
+    "measure_result": "{result}",
+    "setup_needs_measure": "You must implement at least one security measure before proceeding.",
+    "setup_done": "Setup phase completed.",
+    "setup_invalid": "Invalid action. Please enter 'measure' or 'done'.",
+    "threat_encounter": "\n--- Threat Encounter ---\n"
+                        "Threat Details: {threat}, Power: {power}, Persistence: {persistence}, "
+                        "Adaptability: {adaptability}",
+    "compromised": "Your defender has been compromised! Game Over.",
+    "threat_defeated": "Successfully defeated the threat: {threat}!",
+    "level_up": "{defender} has leveled up to Level {level}!",
+    "threat_active": "The threat remains active.",
+    "session_end": "Ending the current game session.",
+    "session_start": "\n=== Game Session {session} ===",
+    "player_turn": "\n--- {player}'s Turn ---",
+    "session_points": "{player} earned {points} points this session.\nTotal Points: {total}",
+    "final_scores": _format_final_scores,
+    "winner": "\nCongratulations, {player}! You have won the game with {points} points!",
+}
+
+MOVE_OPTIONS = ("roll", "draw")
+SETUP_OPTIONS = ("measure", "done")
+CONTINUE_OPTIONS = ("yes", "no")
+
+MOVE_MESSAGES = {
+    'roll': "You rolled a {steps}.",
+    'draw': "You drew a card and move {steps} steps.",
+    'invalid': "Invalid choice. Defaulting to rolling the die.\nYou rolled a {steps}.",
+}
+
 
 class GameEngine:
     """
     The GameEngine class manages the core logic, state, and interactions of the game.
+
+    The game is a resumable state machine: start() runs it up to the first
+    player Decision, and submit(answer) resumes it up to the next one, so a
+    UI or server never blocks on the engine. play_sessions() instead answers
+    every decision with `policy`. Game messages go to `sink`; both default to
+    the interactive console. All randomness comes from `rng`, so a game
+    seeded with the same value replays identically.
     """
 
-    def __init__(self):
+    def __init__(self, policy: Optional[GamePolicy] = None, sink=None, rng: Optional[GameRNG] = None):
         """
         Initializes the game engine with default settings.
         """
+        self.rng = rng or GameRNG()
         self.players = []
         self.defenders = []
-        self.game_board = GameBoard()
+        self.game_board = GameBoard(rng=self.rng)
+        self.threats = ThreatRegistry.default()
         self.max_sessions = 5
         self.winning_score = 500
         self.session_count = 1
-        self.player_points = {}
+        self.player_index = 0    # Whose session is being played
+        self.turn = 0            # Turns completed in that session
+        self.session_points = 0  # Points earned in that session so far
+        self.player_points: Dict[str, int] = {}
+        self.checkpointer = None  # Called at every turn boundary, see snapshot.Checkpointer
+        self.recorder = None      # Sees every answer and turn boundary, see replay.GameRecorder
+        self.policy = policy or ConsolePolicy()
+        self.sink = sink or ConsoleSink(GAME_MESSAGES)
+        self.pending: Optional[Decision] = None
+        self.winner: Optional[str] = None
+        self._flow = None
+
+    def configure_event_log(self, path: Optional[str] = "game_events.log", level: int = logging.INFO,
+                            sample_rate: float = 1.0, handler: Optional[logging.Handler] = None):
+        """
+        Turns on the structured event log and records this engine's game events in it.
+        Use level=logging.DEBUG to also log resource checks.
+        """
+        event_log.configure(path=path, level=level, sample_rate=sample_rate, handler=handler)
+        if not isinstance(self.sink, EventLogSink):
+            self.sink = EventLogSink(self.sink, event_log)
 
-    def initialize_game(self):
+    def add_player(self, player_name: str) -> Player:
         """
-        Initializes the game by setting up players and defenders.
+        Adds a player with a fresh defender to the game.
         """
-        print("=== Welcome to the Cloud Security Battle ===")
-        number_of_players = int(input("Enter the number of players: ").strip())
+        player = Player(name=player_name, game_board=self.game_board)
+        player.set_home_region()
+        self.sink.emit("home_region", player=player.name, region=player.home_region.name, az=player.home_az.name)
+        self.players.append(player)
 
-        for i in range(number_of_players):
-            player_name = input(f"Enter the name for Player {i + 1}: ").strip()
-            player = Player(name=player_name, game_board=self.game_board)
-            player.set_home_region()
-            self.players.append(player)
+        stats = CharacterStats()
+        defender = VPCDefender(name=player.name + "'s Defender", stats=stats)
+        player.defender = defender
+        self.defenders.append(defender)
+
+        self.player_points[player.name] = 0
+        return player
+
+    def initialize_game(self, number_of_players: Optional[int] = None,
+                        player_names: Optional[Sequence[str]] = None):
+        """
+        Initializes the game by setting up players and defenders. Anything
+        not given is asked on the console.
+        """
+        self.sink.emit("welcome")
+        if player_names is None:
+            if number_of_players is None:
+                number_of_players = int(input("Enter the number of players: ").strip())
+            player_names = [input(f"Enter the name for Player {i + 1}: ").strip()
+                            for i in range(number_of_players)]
+        for name in player_names:
+            self.add_player(name)
+
+    @property
+    def phase(self) -> Optional[GamePhase]:
+        """
+        What the game is waiting for; None before start().
+        """
+        if self.pending is None:
+            return GamePhase.GAME_OVER if self.winner is not None else None
+        return self.pending.phase
+
+    def start(self) -> Optional[Decision]:
+        """
+        Starts the game with the registered players and runs it up to the
+        first decision, which is returned (None if the game is already over).
+        """
+        self.winner = None
+        self._flow = self.game_flow()
+        return self._advance(None, first=True)
+
+    def submit(self, answer) -> Optional[Decision]:
+        """
+        Answers the pending decision and runs the game up to the next one.
+        Returns it, or None once the game is over (see `winner`).
+        """
+        if self._flow is None or self.pending is None:
+            raise RuntimeError("No decision is pending; call start() first")
+        return self._advance(answer)
 
-            stats = CharacterStats()
-            defender = VPCDefender(name=player.name + "'s Defender", stats=stats)
-            player.defender = defender
-            self.defenders.append(defender)
+    def _advance(self, answer, first: bool = False) -> Optional[Decision]:
+        try:
+            if first:
+                self.pending = next(self._flow)
+            else:
+                if self.recorder is not None:
+                    self.recorder.command(answer)
+                self.pending = self._flow.send(answer)
+        except StopIteration as done:
+            self.pending, self._flow, self.winner = None, None, done.value
+            if self.recorder is not None:
+                self.recorder.game_over(self)
+        return self.pending
 
-            self.player_points[player.name] = 0
+    def _drive(self, flow):
+        """
+        Runs a flow to completion, answering every decision with the policy.
+        """
+        recorder = self.recorder
+        try:
+            decision = next(flow)
+            while True:
+                answer = self.policy.decide(self, decision)
+                if recorder is not None:
+                    recorder.command(answer)
+                decision = flow.send(answer)
+        except StopIteration as done:
+            return done.value
 
     def run_game_session(self, player, defender):
         """
         Runs a single game session for a player and returns the points earned.
         """
-        session_points = 0
+        return self._drive(self.session_flow(player, defender))
+
+    def session_flow(self, player, defender):
+        """
+        One game session for a player, as a generator yielding Decisions;
+        returns the points earned. A session restored from a snapshot
+        resumes after its `turn` completed turns.
+        """
         game_over = False
 
         while not game_over:
-            print("\n=== New Turn ===")
+            if self.checkpointer is not None:
+                self.checkpointer.checkpoint(self)
+            if self.recorder is not None:
+                self.recorder.turn(self)
+            self.turn += 1
+            turn = self.turn
+            self.sink.emit("turn_start")
 
-            move_choice = input("Do you want to 'roll' the die or 'draw' a card to move? (roll/draw): ").strip().lower()
-            if move_choice == 'roll':
-                steps = player.roll_dice()
-                print(f"You rolled a {steps}.")
-            elif move_choice == 'draw':
+            move_choice = yield Decision(GamePhase.MOVE, player, defender, turn=turn, options=MOVE_OPTIONS)
+            if move_choice == 'draw':
                 steps = player.draw_card()
-                print(f"You drew a card and move {steps} steps.")
             else:
-                print("Invalid choice. Defaulting to rolling the die.")
                 steps = player.roll_dice()
-                print(f"You rolled a {steps}.")
+                if move_choice != 'roll':
+                    move_choice = 'invalid'
+            self.sink.emit("moved", text=MOVE_MESSAGES[move_choice].format(steps=steps), steps=steps)
 
             landed_region, landed_az = player.move(steps)
+            self.sink.emit("landed", player=player.name, region=landed_region.name, az=landed_az.name)
 
             if landed_region != player.home_region:
                 regional_charge = 10
                 if defender.preparation_points >= regional_charge:
                     defender.preparation_points -= regional_charge
-                    print(f"Operating in {landed_region.name} incurs a charge of {regional_charge} preparation points.")
+                    self.sink.emit("regional_charge", region=landed_region.name, charge=regional_charge)
                 else:
-                    print("Insufficient preparation points to cover regional charges.")
-
-            print("\n--- Setup Phase ---")
-            print(f"Preparation Points: {defender.preparation_points}")
-            print("Available Defensive Measures:")
-            for measure in defender.defensive_measures:
-                print(f"- {measure.name}: {measure.description} (Cost: {measure.cost}, Effectiveness: {measure.effectiveness})")
+                    self.sink.emit("regional_charge_unpaid")
 
+            self.sink.emit("setup_phase", preparation_points=defender.preparation_points,
+                           measures=defender.defensive_measures)
 
             while True:
-                setup_action = input("Enter 'measure' to implement a security measure or 'done' to finish setup: ").strip().lower()
+                setup_action = yield Decision(GamePhase.SETUP, player, defender, turn=turn,
+                                              options=SETUP_OPTIONS)
                 if setup_action == 'measure':
-                    measure_name = input("Enter the measure key to implement: ").strip().lower()
-                    result = defender.add_active_measure(measure_name)
-                    print(result)
+                    measure_name = yield Decision(
+                        GamePhase.MEASURE, player, defender, turn=turn,
+                        options=tuple(m.name.lower() for m in defender.catalog if m not in defender.active_measures))
+                    result = defender.add_active_measure(measure_name or "")
+                    self.sink.emit("measure_result", result=result)
                 elif setup_action == 'done':
                     if len(defender.active_measures) == 0:
-                        print("You must implement at least one security measure before proceeding.")
+                        self.sink.emit("setup_needs_measure")
                     else:
-                        print("Setup phase completed.")
+                        self.sink.emit("setup_done")
                         break
                 else:
-                    print("Invalid action. Please enter 'measure' or 'done'.")
+                    self.sink.emit("setup_invalid")
 
-            print("\n--- Threat Encounter ---")
-            threat = generate_threat_for_region(landed_region.name)
+            threat = self.threats.spawn(landed_region.name, defender.level, self.rng, self.session_count)
+            self.sink.emit("threat_encounter", threat=threat.name, power=threat.power,
+                           persistence=threat.persistence, adaptability=threat.adaptability)
 
-            print(f"Threat Details: {threat.name}, Power: {threat.power}, Persistence: {threat.persistence}, Adaptability: {threat.adaptability}")
-
-            battle = SecurityBattle(defender, threat)
-            battle.start_battle()
+            battle = SecurityBattle(defender, threat, policy=self.policy, sink=self.sink, rng=self.rng)
+            yield from battle.run()
 
             if not defender.is_alive():
-                print("Your defender has been compromised! Game Over.")
+                self.sink.emit("compromised")
                 game_over = True
             elif battle.threat_defeated():
-                print(f"Successfully defeated the threat: {threat.name}!")
+                self.sink.emit("threat_defeated", threat=threat.name)
                 defender.level_up()
-                session_points += 100
+                self.sink.emit("level_up", defender=defender.name, level=defender.level)
+                self.session_points += 100
             else:
-                print("The threat remains active.")
+                self.sink.emit("threat_active")
+            self.threats.release(threat)
+            if self.recorder is not None:
+                self.recorder.turn_end(self)
 
-            continue_choice = input("Do you want to continue to the next turn? (yes/no): ").strip().lower()
-            if continue_choice != 'yes':
-                print("Ending the current game session.")
-                game_over = True
+            if not game_over:
+                answer = yield Decision(GamePhase.CONTINUE, player, defender, turn=turn,
+                                        options=CONTINUE_OPTIONS)
+                if not (answer is True or (isinstance(answer, str) and answer.strip().lower() == "yes")):
+                    self.sink.emit("session_end")
+                    game_over = True
 
+        session_points = self.session_points
+        self.turn = self.session_points = 0
         return session_points
 
-    def continuous_game_loop(self):
+    def play_sessions(self) -> str:
         """
-        Manages the overall game loop, running multiple sessions until a player wins or the maximum number of sessions is reached.
+        Runs sessions for the registered players until one reaches the winning
+        score or `max_sessions` is exhausted, answering every decision with
+        the policy. Returns the winner's name.
         """
-        self.initialize_game()
+        self.winner = self._drive(self.game_flow())
+        if self.recorder is not None:
+            self.recorder.game_over(self)
+        return self.winner
 
+    def game_flow(self):
+        """
+        The whole game as a generator yielding Decisions; returns the winner's name.
+        """
         while self.session_count <= self.max_sessions:
-            print(f"\n=== Game Session {self.session_count} ===")
-            for idx, player in enumerate(self.players):
-                print(f"\n--- {player.name}'s Turn ---")
-                points_earned = self.run_game_session(player, self.defenders[idx])
+            self.sink.emit("session_start", session=self.session_count)
+            while self.player_index < len(self.players):
+                idx = self.player_index
+                player = self.players[idx]
+                self.sink.emit("player_turn", player=player.name)
+                points_earned = yield from self.session_flow(player, self.defenders[idx])
                 self.player_points[player.name] += points_earned
-                print(f"{player.name} earned {points_earned} points this session.")
-                print(f"Total Points: {self.player_points[player.name]}")
+                self.sink.emit("session_points", player=player.name, points=points_earned,
+                               total=self.player_points[player.name])
 
                 self.defenders[idx].current_health = self.defenders[idx].max_health
                 self.defenders[idx].preparation_points = 100
-                self.defenders[idx].active_measures.clear()
+                self.defenders[idx].clear_active_measures()
+                self.defenders[idx].status_effects.clear()
+
+                self.player_index += 1
 
                 if self.player_points[player.name] >= self.winning_score:
-                    print(f"\nCongratulations, {player.name}! You have won the game with {self.player_points[player.name]} points!")
-                    return
+                    self.sink.emit("winner", player=player.name, points=self.player_points[player.name])
+                    return player.name
 
+            self.player_index = 0
             self.session_count += 1
 
-        print("\n=== Game Over ===")
-        print("Final Scores:")
-        for player_name, points in self.player_points.items():
-            print(f"- {player_name}: {points} points")
-
+        self.sink.emit("final_scores", player_points=self.player_points)
         winner = max(self.player_points, key=self.player_points.get)
-        print(f"\nCongratulations, {winner}! You have won the game with {self.player_points[winner]} points!")
+        self.sink.emit("winner", player=winner, points=self.player_points[winner])
+        return winner
+
+    def continuous_game_loop(self):
+        """
+        Manages the overall game loop, running multiple sessions until a player wins or the maximum number of sessions is reached.
+        """
+        self.initialize_game()
+        self.play_sessions()
 
 if __name__ == "__main__":
     engine = GameEngine()
-    engine.continuous_game_loop()
\ No newline at end of file
+    engine.continuous_game_loop()
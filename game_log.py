@@ -0,0 +1,113 @@
+# game_log.py
+import json
+import logging
+import queue
+import random
+from typing import Optional
+
+EVENT_LOGGER_NAME = "game.events"
+
+
+class JsonLineFormatter(logging.Formatter):
+    """
+    Formats event records as one JSON object per line.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": round(record.created, 6),
+            "level": record.levelname,
+            "event": record.getMessage(),
+            "data": getattr(record, "fields", {}),
+        }
+        return json.dumps(entry, default=str)
+
+
+class GameEventLog:
+    """
+    Structured, opt-in game event log.
+
+    Disabled until `configure` is called, and callers on hot paths check
+    `enabled` before building any event, so logging costs nothing when off.
+    Records below WARNING are sampled at `sample_rate`; accepted records are
+    handed to a queue and written by a background QueueListener thread.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.level = logging.INFO
+        self.sample_rate = 1.0
+        self.logger = logging.getLogger(EVENT_LOGGER_NAME)
+        self.logger.addHandler(logging.NullHandler())
+        self.logger.propagate = False
+        self._rng = random.Random()
+        self._queue_handler: Optional[logging.Handler] = None
+        self._listener = None
+
+    def configure(self, path: Optional[str] = "game_events.log", level: int = logging.INFO,
+                  sample_rate: float = 1.0, handler: Optional[logging.Handler] = None):
+        """
+        Starts logging events at `level` and above to `path` (or to `handler`).
+        """
+        import logging.handlers  # pulls in socket/pickle, so only when logging is turned on
+
+        self.shutdown()
+        if handler is None:
+            handler = logging.FileHandler(path, encoding="utf-8")
+        handler.setFormatter(JsonLineFormatter())
+
+        events = queue.SimpleQueue()
+        self._queue_handler = logging.handlers.QueueHandler(events)
+        self._listener = logging.handlers.QueueListener(events, handler)
+        self._listener.start()
+        self.logger.addHandler(self._queue_handler)
+        self.logger.setLevel(level)
+
+        self.level = level
+        self.sample_rate = sample_rate
+        self.enabled = True
+
+    def shutdown(self):
+        """
+        Stops logging and flushes queued events.
+        """
+        self.enabled = False
+        if self._listener is not None:
+            self.logger.removeHandler(self._queue_handler)
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
+            self._queue_handler = None
+
+    def is_enabled_for(self, level: int) -> bool:
+        return self.enabled and level >= self.level
+
+    def emit(self, level: int, event: str, /, **fields):
+        """
+        Logs `event` with structured `fields`, subject to level and sampling.
+        """
+        if not self.enabled or level < self.level:
+            return
+        if level < logging.WARNING and self.sample_rate < 1.0 and self._rng.random() >= self.sample_rate:
+            return
+        self.logger.log(level, event, extra={"fields": fields})
+
+
+class EventLogSink:
+    """
+    Forwards game/battle sink events to the event log, then to `inner`.
+    """
+
+    def __init__(self, inner, log: 'GameEventLog', level: int = logging.INFO):
+        self.inner = inner
+        self.log = log
+        self.level = level
+
+    def emit(self, kind: str, **data):
+        if self.log.enabled:
+            self.log.emit(self.level, kind, **data)
+        self.inner.emit(kind, **data)
+
+
+event_log = GameEventLog()
@@ -0,0 +1,93 @@
+# game_rng.py
+import random
+from typing import Dict, List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_BLOCK_SIZE = 1024
+
+
+class GameRNG:
+    """
+    Per-game random number service.
+
+    Every game (or worker) owns its own instance, so parallel simulations never
+    share state and a game replays exactly from its seed. Child streams made
+    with `spawn` are derived from the seed string, not from draws, so they do
+    not depend on how much the parent has been used.
+    """
+
+    def __init__(self, seed=None, block_size: int = DEFAULT_BLOCK_SIZE):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed = seed
+        self.block_size = block_size
+        self._random = random.Random(f"{seed}")
+        # "#" keeps internal streams apart from spawn()'s "/"-joined child seeds
+        self._dice_random = random.Random(f"{seed}#dice")
+        self._dice: Dict[int, List[int]] = {}
+        self.dice_generation = 0  # Blocks drawn so far; snapshots reuse dice state while it is unchanged
+
+    def spawn(self, *key) -> 'GameRNG':
+        """
+        Returns an independent child stream identified by `key`.
+        """
+        return GameRNG("/".join(str(part) for part in (self.seed,) + key), self.block_size)
+
+    def split(self, count: int) -> List['GameRNG']:
+        """
+        Returns `count` independent child streams, e.g. one per worker.
+        """
+        return [self.spawn(index) for index in range(count)]
+
+    def getstate(self, dice: bool = True) -> tuple:
+        """
+        Everything needed to continue this stream later with setstate().
+        With dice=False the dice parts are None, for callers that already
+        hold them for the current `dice_generation`.
+        """
+        if not dice:
+            return self._random.getstate(), None, None
+        return (self._random.getstate(), self._dice_random.getstate(),
+                {sides: list(block) for sides, block in self._dice.items()})
+
+    def dice_left(self) -> Dict[int, int]:
+        """
+        Pre-drawn rolls left per die size. Rolls are served from the end of
+        each block, so what is left is always a prefix of the block.
+        """
+        return {sides: len(block) for sides, block in self._dice.items()}
+
+    def setstate(self, state: tuple):
+        random_state, dice_state, dice = state
+        self._random.setstate(random_state)
+        self._dice_random.setstate(dice_state)
+        self._dice = {sides: list(block) for sides, block in dice.items()}
+
+    def randint(self, a: int, b: int) -> int:
+        return self._random.randint(a, b)
+
+    def random(self) -> float:
+        return self._random.random()
+
+    def choice(self, seq: Sequence[T]) -> T:
+        return self._random.choice(seq)
+
+    def shuffle(self, seq: List) -> None:
+        self._random.shuffle(seq)
+
+    def roll(self, sides: int = 6) -> int:
+        """
+        Rolls one die, served from a block of pre-drawn rolls.
+        """
+        block = self._dice.get(sides)
+        if not block:
+            block = self._dice[sides] = self.rolls(sides, self.block_size)
+        return block.pop()
+
+    def rolls(self, sides: int, count: int) -> List[int]:
+        """
+        Draws `count` die rolls in one call.
+        """
+        self.dice_generation += 1
+        return self._dice_random.choices(range(1, sides + 1), k=count)
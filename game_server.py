@@ -0,0 +1,416 @@
+# game_server.py
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+from battle_policy import Decision
+from game_engine import GameEngine
+from game_rng import GameRNG
+from state_sync import StateEncoder, json_default
+from web_socket import (OP_PONG, OP_TEXT, WebSocketError, encode_frame, handshake_response,
+                        read_http_headers, read_message)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+HIGH_WATER = 256 * 1024       # Stop reading a client's commands while this much output is unsent
+MAX_BUFFERED = 4 * 1024 * 1024  # Disconnect clients that fall this far behind
+MAX_LINE = 64 * 1024
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+BAD_REQUEST = b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+
+# Files served to browsers over plain HTTP GET: path -> (file, content type)
+STATIC_FILES = {
+    "/": ("gameboardggui.html", "text/html; charset=utf-8"),
+    "/webgl.js": ("webgl.js", "text/javascript; charset=utf-8"),
+    "/src/media/GameBoard1920.png": ("src/media/GameBoard1920.png", "image/png"),
+}
+
+
+def encode(message: dict) -> bytes:
+    """
+    One protocol message: a JSON object on its own line.
+    """
+    return json.dumps(message, separators=(",", ":"), default=json_default).encode() + b"\n"
+
+
+def decision_message(decision: Optional[Decision]) -> Optional[dict]:
+    if decision is None:
+        return None
+    who = decision.player or decision.defender
+    return {"phase": decision.phase.value, "player": getattr(who, "name", None),
+            "turn": decision.turn, "options": list(decision.options)}
+
+
+class Connection:
+    """
+    One client socket, speaking JSON lines or (for browsers) WebSocket.
+    Outgoing messages are queued and written in batches by a single writer
+    task; while too much output is unsent, the client's next command is not
+    read (backpressure), and a client that falls too far behind is
+    disconnected.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.websocket = False
+        self.outbox: List[bytes] = []
+        self.buffered = 0
+        self.closed = False
+        self.rooms: Dict[int, 'GameRoom'] = {}
+        self._ready = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._drained.set()
+
+    def send(self, message: bytes):
+        if self.closed:
+            return
+        self.outbox.append(message)
+        self.buffered += len(message)
+        if self.buffered > MAX_BUFFERED:
+            logger.warning("Disconnecting slow client with %d bytes unsent", self.buffered)
+            self.close(abort=True)
+            return
+        if self.buffered > HIGH_WATER:
+            self._drained.clear()
+        self._ready.set()
+
+    def send_message(self, message: dict):
+        """
+        Sends a JSON message: one line, or one text frame on a WebSocket.
+        """
+        data = encode(message)
+        self.send(encode_frame(data[:-1], OP_TEXT) if self.websocket else data)
+
+    async def wait_writable(self):
+        await self._drained.wait()
+
+    async def write_loop(self):
+        try:
+            while True:
+                await self._ready.wait()
+                self._ready.clear()
+                if self.outbox:
+                    batch, self.outbox = self.outbox, []
+                    self.writer.write(b"".join(batch))
+                    await self.writer.drain()
+                    self.buffered -= sum(len(message) for message in batch)
+                    if self.buffered <= HIGH_WATER:
+                        self._drained.set()
+                if self.closed and not self.outbox:
+                    break
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.closed = True
+            self._drained.set()
+            self.writer.close()
+
+    def close(self, abort: bool = False):
+        """
+        Stops accepting messages; queued output is still written unless `abort`.
+        """
+        if abort:
+            self.outbox.clear()
+            self.writer.transport.abort()
+        if not self.closed:
+            self.closed = True
+            self._ready.set()
+            self._drained.set()
+
+
+class GameRoom:
+    """
+    One hosted GameEngine and the connections watching it. The room is the
+    engine's sink: events collect here and go out as one batched update per
+    subscriber after each command. JSON-line clients get the update as
+    JSON; WebSocket clients get a binary keyframe/delta state frame (see
+    state_sync) that carries the same events and decision.
+    """
+
+    def __init__(self, game_id: int, player_names: List[str], seed, owner: Connection):
+        self.game_id = game_id
+        self.events: List[list] = []
+        self.subscribers: List[Connection] = [owner]
+        self.owners: Dict[str, Optional[Connection]] = {name: owner for name in player_names}
+        self.engine = GameEngine(sink=self, rng=GameRNG(seed))
+        for name in player_names:
+            self.engine.add_player(name)
+        self.sync = StateEncoder(self.engine)
+        self.decision = self.engine.start()
+
+    def emit(self, kind: str, **data):
+        self.events.append([kind, data])
+
+    def claim(self, player: str, connection: Connection):
+        """
+        Seats `connection` as `player`; a seat held by a live connection can't be taken.
+        """
+        if player not in self.owners:
+            raise ValueError(f"No player {player!r} in game {self.game_id}")
+        owner = self.owners[player]
+        if owner is not None and owner is not connection and not owner.closed:
+            raise ValueError(f"Player {player!r} in game {self.game_id} is already taken")
+        self.owners[player] = connection
+
+    def release(self, connection: Connection) -> bool:
+        """
+        Frees the seats of a departing connection and unsubscribes it.
+        Returns whether any seat is still held by a live connection.
+        """
+        if connection in self.subscribers:
+            self.subscribers.remove(connection)
+        for player, owner in self.owners.items():
+            if owner is connection:
+                self.owners[player] = None
+        return any(owner is not None and not owner.closed for owner in self.owners.values())
+
+    def owner_of(self, decision: Decision) -> Optional[Connection]:
+        player = decision.player
+        if player is None:
+            player = next((p for p in self.engine.players if p.defender is decision.defender), None)
+        return self.owners.get(player.name) if player is not None else None
+
+    def flush(self):
+        update = {"game": self.game_id, "events": self.events, "decision": decision_message(self.decision)}
+        if self.decision is None:
+            update["winner"] = self.engine.winner
+            update["scores"] = self.engine.player_points
+        self.events = []
+        line = frame = None
+        for connection in self.subscribers:
+            if connection.websocket:
+                if frame is None:
+                    frame = encode_frame(self.sync.frame(update))
+                connection.send(frame)
+            else:
+                if line is None:
+                    line = encode(dict(update, type="update"))
+                connection.send(line)
+
+    def send_snapshot(self, connection: Connection):
+        """
+        Sends a joining browser the full state to apply later deltas to.
+        """
+        connection.send(encode_frame(self.sync.snapshot(
+            {"game": self.game_id, "events": [], "decision": decision_message(self.decision)})))
+
+
+class GameServer:
+    """
+    asyncio TCP server hosting many concurrent games in one process.
+
+    Clients speak newline-delimited JSON; browsers open a WebSocket on the
+    same port and send the same commands as text frames (a plain GET is
+    answered from STATIC_FILES). Commands:
+      {"op": "create", "players": [...], "seed": ...}  -> update for a new game
+      {"op": "join", "game": id, "player": name}        -> claim a free seat (or spectate without "player")
+      {"op": "submit", "game": id, "answer": ...}       -> answer the pending decision
+      {"op": "sync", "game": id}                        -> fresh keyframe (WebSocket clients)
+      {"op": "stats"}                                    -> server counters
+    Every command that changes a game is answered with one "update" per
+    subscriber carrying all events since the last update and the next decision.
+    """
+
+    def __init__(self):
+        self.rooms: Dict[int, GameRoom] = {}
+        self._ids = itertools.count(1)
+        self.games_started = 0
+        self.games_finished = 0
+        self.commands = 0
+        self.connections = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = Connection(reader, writer)
+        self.connections += 1
+        writer_task = asyncio.create_task(connection.write_loop())
+        try:
+            line = await reader.readline()
+            if line.startswith(b"GET "):
+                # Served a file or ran a WebSocket session; either way the
+                # connection ends here rather than reading JSON lines
+                await self.handle_http(connection, line)
+                return
+            while line and not connection.closed:
+                self.receive(connection, line)
+                await connection.wait_writable()
+                line = await reader.readline()
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass  # Disconnected, or sent a line or frame over MAX_LINE
+        finally:
+            self.connections -= 1
+            connection.close()
+            for room in list(connection.rooms.values()):
+                if not room.release(connection):
+                    self._discard(room, f"Game {room.game_id} stopped: every player left")
+                elif not room.subscribers:
+                    self.rooms.pop(room.game_id, None)
+            await writer_task
+
+    async def handle_http(self, connection: Connection, request_line: bytes):
+        """
+        Upgrades a browser to a WebSocket and reads its commands, or serves
+        one static file for a plain GET.
+        """
+        parts = request_line.split()
+        if len(parts) < 3:  # Method, path and HTTP version
+            connection.send(BAD_REQUEST)
+            return
+        headers = await read_http_headers(connection.reader)
+        if "upgrade" not in headers:
+            self.serve_static(connection, parts[1].decode("latin-1"))
+            return
+        try:
+            connection.send(handshake_response(headers))
+        except WebSocketError:
+            connection.send(BAD_REQUEST)
+            return
+        connection.websocket = True
+        while not connection.closed:
+            await connection.wait_writable()
+            message = await read_message(connection.reader, MAX_LINE,
+                                         lambda payload: connection.send(encode_frame(payload, OP_PONG)))
+            if message is None:
+                break
+            opcode, payload = message
+            if opcode == OP_TEXT:
+                self.receive(connection, payload)
+
+    def serve_static(self, connection: Connection, path: str):
+        entry = STATIC_FILES.get(path.split("?")[0])
+        if entry is None:
+            connection.send(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            return
+        filename, content_type = entry
+        with open(os.path.join(ROOT, filename), "rb") as f:
+            body = f.read()
+        connection.send(f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\n"
+                        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+
+    def receive(self, connection: Connection, data: bytes):
+        try:
+            self.dispatch(connection, json.loads(data))
+        except (ValueError, KeyError, TypeError) as e:
+            connection.send_message({"type": "error", "message": str(e)})
+
+    def dispatch(self, connection: Connection, command: dict):
+        self.commands += 1
+        op = command["op"]
+        if op == "submit":
+            room = self._room(command)
+            if room.decision is None:
+                raise ValueError(f"Game {room.game_id} is over")
+            if room.owner_of(room.decision) is not connection:
+                raise ValueError("It is not your turn")
+            answer = command.get("answer")
+            if not isinstance(answer, str):
+                raise TypeError(f"An answer must be a string, not {type(answer).__name__}")
+            try:
+                room.decision = room.engine.submit(answer)
+            except Exception as e:
+                # The engine's flow is dead after raising, so the game can't go on
+                logger.exception("Game %d failed", room.game_id)
+                self._discard(room, f"Game {room.game_id} stopped: {type(e).__name__}: {e}")
+                return
+            self._flush(room)
+        elif op == "create":
+            players = [str(name) for name in command["players"]]
+            if not players:
+                raise ValueError("A game needs at least one player")
+            game_id = next(self._ids)
+            room = GameRoom(game_id, players, command.get("seed", game_id), connection)
+            self.rooms[game_id] = room
+            connection.rooms[game_id] = room
+            self.games_started += 1
+            self._flush(room)
+        elif op == "join":
+            room = self._room(command)
+            player = command.get("player")
+            if player is not None:
+                room.claim(player, connection)
+            if connection not in room.subscribers:
+                room.subscribers.append(connection)
+            connection.rooms[room.game_id] = room
+            connection.send_message({"type": "joined", "game": room.game_id,
+                                     "decision": decision_message(room.decision)})
+            if connection.websocket:
+                room.send_snapshot(connection)
+        elif op == "sync":
+            self._room(command).send_snapshot(connection)
+        elif op == "stats":
+            connection.send_message(self.stats())
+        else:
+            raise ValueError(f"Unknown op {op!r}")
+
+    def _room(self, command: dict) -> GameRoom:
+        room = self.rooms.get(command["game"])
+        if room is None:
+            raise ValueError(f"No game {command['game']}")
+        return room
+
+    def _flush(self, room: GameRoom):
+        room.flush()
+        if room.decision is None:
+            self.games_finished += 1
+            self.rooms.pop(room.game_id, None)
+            for connection in room.subscribers:
+                connection.rooms.pop(room.game_id, None)
+
+    def _discard(self, room: GameRoom, message: str):
+        self.rooms.pop(room.game_id, None)
+        for connection in room.subscribers:
+            connection.rooms.pop(room.game_id, None)
+            connection.send_message({"type": "error", "game": room.game_id, "message": message})
+
+    def stats(self) -> dict:
+        return {"type": "stats", "pid": os.getpid(), "active_games": len(self.rooms),
+                "games_started": self.games_started, "games_finished": self.games_finished,
+                "commands": self.commands, "connections": self.connections,
+                "cpu_seconds": time.process_time()}
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, reuse_port: bool = False):
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_LINE, reuse_port=reuse_port)
+        async with server:
+            await server.serve_forever()
+
+
+def run_worker(host: str, port: int, reuse_port: bool):
+    try:
+        asyncio.run(GameServer().serve(host, port, reuse_port))
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host concurrent games over TCP (JSON lines).")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="server processes sharing the port via SO_REUSEPORT (Linux)")
+    args = parser.parse_args(argv)
+
+    if args.workers <= 1:
+        run_worker(args.host, args.port, False)
+        return
+    import multiprocessing
+    processes = [multiprocessing.Process(target=run_worker, args=(args.host, args.port, True))
+                 for _ in range(args.workers)]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
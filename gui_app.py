@@ -1,12 +1,15 @@
 from direct.showbase.ShowBase import ShowBase
 from direct.gui.OnscreenText import OnscreenText
 from direct.gui.DirectButton import DirectButton
-from panda3d.core import CardMaker, TransparencyAttrib, Point3
+from panda3d.core import CardMaker, Point3
 from direct.interval.IntervalGlobal import LerpPosInterval
 from pathlib import Path
 import json
 import random
 import logging
+from board_grid import BoardGrid
+from board_renderer import BoardRenderer
+from icon_atlas import build_icon_atlas
 
 # Logging Setup
 logging.basicConfig(level=logging.INFO,
@@ -15,6 +18,7 @@ logger = logging.getLogger(__name__)
 
 # Game Constants
 GRID_SIZE = 5
+MAX_TILES = GRID_SIZE * GRID_SIZE
 ICON_SPACING = 0.5
 ICON_SCALE = 0.2
 PLAYER_SCALE = 0.1
@@ -28,6 +32,11 @@ TEXT_COLOR = (1, 1, 1, 1)
 ICON_PATH = "C:/Users/mikep/not-in-my-cloud/nimc/notinmycloud/src/aws_icons/Resource-Icons_06072024"
 
 
+def icon_name_from_file(icon_file: Path) -> str:
+    """Res_Amazon-Athena_48.png -> Amazon-Athena"""
+    return icon_file.stem.split('_', 1)[-1].rsplit('_', 1)[0]
+
+
 class CloudSecurityGame(ShowBase):
     def __init__(self):
         super().__init__()
@@ -49,55 +58,28 @@ class CloudSecurityGame(ShowBase):
 
         # Setup camera
         self.setup_camera()
+        self.accept("mouse1", self.on_mouse_click)
 
     def load_aws_icons(self):
-        """Load AWS icons from the specified directory."""
-        icons = {}
-        base_path = Path(ICON_PATH)
-
-        if not base_path.exists():
-            logger.error(f"Icon directory does not exist: {base_path}")
-            return icons
-
-        for icon_file in base_path.glob("Res_*_48.png"):
-            try:
-                texture = self.loader.loadTexture(str(icon_file))
-                icon_name = icon_file.stem.split(
-                    '_', 2)[-1]  # Extract meaningful name
-                icons[icon_name] = texture
-                logger.info(f"Loaded icon: {icon_name}")
-            except Exception as e:
-                logger.error(f"Failed to load icon {icon_file}: {e}")
-
-        return icons
+        """Load AWS icons as one texture atlas (rasterized once, then cached)."""
+        self.icon_atlas = build_icon_atlas(ICON_PATH, "Res_*_48.png", name_for=icon_name_from_file)
+        if self.icon_atlas is None:
+            self.icon_texture = None
+            return {}
+        self.icon_texture = self.icon_atlas.load_texture(self.loader)
+        return self.icon_atlas.uvs
 
     def create_board(self):
-        """Create the game board with AWS icons."""
-        cm = CardMaker("icon_card")
-        cm.setFrame(-ICON_SCALE, ICON_SCALE, -ICON_SCALE, ICON_SCALE)
-
-        start_x = -(GRID_SIZE * ICON_SPACING) / 2
-        start_y = (GRID_SIZE * ICON_SPACING) / 2
-        x, y = start_x, start_y
-
-        for i, (icon_name, texture) in enumerate(self.icons.items()):
-            # Create a card for each icon
-            node = self.render2d.attachNewNode(cm.generate())
-            node.setTexture(texture)
-            node.setTransparency(TransparencyAttrib.MAlpha)
-            node.setPos(x, 0, y)
-            self.board_nodes.append(
-                {"node": node, "name": icon_name, "position": (x, y)})
-
-            # Update grid positions
-            x += ICON_SPACING
-            if (i + 1) % GRID_SIZE == 0:
-                x = start_x
-                y -= ICON_SPACING
-
-            # Limit to GRID_SIZE * GRID_SIZE
-            if len(self.board_nodes) >= GRID_SIZE * GRID_SIZE:
-                break
+        """Create the game board with AWS icons, batched into a single node."""
+        names = list(self.icons)[:MAX_TILES]
+        self.board_grid = BoardGrid.rectangular(names, columns=GRID_SIZE,
+                                                spacing=ICON_SPACING, half_size=ICON_SCALE)
+        self.board = BoardRenderer(self.icons, self.board_grid)
+        board_root = self.board.attach(self.render2d, self.icon_texture)
+        self.board_nodes = [
+            {"node": board_root, "name": tile.name, "position": tile.position}
+            for tile in self.board.tiles
+        ]
 
     def create_player(self):
         """Create the player sprite."""
@@ -120,11 +102,17 @@ class CloudSecurityGame(ShowBase):
                         self.board_nodes[position]['name']}")
 
     def is_valid_move(self, target_position):
-        """Check if move is valid."""
-        current_x, current_y = self.board_nodes[self.current_position]["position"]
-        target_x, target_y = self.board_nodes[target_position]["position"]
-        distance = abs(current_x - target_x) + abs(current_y - target_y)
-        return distance <= ICON_SPACING
+        """Check if move is valid (stay put or step to a neighbouring tile)."""
+        return self.board_grid.is_valid_move(self.current_position, target_position)
+
+    def on_mouse_click(self):
+        """Resolve a click on the board to a tile and handle it."""
+        if not self.mouseWatcherNode.hasMouse():
+            return
+        mouse = self.mouseWatcherNode.getMouse()
+        position = self.board_grid.pick(mouse.getX(), mouse.getY())
+        if position is not None:
+            self.handle_icon_click(position)
 
     def move_player_with_animation(self, target_position):
         """Move player to a new position."""
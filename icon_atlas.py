@@ -0,0 +1,143 @@
+# icon_atlas.py
+import hashlib
+import io
+import json
+import logging
+import math
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+ICON_CACHE_DIR = SCRIPT_DIR / ".cache" / "icons"
+ATLAS_VERSION = 1
+
+UVRect = Tuple[float, float, float, float]  # (u0, v0, u1, v1), v measured from the bottom like Panda3D
+
+
+@dataclass
+class IconAtlas:
+    """
+    One packed texture holding every icon, plus the UV rectangle of each icon.
+    """
+    image_path: Path
+    uvs: Dict[str, UVRect]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.uvs
+
+    def uv(self, name: str) -> UVRect:
+        return self.uvs[name]
+
+    def load_texture(self, loader):
+        """
+        Loads the atlas as a single Panda3D texture.
+        """
+        return loader.loadTexture(str(self.image_path))
+
+
+def _next_power_of_two(value: int) -> int:
+    return 1 << max(0, value - 1).bit_length()
+
+
+def rasterize_icon(path: Path, size: int, cache_dir: Path = ICON_CACHE_DIR) -> Image.Image:
+    """
+    Returns the icon as a size x size RGBA image, rasterizing it at most once:
+    results are cached on disk under a hash of the file content and size.
+    """
+    data = path.read_bytes()
+    digest = hashlib.sha1(data + f":{size}".encode()).hexdigest()
+    cached = cache_dir / f"{digest}.png"
+    if cached.exists():
+        return Image.open(cached).convert("RGBA")
+
+    if path.suffix.lower() == ".svg":
+        import cairosvg  # Only needed the first time an SVG is seen
+        data = cairosvg.svg2png(bytestring=data, output_width=size, output_height=size)
+    image = Image.open(io.BytesIO(data)).convert("RGBA")
+    if image.size != (size, size):
+        image = image.resize((size, size), Image.LANCZOS)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cached.with_suffix(f".{os.getpid()}.tmp")
+    image.save(tmp_path, format="PNG")
+    os.replace(tmp_path, cached)
+    return image
+
+
+def _atlas_key(paths: List[Path], size: int, padding: int, name_for: Callable[[Path], str]) -> str:
+    # Keyed on file stats so a warm start does not read any icon file, and on
+    # the icon names so callers naming icons differently get their own manifest.
+    digest = hashlib.sha1(f"v{ATLAS_VERSION}:{size}:{padding}".encode())
+    for path in paths:
+        stat = path.stat()
+        digest.update(f"{path.name}:{name_for(path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()
+
+
+def build_icon_atlas(icon_dir, pattern: str = "*.png", size: int = 64, padding: int = 2,
+                     name_for: Callable[[Path], str] = lambda path: path.stem,
+                     cache_dir: Path = ICON_CACHE_DIR) -> Optional[IconAtlas]:
+    """
+    Packs every icon matching `pattern` in `icon_dir` into one atlas image.
+
+    The atlas image and its UV manifest are cached; when no icon file changed
+    the cached atlas is returned without opening any icon. An atlas missing
+    icons that failed to rasterize is never cached, so they are retried on
+    the next build.
+    """
+    icon_dir = Path(icon_dir)
+    if not icon_dir.exists():
+        logger.error(f"Icon directory does not exist: {icon_dir}")
+        return None
+    paths = sorted(icon_dir.glob(pattern))
+    if not paths:
+        return None
+
+    key = _atlas_key(paths, size, padding, name_for)
+    image_path = cache_dir / f"atlas-{key}.png"
+    manifest_path = cache_dir / f"atlas-{key}.json"
+    if image_path.exists() and manifest_path.exists():
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            uvs = {name: tuple(rect) for name, rect in json.load(f)["uvs"].items()}
+        return IconAtlas(image_path, uvs)
+
+    icons: List[Tuple[str, Image.Image]] = []
+    failed = 0
+    for path in paths:
+        try:
+            icons.append((name_for(path), rasterize_icon(path, size, cache_dir)))
+        except (OSError, ValueError, ImportError) as e:
+            logger.error(f"Failed to rasterize icon {path}: {e}")
+            failed += 1
+
+    cell = size + 2 * padding
+    columns = math.ceil(math.sqrt(len(icons))) or 1
+    width = _next_power_of_two(columns * cell)
+    columns = width // cell
+    height = _next_power_of_two(math.ceil(len(icons) / columns) * cell)
+
+    atlas = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    uvs: Dict[str, UVRect] = {}
+    for index, (name, image) in enumerate(icons):
+        x = (index % columns) * cell + padding
+        y = (index // columns) * cell + padding
+        atlas.paste(image, (x, y))
+        uvs[name] = (x / width, 1 - (y + size) / height, (x + size) / width, 1 - y / height)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    if failed:
+        # Still usable this run, but kept out of the cache without a manifest
+        image_path = cache_dir / f"atlas-{key}.partial.png"
+        atlas.save(image_path, format="PNG")
+        logger.warning(f"Packed {len(uvs)} icons into {image_path.name}; {failed} failed and are not cached")
+        return IconAtlas(image_path, uvs)
+    atlas.save(image_path, format="PNG")
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"size": size, "uvs": uvs}, f)
+    logger.info(f"Packed {len(uvs)} icons into {image_path.name} ({width}x{height})")
+    return IconAtlas(image_path, uvs)
@@ -0,0 +1,78 @@
+# import_benchmark.py
+"""
+Cold-start guard: imports each game module in a fresh interpreter and checks
+that it stays under a time budget, prints nothing and writes no files.
+
+    python import_benchmark.py [--budget-ms 150] [--repeat 5]
+
+Exits with status 1 if any module fails.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from typing import List, Tuple
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MODULES = [
+    "resources",
+    "character_stats",
+    "player",
+    "opening_scene",
+    "vpc_defender",
+    "security_battle",
+    "game",
+    "game_engine",
+    "tournament",
+]
+
+PROBE = (
+    "import time, sys\n"
+    "started = time.perf_counter()\n"
+    "import {module}\n"
+    "sys.stderr.write('%.6f' % (time.perf_counter() - started))\n"
+)
+
+
+def time_import(module: str, workdir: str) -> Tuple[float, str]:
+    """
+    Returns (seconds, stdout) for importing `module` in a fresh interpreter.
+    """
+    env = dict(os.environ, PYTHONPATH=PROJECT_DIR, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run([sys.executable, "-c", PROBE.format(module=module)],
+                            cwd=workdir, env=env, capture_output=True, text=True, check=True)
+    return float(result.stderr.strip().splitlines()[-1]), result.stdout
+
+
+def run(budget_ms: float, repeat: int) -> List[str]:
+    failures = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for module in MODULES:
+            timings = []
+            for _ in range(repeat):
+                seconds, stdout = time_import(module, workdir)
+                timings.append(seconds)
+                if stdout:
+                    failures.append(f"{module}: printed on import: {stdout.splitlines()[0]!r}")
+            best_ms = min(timings) * 1000
+            print(f"{module:<16} {best_ms:8.2f} ms")
+            if best_ms > budget_ms:
+                failures.append(f"{module}: {best_ms:.2f} ms exceeds budget of {budget_ms} ms")
+        created = os.listdir(workdir)
+        if created:
+            failures.append(f"imports created files: {created}")
+    return sorted(set(failures))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=150.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    problems = run(args.budget_ms, args.repeat)
+    for problem in problems:
+        print(f"FAIL {problem}")
+    sys.exit(1 if problems else 0)
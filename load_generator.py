@@ -0,0 +1,197 @@
+# load_generator.py
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+from game_server import DEFAULT_HOST, DEFAULT_PORT, MAX_LINE, encode
+
+TURNS_PER_SESSION = 3
+
+
+def choose_answer(decision: dict, previous_phase: Optional[str]):
+    """
+    A scripted bot: buys one measure per turn, always attacks and plays
+    TURNS_PER_SESSION turns per session.
+    """
+    phase = decision["phase"]
+    if phase == "move":
+        return "roll"
+    if phase == "setup":
+        return "done" if previous_phase == "measure" else "measure"
+    if phase == "measure":
+        return decision["options"][0] if decision["options"] else ""
+    if phase == "continue":
+        return "yes" if decision["turn"] < TURNS_PER_SESSION else "no"
+    return "attack"
+
+
+class LoadConnection:
+    """
+    One client socket multiplexing many games; replies are routed by game id.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.waiting: Dict[int, asyncio.Future] = {}
+        self.creating: List[asyncio.Future] = []
+        self.stats: Optional[asyncio.Future] = None
+
+    async def read_loop(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                self.fail(ConnectionError("Server closed the connection"))
+                break
+            message = json.loads(line)
+            kind = message["type"]
+            if kind == "update":
+                future = self.waiting.pop(message["game"], None)
+                if future is None and self.creating:
+                    future = self.creating.pop(0)
+                if future is not None and not future.done():
+                    future.set_result(message)
+            elif kind == "stats" and self.stats is not None:
+                self.stats.set_result(message)
+            elif kind == "error":
+                # Errors about one game fail that game's request; others can't
+                # be matched to a request, so fail everything outstanding
+                error = RuntimeError(message["message"])
+                if "game" in message:
+                    future = self.waiting.pop(message["game"], None)
+                    if future is not None and not future.done():
+                        future.set_exception(error)
+                else:
+                    self.fail(error)
+
+    def fail(self, error: Exception):
+        futures = list(self.waiting.values()) + self.creating + [self.stats]
+        self.waiting, self.creating = {}, []
+        for future in futures:
+            if future is not None and not future.done():
+                future.set_exception(error)
+
+    async def request(self, command: dict) -> dict:
+        future = asyncio.get_running_loop().create_future()
+        if command["op"] == "create":
+            self.creating.append(future)
+        else:
+            self.waiting[command["game"]] = future
+        self.writer.write(encode(command))
+        await self.writer.drain()
+        return await future
+
+    async def server_stats(self) -> dict:
+        self.stats = asyncio.get_running_loop().create_future()
+        self.writer.write(encode({"op": "stats"}))
+        await self.writer.drain()
+        return await self.stats
+
+
+async def play_session(connection: LoadConnection, index: int, players: int, latencies: List[float]) -> dict:
+    started = time.perf_counter()
+    update = await connection.request({"op": "create", "seed": index,
+                                       "players": [f"bot{index}-{p}" for p in range(players)]})
+    latencies.append(time.perf_counter() - started)
+    game_id = update["game"]
+    previous = None
+    while update["decision"] is not None:
+        decision = update["decision"]
+        answer = choose_answer(decision, previous)
+        previous = decision["phase"]
+        sent = time.perf_counter()
+        update = await connection.request({"op": "submit", "game": game_id, "answer": answer})
+        latencies.append(time.perf_counter() - sent)
+    return update
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def run_load(host: str, port: int, sessions: int, concurrency: int, connections: int,
+                   players: int) -> dict:
+    """
+    Plays `sessions` games with at most `concurrency` in flight, spread over
+    `connections` sockets, and returns throughput and latency figures.
+    """
+    pool = []
+    for _ in range(connections):
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+        pool.append(LoadConnection(reader, writer))
+    readers = [asyncio.create_task(connection.read_loop()) for connection in pool]
+    before = await pool[0].server_stats()
+
+    latencies: List[float] = []
+    limit = asyncio.Semaphore(concurrency)
+    picker = itertools.cycle(pool)
+
+    async def one(index: int):
+        async with limit:
+            await play_session(next(picker), index, players, latencies)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(sessions)))
+    elapsed = time.perf_counter() - started
+    after = await pool[0].server_stats()
+
+    for task in readers:
+        task.cancel()
+    for connection in pool:
+        connection.writer.close()
+
+    latencies.sort()
+    cpu = after["cpu_seconds"] - before["cpu_seconds"]
+    return {
+        "sessions": sessions,
+        "elapsed_s": elapsed,
+        "sessions_per_s": sessions / elapsed,
+        "commands": len(latencies),
+        "server_cpu_s": cpu,
+        "sessions_per_core_s": sessions / cpu if cpu > 0 else None,
+        "latency_ms": {name: 1000 * value for name, value in (
+            ("mean", statistics.fmean(latencies) if latencies else 0.0),
+            ("p50", percentile(latencies, 0.50)),
+            ("p95", percentile(latencies, 0.95)),
+            ("p99", percentile(latencies, 0.99)),
+            ("max", latencies[-1] if latencies else 0.0),
+        )},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test game_server with scripted bot sessions.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=1000, help="games in flight at once")
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--players", type=int, default=2, help="players per game")
+    parser.add_argument("--spawn-server", action="store_true",
+                        help="start a one-process game_server for the run (sessions per core)")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.spawn_server:
+        server = subprocess.Popen([sys.executable, "game_server.py", "--host", args.host, "--port", str(args.port)],
+                                  cwd=sys.path[0] or None)
+        time.sleep(1.0)
+    try:
+        report = asyncio.run(run_load(args.host, args.port, args.sessions, args.concurrency,
+                                      args.connections, args.players))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
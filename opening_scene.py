@@ -1,4 +1,6 @@
 import json
+from functools import lru_cache
+from question_bank import QuestionBank
 
 MOON_ASCII = """
        _.-'''-._
@@ -27,34 +29,39 @@ def display_moon_landing():
 
 
 def get_questions():
-    """Retrieve questions from a JSON file."""
-    with open("nimc/notinmycloud/questions[0].json", "r", encoding="utf-8", errors="replace") as f:
-        return json.load(fp=f)
+    """Retrieve questions from the shared question bank (parsed once, on first use)."""
+    return QuestionBank.default().questions
 
 
+@lru_cache(maxsize=None)
 def get_options():
-    """Retrieve options from a JSON file."""
+    """Retrieve options from a JSON file (read once, on first use)."""
     with open("nimc/notinmycloud/options[0].json", "r", encoding="utf-8", errors="replace") as f:
         return json.load(f)
 
 def get_answer():
     """Retrieve questions from a JSON file."""
-    with open("nimc/notinmycloud/questions[0].json", "r", encoding="utf-8", errors="replace") as f:
-        return json.load(fp=f)["answer"]
+    return get_questions()["answer"]
 
-questions = get_questions()
-options = get_options()
 
 def start_interview():
     """Start the game's opening scene."""
     display_moon_landing()
+    try:
+        questions = get_questions()
+    except (OSError, ValueError) as e:
+        print(f"Interview questions are unavailable: {e}")
+        return False
     print("What is the difference between Continuous Delivery and Continuous Deployment?")
     for q in questions[:3]:
         print(f"\n{q['question']}")
-        for i, option in enumerate(q["options"], start=1):
+        options = q["options"]
+        choices = list(options)  # option letters for dict options, option text for lists
+        labels = options.values() if isinstance(options, dict) else options
+        for i, option in enumerate(labels, start=1):
             print(f"{i}. {option}")
         user_answer = input("Choose the correct option (1-4): ")
-        if q["options"][int(user_answer) - 1] == q["answer"]:
+        if choices[int(user_answer) - 1] == q["answer"]:
             print("Correct!")
         else:
             print("Incorrect! Try again.")
@@ -62,7 +69,9 @@ def start_interview():
     print("Congratulations! You're hired.")
     return True
 
-myquestions = get_questions()
-print(myquestions[0]["question"])
-print(myquestions[0]["options"])
-print(myquestions[0]["answer"])
\ No newline at end of file
+
+if __name__ == "__main__":
+    myquestions = get_questions()
+    print(myquestions[0]["question"])
+    print(myquestions[0]["options"])
+    print(myquestions[0]["answer"])
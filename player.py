@@ -1,6 +1,5 @@
 # player.py
 
-import random
 from typing import Optional
 from game_board import GameBoard, Region, AvailabilityZone
 
@@ -23,35 +22,32 @@ class Player:
         """
         self.home_region = self.game_board.regions[0]  # For example, first region as home
         self.home_az = self.home_region.azs[0]        # First AZ in home region
-        print(f"{self.name}'s home region is {
-              self.home_region.name} - {self.home_az.name}.")
 
     def roll_dice(self) -> int:
         """
         Simulates rolling a six-sided die to determine movement steps.
         """
-        return random.randint(1, 6)
+        return self.game_board.rng.roll(6)
 
     def draw_card(self) -> int:
         """
         Simulates drawing a card that determines movement steps (1-6).
         """
-        return random.randint(1, 6)  # Replace with card logic if needed
+        return self.game_board.rng.roll(6)  # Replace with card logic if needed
 
     def move(self, steps: int):
-        total_regions = len(self.game_board.regions)
-        self.current_position = (self.current_position + steps) % total_regions
+        self.current_position = self.game_board.landing_position(self.current_position, steps)
         landed_region = self.game_board.regions[self.current_position]
         # Randomly select an AZ within the region
-        landed_az = random.choice(landed_region.azs)
-        print(f"{self.name} landed on {
-              landed_region.name} - {landed_az.name}.")
+        landed_az = self.game_board.rng.choice(landed_region.azs)
         return landed_region, landed_az
 
 
-myplayer = Player("Mike", GameBoard())
-myplayer.set_home_region()
-steps = myplayer.roll_dice()
-landed_region, landed_az = myplayer.move(steps)
-print(f"{myplayer.name} rolled {steps} and moved to {
-      landed_region.name} - {landed_az.name}.")
+
+if __name__ == "__main__":
+    myplayer = Player("Mike", GameBoard())
+    myplayer.set_home_region()
+    steps = myplayer.roll_dice()
+    landed_region, landed_az = myplayer.move(steps)
+    print(f"{myplayer.name} rolled {steps} and moved to {
+          landed_region.name} - {landed_az.name}.")
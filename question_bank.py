@@ -0,0 +1,183 @@
+# question_bank.py
+import hashlib
+import json
+import marshal
+import os
+import random
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+QUESTIONS_PATH = SCRIPT_DIR / "questions.json"
+CACHE_DIR = SCRIPT_DIR / ".cache"
+CACHE_VERSION = 1
+
+# "Amazon SageMaker", "AWS Lambda", "Amazon Kinesis Data Streams", ...
+SERVICE_PATTERN = re.compile(r"\b(?:Amazon|AWS)\s+((?:[A-Z0-9][\w-]*)(?:\s+[A-Z0-9][\w-]*)*)")
+WORD_PATTERN = re.compile(r"[a-z][a-z0-9-]{3,}")
+STOPWORDS = frozenset("""
+    that this with which would what when where your from have they their there
+    into most best should will using used uses more than each other these those
+    need needs some only also such while about been being over under within
+""".split())
+
+
+def normalize_service(name: str) -> str:
+    """
+    Canonical lookup key for a service name: "AWS-Amazon-Athena",
+    "Amazon Athena" and "athena" all become "athena".
+    """
+    key = re.sub(r"[-_\s]+", " ", name.strip().lower())
+    key = re.sub(r"^(?:res |arch )?(?:aws |amazon )*", "", key)
+    return re.sub(r" \d+$", "", key)  # icon size suffix, e.g. "_48"
+
+
+def _question_text(question: dict) -> str:
+    options = question.get("options", {})
+    option_text = " ".join(options.values() if isinstance(options, dict) else options)
+    return " ".join((question.get("question", ""), option_text, question.get("explanation", "")))
+
+
+def build_indexes(questions: List[dict]) -> Dict[str, Dict[str, List[int]]]:
+    """
+    Builds the answer-letter, keyword and service-mention indexes.
+    """
+    by_answer: Dict[str, List[int]] = {}
+    by_keyword: Dict[str, List[int]] = {}
+    by_service: Dict[str, List[int]] = {}
+    for idx, question in enumerate(questions):
+        by_answer.setdefault(str(question.get("answer", "")), []).append(idx)
+        text = _question_text(question)
+        for word in set(WORD_PATTERN.findall(text.lower())) - STOPWORDS:
+            by_keyword.setdefault(word, []).append(idx)
+        services = set()
+        for mention in SERVICE_PATTERN.findall(text):
+            key = normalize_service(mention)
+            services.add(key)
+            services.add(key.split(" ", 1)[0])  # "kinesis data streams" also under "kinesis"
+        for key in services:
+            by_service.setdefault(key, []).append(idx)
+    return {"by_answer": by_answer, "by_keyword": by_keyword, "by_service": by_service}
+
+
+class QuestionBank:
+    """
+    Parsed questions.json with lookup indexes.
+
+    `load` keeps a marshal snapshot of the parsed questions and indexes in
+    CACHE_DIR, keyed on the source file's mtime/size and content hash, so a
+    warm start skips JSON parsing and index building entirely.
+    """
+
+    def __init__(self, questions: List[dict], by_answer: Dict[str, List[int]],
+                 by_keyword: Dict[str, List[int]], by_service: Dict[str, List[int]]):
+        self.questions = questions
+        self.by_answer = by_answer
+        self.by_keyword = by_keyword
+        self.by_service = by_service
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    @classmethod
+    def from_questions(cls, questions: List[dict]) -> 'QuestionBank':
+        return cls(questions, **build_indexes(questions))
+
+    @classmethod
+    def load(cls, path=QUESTIONS_PATH, cache_dir: Optional[Path] = CACHE_DIR) -> 'QuestionBank':
+        """
+        Loads a question file, using (and refreshing) the binary cache when possible.
+        """
+        path = Path(path)
+        stat = path.stat()
+        # Named by the source's full path, so same-named files in different directories don't collide
+        source_id = hashlib.sha1(str(path.resolve()).encode()).hexdigest()[:12]
+        cache_path = Path(cache_dir) / f"{path.stem}-{source_id}.v{CACHE_VERSION}.marshal" if cache_dir else None
+
+        cached = cls._read_cache(cache_path)
+        if cached and (cached["mtime_ns"], cached["size"]) == (stat.st_mtime_ns, stat.st_size):
+            return cls(cached["questions"], cached["by_answer"], cached["by_keyword"], cached["by_service"])
+
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if cached and cached["sha256"] == digest:
+            # Touched but unchanged: reuse the parse, refresh the stat key.
+            bank = cls(cached["questions"], cached["by_answer"], cached["by_keyword"], cached["by_service"])
+        else:
+            bank = cls.from_questions(json.loads(raw.decode("utf-8", errors="replace")))
+        if cache_path:
+            bank._write_cache(cache_path, stat, digest)
+        return bank
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def default(cls) -> 'QuestionBank':
+        """
+        The shared bank for the repository's questions.json.
+        """
+        return cls.load()
+
+    @staticmethod
+    def _read_cache(cache_path: Optional[Path]) -> Optional[dict]:
+        if not cache_path:
+            return None
+        try:
+            with open(cache_path, "rb") as f:
+                cached = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        return cached if isinstance(cached, dict) and cached.get("version") == CACHE_VERSION else None
+
+    def _write_cache(self, cache_path: Path, stat: os.stat_result, digest: str):
+        snapshot = {
+            "version": CACHE_VERSION,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest,
+            "questions": self.questions,
+            "by_answer": self.by_answer,
+            "by_keyword": self.by_keyword,
+            "by_service": self.by_service,
+        }
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                marshal.dump(snapshot, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass  # The cache is only an optimisation
+
+    def indices(self, answer: Optional[str] = None, keyword: Optional[str] = None,
+                service: Optional[str] = None) -> List[int]:
+        """
+        Indices of the questions matching every given filter (all questions if none).
+        """
+        filters = []
+        if answer is not None:
+            filters.append(self.by_answer.get(answer.upper(), []))
+        if keyword is not None:
+            filters.append(self.by_keyword.get(keyword.lower(), []))
+        if service is not None:
+            filters.append(self.by_service.get(normalize_service(service), []))
+        if not filters:
+            return list(range(len(self.questions)))
+        if len(filters) == 1:
+            return list(filters[0])  # A copy: callers must not be able to edit the index
+        smallest, *rest = sorted(filters, key=len)
+        others = [set(f) for f in rest]
+        return [idx for idx in smallest if all(idx in other for other in others)]
+
+    def filter(self, **filters) -> List[dict]:
+        return [self.questions[idx] for idx in self.indices(**filters)]
+
+    def random_question(self, rng=random, **filters) -> Optional[dict]:
+        """
+        A random question matching the filters, or None if nothing matches.
+        """
+        if not filters:
+            return rng.choice(self.questions) if self.questions else None
+        matches = self.indices(**filters)
+        return self.questions[rng.choice(matches)] if matches else None
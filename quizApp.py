@@ -6,9 +6,9 @@ from direct.gui.DirectFrame import DirectFrame
 from direct.task import Task
 from direct.interval.IntervalGlobal import Sequence  # Add this import
 from panda3d.core import TextNode, Point3, PointLight
-import json
 import os
 import math
+from question_bank import QuestionBank
 
 
 class Quiz3D(ShowBase):
@@ -19,8 +19,7 @@ class Quiz3D(ShowBase):
         script_dir = os.path.dirname(os.path.abspath(__file__))
         json_path = os.path.join(script_dir, 'questions.json')
 
-        with open(json_path, 'r') as file:
-            self.questions = json.load(file)
+        self.questions = QuestionBank.load(json_path).questions
 
         self.current_question = 0
         self.score = 0
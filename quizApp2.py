@@ -2,6 +2,7 @@ import json
 import tkinter as tk
 from tkinter import ttk, messagebox
 import os
+from question_bank import QuestionBank
 
 
 class QuizApp:
@@ -17,8 +18,7 @@ class QuizApp:
 
         # Load questions using absolute path
         try:
-            with open(json_path, 'r') as file:
-                self.questions = json.load(file)
+            self.questions = QuestionBank.load(json_path).questions
         except FileNotFoundError:
             messagebox.showerror(
                 "Error", f"Could not find questions.json at:\n{json_path}")
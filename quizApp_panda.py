@@ -3,15 +3,18 @@ from direct.gui.OnscreenText import OnscreenText
 from direct.gui.DirectButton import DirectButton
 
 from panda3d import *
+from panda3d.core import CardMaker, Point3, TextNode
 # from svgutils import transform
 # from panda3d import CardMaker, TransparencyAttrib, Point3, TextNode, NodePath
 from direct.interval.IntervalGlobal import LerpPosInterval
 from pathlib import Path
-import os
 import json
-import random
 import logging
-import tempfile
+from board_grid import BoardGrid
+from board_renderer import BoardRenderer
+from icon_atlas import build_icon_atlas
+from question_bank import QuestionBank
+from service_index import ServiceQuestionIndex
 
 
 # Logging Setup
@@ -21,6 +24,7 @@ logger = logging.getLogger(__name__)
 
 # Game Constants
 GRID_SIZE = 5
+MAX_TILES = GRID_SIZE * GRID_SIZE
 ICON_SPACING = 0.5
 ICON_SCALE = 0.2
 PLAYER_SCALE = 0.1
@@ -59,6 +63,7 @@ class CloudSecurityGame(ShowBase):
         # Load AWS icons and questions
         self.icons = self.load_aws_icons()
         self.questions_data = self.load_questions()
+        self.service_index = ServiceQuestionIndex.default() if self.questions_data else None
 
         # Create board and player
         self.create_board()
@@ -67,92 +72,36 @@ class CloudSecurityGame(ShowBase):
 
         # Setup camera
         self.setup_camera()
+        self.accept("mouse1", self.on_mouse_click)
 
     def load_aws_icons(self):
-        """Load AWS icons from the specified directory."""
-        icons = {}
-        if not ICON_PATH.exists():
-            logger.error(f"Icon directory does not exist: {ICON_PATH}")
-            return icons
-
-        try:
-            for icon_file in ICON_PATH.glob("*.svg"):
-                try:
-                    # Load SVG
-                    svg_fig = transform.fromfile(str(icon_file))
-
-                    # Create temporary PNG file
-                    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_file:
-                        # Save as PNG
-                        svg_fig.save(tmp_file.name)
-
-                        # Load the PNG as texture
-                        texture = self.loader.loadTexture(tmp_file.name)
-                        icon_name = icon_file.stem
-                        icons[icon_name] = texture
-                        logger.info(f"Loaded icon: {icon_name}")
-
-                        # Clean up temporary file
-                        os.unlink(tmp_file.name)
-
-                except ValueError as e:
-                    logger.error(f"Failed to load icon {icon_file}: {e}")
-
-        except ValueError as e:
-            logger.error(f"Error in load_aws_icons: {e}")
-
-        return icons
+        """Load AWS icons as one texture atlas (rasterized once, then cached)."""
+        self.icon_atlas = build_icon_atlas(ICON_PATH, "*.svg")
+        if self.icon_atlas is None:
+            self.icon_texture = None
+            return {}
+        self.icon_texture = self.icon_atlas.load_texture(self.loader)
+        return self.icon_atlas.uvs
 
     def load_questions(self):
-        """Load AWS icons from the specified directory."""
-        icons = {}
-        base_path = Path(ICON_PATH)
-
-        if not base_path.exists():
-            logger.error(f"Icon directory does not exist: {base_path}")
-            return icons
-
-        for icon_file in base_path.glob("Res_*_48.png"):
-            try:
-                texture = self.loader.loadTexture(str(icon_file))
-                icon_name = icon_file.stem.split(
-                    '_', 2)[-1]  # Extract meaningful name
-                icons[icon_name] = texture
-                logger.info(f"Loaded icon: {icon_name}")
-            except ValueError as ve:
-                logger.error(f"ValueError processing icon {
-                    icon_file}: {ve}")
-                logger.error(f"Failed to load icon {icon_file}: {ve}")
-
-        return icons
+        """Load the shared question bank."""
+        try:
+            return QuestionBank.default().questions
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load questions: {e}")
+            return []
 
     def create_board(self):
-        """Create the game board with AWS icons."""
-        cm = CardMaker("icon_card")
-        cm.setFrame(-ICON_SCALE, ICON_SCALE, -ICON_SCALE, ICON_SCALE)
-
-        start_x = -(GRID_SIZE * ICON_SPACING) / 2
-        start_y = (GRID_SIZE * ICON_SPACING) / 2
-        x, y = start_x, start_y
-
-        for i, (icon_name, texture) in enumerate(self.icons.items()):
-            # Create a card for each icon
-            node = self.render2d.attachNewNode(cm.generate())
-            node.setTexture(texture)
-            node.setTransparency(TransparencyAttrib.MAlpha)
-            node.setPos(x, 0, y)
-            self.board_nodes.append(
-                {"node": node, "name": icon_name, "position": (x, y)})
-
-            # Update grid positions
-            x += ICON_SPACING
-            if (i + 1) % GRID_SIZE == 0:
-                x = start_x
-                y -= ICON_SPACING
-
-            # Limit to GRID_SIZE * GRID_SIZE
-            if len(self.board_nodes) >= GRID_SIZE * GRID_SIZE:
-                break
+        """Create the game board with AWS icons, batched into a single node."""
+        names = list(self.icons)[:MAX_TILES]
+        self.board_grid = BoardGrid.rectangular(names, columns=GRID_SIZE,
+                                                spacing=ICON_SPACING, half_size=ICON_SCALE)
+        self.board = BoardRenderer(self.icons, self.board_grid)
+        board_root = self.board.attach(self.render2d, self.icon_texture)
+        self.board_nodes = [
+            {"node": board_root, "name": tile.name, "position": tile.position}
+            for tile in self.board.tiles
+        ]
 
     def create_player(self):
         """Create the player sprite."""
@@ -189,11 +138,17 @@ class CloudSecurityGame(ShowBase):
             self.trigger_icon_action(position)
 
     def is_valid_move(self, target_position):
-        """Check if move is valid."""
-        current_x, current_y = self.board_nodes[self.current_position]["position"]
-        target_x, target_y = self.board_nodes[target_position]["position"]
-        distance = abs(current_x - target_x) + abs(current_y - target_y)
-        return distance <= ICON_SPACING
+        """Check if move is valid (stay put or step to a neighbouring tile)."""
+        return self.board_grid.is_valid_move(self.current_position, target_position)
+
+    def on_mouse_click(self):
+        """Resolve a click on the board to a tile and handle it."""
+        if not self.mouseWatcherNode.hasMouse():
+            return
+        mouse = self.mouseWatcherNode.getMouse()
+        position = self.board_grid.pick(mouse.getX(), mouse.getY())
+        if position is not None:
+            self.handle_icon_click(position)
 
     def move_player_with_animation(self, target_position):
         """Move player to a new position."""
@@ -218,9 +173,9 @@ class CloudSecurityGame(ShowBase):
             button.destroy()
         self.option_buttons = []
 
-        # Get random question
-        if self.questions_data:
-            question = random.choice(self.questions_data)
+        # Get a question about the tile's service (category/any question as fallback)
+        if self.service_index:
+            question = self.service_index.question_for(icon_name)
 
             # Create question text
             question_text = OnscreenText(
@@ -233,15 +188,15 @@ class CloudSecurityGame(ShowBase):
             )
 
             # Create option buttons
-            for i, option in enumerate(question["options"]):
+            for i, (letter, option) in enumerate(question["options"].items()):
                 button = DirectButton(
-                    text=option,
+                    text=f"{letter}. {option}",
                     text_scale=0.04,
                     text_fg=TEXT_COLOR,
                     frameColor=BUTTON_COLOR,
                     pos=(0, 0, 0.6 - (i * 0.12)),
                     command=self.check_answer,
-                    extraArgs=[option, question["answer"]]
+                    extraArgs=[letter, question["answer"]]
                 )
                 self.option_buttons.append(button)
 
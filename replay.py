@@ -0,0 +1,434 @@
+# replay.py
+import argparse
+import json
+import os
+import random
+import struct
+import sys
+import time
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from battle_policy import AutoPlayPolicy, ConsolePolicy, GamePolicy, NullSink, RandomPolicy, SpellFirstPolicy
+from game_engine import GameEngine
+from game_rng import GameRNG
+
+MAGIC = b"DDRP"
+REPLAY_VERSION = 1
+
+# Command stream opcodes; a byte below OP_DEFINE is an index into the value table
+OP_DEFINE = 0xF0    # u16 length + JSON value: appended to the table, and is the command
+OP_WIDE = 0xF1      # u16 table index, once the table outgrows one byte
+OP_CHECKSUM = 0xF2  # u32 state checksum at a turn boundary
+OP_END = 0xF3       # u16 length + JSON outcome: winner and points, or the error
+
+_HEADER = struct.Struct("<4sHII")  # magic, version, header length, body length
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+
+# git bisect run: 0 = good, 1 = bad, 125 = this commit cannot be tested
+EXIT_OK, EXIT_DIVERGED, EXIT_UNTESTABLE = 0, 1, 125
+
+POLICIES = {
+    "auto": AutoPlayPolicy,
+    "spell": SpellFirstPolicy,
+    "random": RandomPolicy,
+}
+
+
+class ReplayError(ValueError):
+    """
+    A recording that cannot be read by this version.
+    """
+
+
+class ReplayDivergence(Exception):
+    """
+    The replayed game no longer matches its recording.
+    """
+
+    def __init__(self, turn: int, message: str):
+        super().__init__(f"turn boundary {turn}: {message}")
+        self.turn = turn
+
+
+def state_checksum(engine: GameEngine) -> int:
+    """
+    CRC32 of the state that must match at every turn boundary: the cursor,
+    positions and points, defender stats, active effects and dice use.
+    """
+    values = array("q", (engine.session_count, engine.player_index, engine.turn, engine.session_points))
+    for player in engine.players:
+        values.extend((player.current_position, engine.player_points.get(player.name, 0)))
+    for defender in engine.defenders:
+        resources = defender.resources
+        effects = defender.status_effects
+        values.extend((defender.level, defender.max_health, defender.current_health,
+                       defender.preparation_points, len(defender.active_measures), effects.round,
+                       effects.buff_total, effects.debuff_total, resources.compute_points,
+                       resources.network_bandwidth, resources.storage_capacity))
+    values.append(engine.rng.dice_generation)
+    values.extend(engine.rng.dice_left().values())
+    return zlib.crc32(values.tobytes())
+
+
+def _outcome(engine: GameEngine, error: Optional[BaseException] = None) -> dict:
+    if error is not None:
+        return {"error": f"{type(error).__name__}: {error}"}
+    return {"winner": engine.winner, "points": engine.player_points}
+
+
+class GameRecorder:
+    """
+    Records a game as its seed and settings plus every answer given to it.
+
+    Attach before the game starts. Each answer is one byte in the common
+    case (an index into a table of the distinct answers seen so far), and a
+    CRC32 of the game state is stored at every turn boundary, so a replay
+    can report the first turn where it diverges.
+    """
+
+    def __init__(self, engine: GameEngine):
+        self.header = {"seed": engine.rng.seed, "block_size": engine.rng.block_size,
+                       "players": [player.name for player in engine.players],
+                       "max_sessions": engine.max_sessions, "winning_score": engine.winning_score}
+        self.body = bytearray()
+        self.table: Dict[tuple, int] = {}
+        self.finished = False
+
+    @classmethod
+    def attach(cls, engine: GameEngine) -> 'GameRecorder':
+        engine.recorder = recorder = cls(engine)
+        return recorder
+
+    def command(self, answer):
+        try:
+            key = (answer.__class__, answer)
+            index = self.table.get(key)
+        except TypeError:  # Unhashable answers are keyed by their JSON
+            key = (None, json.dumps(answer, sort_keys=True))
+            index = self.table.get(key)
+        if index is None:
+            self.table[key] = len(self.table)
+            value = json.dumps(answer).encode()
+            self.body.append(OP_DEFINE)
+            self.body += _U16.pack(len(value)) + value
+        elif index < OP_DEFINE:
+            self.body.append(index)
+        else:
+            self.body.append(OP_WIDE)
+            self.body += _U16.pack(index)
+
+    def turn(self, engine: GameEngine):
+        self.body.append(OP_CHECKSUM)
+        self.body += _U32.pack(state_checksum(engine))
+
+    def turn_end(self, engine: GameEngine):
+        # A second checksum once the battle is resolved: a session usually
+        # resets preparation and health before the next turn starts, which
+        # would otherwise hide differences inside the turn
+        self.turn(engine)
+
+    def game_over(self, engine: GameEngine, error: Optional[BaseException] = None):
+        if self.finished:
+            return
+        self.finished = True
+        outcome = json.dumps(_outcome(engine, error), sort_keys=True).encode()
+        self.body.append(OP_END)
+        self.body += _U16.pack(len(outcome)) + outcome
+
+    def to_bytes(self) -> bytes:
+        header = json.dumps(self.header).encode()
+        return _HEADER.pack(MAGIC, REPLAY_VERSION, len(header), len(self.body)) + header + bytes(self.body)
+
+
+@dataclass
+class Recording:
+    header: dict
+    body: bytes
+
+    def engine(self, sink=None) -> GameEngine:
+        """
+        A fresh engine set up as the recorded one was, before its first answer.
+        """
+        engine = GameEngine(sink=sink or NullSink(), rng=GameRNG(self.header["seed"], self.header["block_size"]))
+        engine.max_sessions = self.header["max_sessions"]
+        engine.winning_score = self.header["winning_score"]
+        for name in self.header["players"]:
+            engine.add_player(name)
+        return engine
+
+
+def read_recordings(data: bytes) -> Iterator[Recording]:
+    """
+    The recordings in a file: one game, or many concatenated.
+    """
+    offset = 0
+    while offset < len(data):
+        magic, version, header_length, body_length = _HEADER.unpack_from(data, offset)
+        if magic != MAGIC:
+            raise ReplayError(f"Not a game recording at byte {offset}")
+        if version != REPLAY_VERSION:
+            raise ReplayError(f"Recording version {version} is not supported (expected {REPLAY_VERSION})")
+        offset += _HEADER.size
+        header = json.loads(data[offset:offset + header_length])
+        offset += header_length
+        yield Recording(header, data[offset:offset + body_length])
+        offset += body_length
+
+
+class _Stream:
+    """
+    Reads a recording's command stream back, item by item.
+    """
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.offset = 0
+        self.values: List = []
+        self.turns = 0
+
+    def _length_prefixed(self) -> bytes:
+        length, = _U16.unpack_from(self.body, self.offset)
+        start = self.offset + _U16.size
+        self.offset = start + length
+        return self.body[start:self.offset]
+
+    def command(self):
+        if self.offset >= len(self.body):
+            raise ReplayDivergence(self.turns, "the game asked for more answers than were recorded")
+        op = self.body[self.offset]
+        if op < OP_DEFINE:
+            self.offset += 1
+            return self.values[op]
+        if op == OP_WIDE:
+            index, = _U16.unpack_from(self.body, self.offset + 1)
+            self.offset += 1 + _U16.size
+            return self.values[index]
+        if op == OP_DEFINE:
+            self.offset += 1
+            self.values.append(json.loads(self._length_prefixed()))
+            return self.values[-1]
+        raise ReplayDivergence(self.turns, "the game asked for an answer where the recording has "
+                                           + ("a new turn" if op == OP_CHECKSUM else "the end of the game"))
+
+    def checksum(self, engine: GameEngine, turn_end: bool = False):
+        if self.offset >= len(self.body) or self.body[self.offset] != OP_CHECKSUM:
+            raise ReplayDivergence(self.turns, "the game " + ("finished" if turn_end else "started")
+                                   + " a turn the recording does not have")
+        expected, = _U32.unpack_from(self.body, self.offset + 1)
+        self.offset += 1 + _U32.size
+        actual = state_checksum(engine)
+        if actual != expected:
+            raise ReplayDivergence(self.turns, f"state checksum {actual:08x} != recorded {expected:08x}"
+                                               + (" after the battle" if turn_end else ""))
+        if not turn_end:
+            self.turns += 1
+
+    def outcome(self) -> Optional[dict]:
+        if self.offset >= len(self.body):
+            return None  # Recording stopped before the game ended
+        if self.body[self.offset] != OP_END:
+            raise ReplayDivergence(self.turns, "the game ended before the recording did")
+        self.offset += 1
+        return json.loads(self._length_prefixed())
+
+
+class _Verifier:
+    """
+    Stands in for the recorder during a replay, checking each turn boundary.
+    """
+
+    def __init__(self, stream: _Stream):
+        self.stream = stream
+
+    def command(self, answer):
+        pass
+
+    def turn(self, engine: GameEngine):
+        self.stream.checksum(engine)
+
+    def turn_end(self, engine: GameEngine):
+        self.stream.checksum(engine, turn_end=True)
+
+    def game_over(self, engine: GameEngine):
+        pass
+
+
+@dataclass
+class ReplayResult:
+    ok: bool
+    turns: int
+    message: str = ""
+
+
+def replay(recording: Recording, sink=None) -> ReplayResult:
+    """
+    Re-executes a recording headlessly, checking the state at every turn
+    boundary and the final outcome (or the recorded error) against it.
+    """
+    stream = _Stream(recording.body)
+    engine = recording.engine(sink)
+    engine.recorder = _Verifier(stream)
+    error = None
+    try:
+        decision = engine.start()
+        while decision is not None:
+            decision = engine.submit(stream.command())
+    except ReplayDivergence as divergence:
+        return ReplayResult(False, stream.turns, str(divergence))
+    except Exception as e:  # A crash is an outcome too: it may be what was recorded
+        error = e
+    try:
+        expected = stream.outcome()
+    except ReplayDivergence as divergence:
+        return ReplayResult(False, stream.turns, str(divergence) if error is None else _outcome(engine, error)["error"])
+    if expected is None:
+        return ReplayResult(True, stream.turns, "recording ends mid-game")
+    actual = json.loads(json.dumps(_outcome(engine, error), sort_keys=True))
+    if actual != expected:
+        return ReplayResult(False, stream.turns, f"outcome {actual} != recorded {expected}")
+    return ReplayResult(True, stream.turns)
+
+
+def record_game(seed, players: Sequence[str], policy: GamePolicy, max_sessions: int = 5,
+                winning_score: int = 500) -> bytes:
+    """
+    Plays one headless game with `policy` and returns its recording.
+    """
+    engine = GameEngine(policy=policy, sink=NullSink(), rng=GameRNG(seed))
+    engine.max_sessions = max_sessions
+    engine.winning_score = winning_score
+    for name in players:
+        engine.add_player(name)
+    recorder = GameRecorder.attach(engine)
+    try:
+        engine.play_sessions()
+    except Exception as e:
+        recorder.game_over(engine, e)
+    return recorder.to_bytes()
+
+
+def _replay_shard(blobs: Sequence[bytes]) -> List[Tuple[bool, int, str]]:
+    results = []
+    for blob in blobs:
+        recording = next(read_recordings(blob))
+        result = replay(recording)
+        results.append((result.ok, result.turns, result.message))
+    return results
+
+
+def _split(data: bytes) -> List[bytes]:
+    """
+    Each recording's own bytes, so workers receive only their share.
+    """
+    blobs, offset = [], 0
+    for _ in read_recordings(data):
+        _, _, header_length, body_length = _HEADER.unpack_from(data, offset)
+        end = offset + _HEADER.size + header_length + body_length
+        blobs.append(data[offset:end])
+        offset = end
+    return blobs
+
+
+def verify(paths: Sequence[str], workers: Optional[int] = None, quiet: bool = False) -> int:
+    """
+    Replays every recording in `paths` (files or directories of *.ddr) and
+    returns an exit code for `git bisect run`.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".ddr"))
+        else:
+            files.append(path)
+    blobs, names = [], []
+    try:
+        for path in files:
+            with open(path, "rb") as f:
+                split = _split(f.read())
+            blobs.extend(split)
+            names.extend(f"{path}#{index}" for index in range(len(split)))
+    except (OSError, ReplayError, struct.error) as e:
+        print(f"cannot read recordings: {e}", file=sys.stderr)
+        return EXIT_UNTESTABLE
+
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(blobs) < 2:
+        results = _replay_shard(blobs)
+    else:
+        shards = [blobs[index::workers] for index in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shard_results = list(pool.map(_replay_shard, shards))
+        results = [None] * len(blobs)
+        for index, shard in enumerate(shard_results):
+            results[index::workers] = shard
+    elapsed = time.perf_counter() - started
+
+    failures = [(name, result) for name, result in zip(names, results) if not result[0]]
+    turns = sum(result[1] for result in results)
+    if not quiet:
+        for name, (_, turn, message) in failures[:20]:
+            print(f"DIVERGED {name}: {message}")
+        print(f"{len(results) - len(failures)}/{len(results)} games replayed identically "
+              f"({turns} turns in {elapsed:.2f}s, {turns / elapsed if elapsed else 0:.0f} turns/s)")
+    return EXIT_DIVERGED if failures else EXIT_OK
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record and replay game sessions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="record headless AI games into one file")
+    record.add_argument("output")
+    record.add_argument("--games", type=int, default=1000)
+    record.add_argument("--seed", default="0")
+    record.add_argument("--players", type=int, default=4)
+    record.add_argument("--policy", choices=sorted(POLICIES), default="auto")
+
+    play = commands.add_parser("play", help="play an interactive console game and record it")
+    play.add_argument("output")
+    play.add_argument("--seed", default=None)
+
+    check = commands.add_parser("verify", help="replay recordings; exit status works with `git bisect run`")
+    check.add_argument("paths", nargs="+")
+    check.add_argument("--workers", type=int, default=None)
+    check.add_argument("--quiet", action="store_true")
+
+    args = parser.parse_args(argv)
+    if args.command == "verify":
+        return verify(args.paths, args.workers, args.quiet)
+
+    if args.command == "record":
+        root = GameRNG(args.seed)
+        players = [f"Player {index + 1}" for index in range(args.players)]
+        with open(args.output, "wb") as f:
+            for game in range(args.games):
+                seed = root.spawn(game).seed
+                policy = POLICIES[args.policy]()
+                if isinstance(policy, RandomPolicy):
+                    policy = RandomPolicy(random.Random(f"{seed}#policy"))
+                f.write(record_game(seed, players, policy))
+        print(f"Recorded {args.games} games to {args.output}")
+        return EXIT_OK
+
+    engine = GameEngine(policy=ConsolePolicy(), rng=GameRNG(args.seed))
+    engine.initialize_game()
+    recorder = GameRecorder.attach(engine)
+    try:
+        engine.play_sessions()
+    except Exception as e:
+        recorder.game_over(engine, e)
+        raise
+    finally:
+        with open(args.output, "wb") as f:
+            f.write(recorder.to_bytes())
+        print(f"Recording saved to {args.output}")
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,19 +2,11 @@
 from dataclasses import dataclass
 from typing import Dict
 import logging
+from game_log import event_log
 # import json
 
-logger = logging.getLogger(__name__)
-logging.basicConfig(filename='resources.log',
-                    encoding='utf-8',
-                    format='%(asctime)s %(message)s',
-                    level=logging.DEBUG)
 
-logger.info('Resources module imported')
-logger.debug('Resources module imported')
-
-
-@dataclass
+@dataclass(slots=True)
 class Resources:
     compute_points: int = 100
     network_bandwidth: int = 50
@@ -25,21 +17,44 @@ class Resources:
     data_integrity: int = 95
 
     def has_sufficient(self, available: Dict[str, int]) -> bool:
-        logger.debug('Resources module imported')
+        if event_log.enabled:
+            event_log.emit(logging.DEBUG, "resources.check", required=available)
         return (self.compute_points >= available.get('compute', 0) and
                 self.network_bandwidth >= available.get('network', 0) and
                 self.storage_capacity >= available.get('storage', 0))
 
     def consume(self, cost: Dict[str, int]) -> bool:
-        logger.debug('Resources module imported')
+        if event_log.enabled:
+            event_log.emit(logging.DEBUG, "resources.consume", cost=cost)
         if self.has_sufficient(cost):
-            self.compute_points -= cost.get('compute')
-            self.network_bandwidth -= cost.get('network')
-            self.storage_capacity -= cost.get('storage')
+            self.compute_points -= cost.get('compute', 0)
+            self.network_bandwidth -= cost.get('network', 0)
+            self.storage_capacity -= cost.get('storage', 0)
             return f"Resources consumed: {cost}"
         return False
 
-
-myrss = Resources(10, 10, 10, 10, 10, 10)
-print(myrss.has_sufficient({'compute': 10, 'network': 10, 'storage': 10}))
-print(myrss.consume({'compute': 10, 'network': 10, 'storage': 10}))
+    def can_afford(self, compute: int = 0, network: int = 0, storage: int = 0) -> bool:
+        return (self.compute_points >= compute and self.network_bandwidth >= network and
+                self.storage_capacity >= storage)
+
+    def try_consume(self, compute: int = 0, network: int = 0, storage: int = 0) -> bool:
+        """
+        Checks and debits a (compute, network, storage) cost in one step.
+        """
+        if not (self.compute_points >= compute and self.network_bandwidth >= network and
+                self.storage_capacity >= storage):
+            return False
+        if event_log.enabled:
+            event_log.emit(logging.DEBUG, "resources.consume",
+                           cost={"compute": compute, "network": network, "storage": storage})
+        self.compute_points -= compute
+        self.network_bandwidth -= network
+        self.storage_capacity -= storage
+        return True
+
+
+
+if __name__ == "__main__":
+    myrss = Resources(10, 10, 10, 10, 10, 10)
+    print(myrss.has_sufficient({'compute': 10, 'network': 10, 'storage': 10}))
+    print(myrss.consume({'compute': 10, 'network': 10, 'storage': 10}))
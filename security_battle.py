@@ -1,75 +1,113 @@
 # security_battle.py
-from typing import TYPE_CHECKING
+import random
+from typing import TYPE_CHECKING, Optional
+from battle_policy import ATTACK, CAST_SPELL, BattlePolicy, ConsolePolicy, ConsoleSink, Decision, GamePhase
 if TYPE_CHECKING:
     from vpc_defender import VPCDefender
     from threat import Threat
-    from security_measures import SecurityStrategy
 
 
 class SecurityBattle:
     """
     Manages the battle between the VPC Defender and a Threat.
+
+    The defender's actions come from `policy` and battle messages go to `sink`;
+    both default to the interactive console.
     """
 
-    def __init__(self, defender: 'VPCDefender', threat: 'Threat'):
+    def __init__(self, defender: 'VPCDefender', threat: 'Threat',
+                 policy: Optional[BattlePolicy] = None, sink=None,
+                 max_rounds: Optional[int] = None, rng=random):
         self.defender = defender
         self.threat = threat
+        self.policy = policy or ConsolePolicy()
+        self.sink = sink or ConsoleSink()
+        self.max_rounds = max_rounds
+        self.rng = rng
         self.round = 1
 
     def start_battle(self):
         """
         Starts the battle until either the defender or the threat is defeated.
         """
-        print(f"\nA threat '{
-              self.threat.name}' has emerged! Preparing for battle...")
-        print(f"Defender: {self.defender.name}")
-        print(f"Level: {self.defender.level}")
-        print(
-            f"Health: {self.defender.current_health}/{self.defender.max_health}")
-        while self.defender.is_alive() and self.threat.persistence > 0:
-            print(f"\n--- Round {self.round} ---")
+        self._begin()
+        while self._in_progress():
+            self.sink.emit("round_start", round=self.round)
             self.player_turn()
-            if not self.threat_defeated():
-                self.threat_turn()
-            self.round += 1
+            self._end_round()
+        self._finish()
+
+    def run(self):
+        """
+        The battle as a resumable generator: yields a Decision whenever the
+        defender must act and expects the answer to be sent back.
+        """
+        self._begin()
+        while self._in_progress():
+            self.sink.emit("round_start", round=self.round)
+            action = yield Decision(GamePhase.BATTLE_ACTION, defender=self.defender, battle=self,
+                                    options=(ATTACK, CAST_SPELL))
+            spell_key = None
+            if action == CAST_SPELL:
+                spell_key = yield Decision(GamePhase.BATTLE_SPELL, defender=self.defender, battle=self,
+                                           options=tuple(self.defender.spells))
+            # A missing answer counts as an invalid choice, never as "ask the policy".
+            self.player_turn("" if action is None else action,
+                             "" if action == CAST_SPELL and spell_key is None else spell_key)
+            self._end_round()
+        self._finish()
+
+    def _begin(self):
+        self.sink.emit("battle_start", threat=self.threat.name, defender=self.defender.name,
+                       level=self.defender.level, health=self.defender.current_health,
+                       max_health=self.defender.max_health)
+
+    def _in_progress(self) -> bool:
+        if self.max_rounds is not None and self.round > self.max_rounds:
+            return False
+        return self.defender.is_alive() and self.threat.persistence > 0
+
+    def _end_round(self):
+        if not self.threat_defeated():
+            self.threat_turn()
+        for status in self.defender.status_effects.tick():
+            self.sink.emit("status_expired", status=status.name)
+        self.round += 1
+
+    def _finish(self):
         if self.defender.is_alive() and self.threat.persistence <= 0:
-            print("Threat has been neutralized!")
+            self.sink.emit("threat_neutralized")
         elif not self.defender.is_alive():
-            print("Defender has been defeated!")
+            self.sink.emit("defender_defeated")
 
-    def player_turn(self):
+    def player_turn(self, action: Optional[str] = None, spell_key: Optional[str] = None):
         """
-        Handles the defender's actions during their turn.
+        Handles the defender's actions during their turn. Choices not given
+        are asked of the policy.
         """
-        action = input(
-            "Do you want to 'attack' or 'cast spell'? ").strip().lower()
-        if action == 'attack':
-            offensive_power = sum(
-                measure.effectiveness for measure in self.defender.active_measures
-                if measure.strategy == SecurityStrategy.OFFENSIVE
-            )
+        if action is None:
+            action = self.policy.choose_action(self)
+        if action == ATTACK:
             counter_damage = int(
-                offensive_power * (1 + self.defender.stats.agility / 100))
+                self.defender.offensive_power * (1 + self.defender.stats.agility / 100))
             self.threat.power -= counter_damage
             self.threat.persistence -= 1  # Reduce threat persistence when attacked
-            print(f"Attacked the threat! Dealt {counter_damage} damage.")
-        elif action == 'cast spell':
-            print("Available Spells:")
-            for key, spell in self.defender.spells.items():
-                print(f"- {key}: {spell.description}")
-            spell_key = input("Enter the spell key to cast: ").strip().lower()
+            self.sink.emit("attack", damage=counter_damage)
+        elif action == CAST_SPELL:
+            if spell_key is None:
+                spell_key = self.policy.choose_spell(self)
             result = self.defender.cast_spell(spell_key)
-            print(result)
+            self.sink.emit("spell_cast", spell=spell_key, result=result)
         else:
-            print("Invalid action. Skipping turn.")
+            self.sink.emit("invalid_action", action=action)
 
     def threat_turn(self):
         """
         Handles the threat's actions during its turn.
         """
-        damage = self.threat.calculate_damage(self.defender)
+        damage = self.threat.calculate_damage(self.defender, self.rng)
         self.defender.take_damage(damage)
-        print(f"The threat dealt {damage} damage to your defender.")
+        self.sink.emit("threat_attack", damage=damage)
 
     def threat_defeated(self) -> bool:
         """
@@ -1,74 +1,153 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
 from security_common import SecurityStrategy
 
+
+def measure_key(name: str) -> str:
+    """
+    Normalized lookup key: "DDoS  Protection" and "ddos protection" match.
+    """
+    return " ".join(name.lower().split())
+
+
+@dataclass(frozen=True, slots=True)
 class SecurityMeasure:
-    def __init__(self, name, description, cost, strategy, effectiveness=10):
-        self.name = name
-        self.description = description
-        self.cost = cost
-        self.strategy = strategy
-        self.effectiveness = effectiveness
+    """
+    Immutable measure definition, shared by every defender. `id` is its
+    position in the content pack's measure catalog.
+    """
+    name: str
+    description: str
+    cost: int
+    strategy: SecurityStrategy
+    effectiveness: int = 10
+    id: int = -1
+
+
+class MeasureCatalog:
+    """
+    Frozen catalog of measure definitions, indexed by id, normalized key and
+    strategy. Built once per content pack and shared read-only.
+    """
+
+    def __init__(self, measures: Sequence[SecurityMeasure]):
+        self.measures: Tuple[SecurityMeasure, ...] = tuple(measures)
+        by_key: Dict[str, SecurityMeasure] = {}
+        for measure in self.measures:
+            key = measure_key(measure.name)
+            if key in by_key:
+                raise ValueError(f"Duplicate security measure: {measure.name}")
+            by_key[key] = measure
+        self.by_key = MappingProxyType(by_key)
+        self.by_strategy = MappingProxyType({
+            strategy: tuple(m for m in self.measures if m.strategy == strategy) for strategy in SecurityStrategy
+        })
+
+    def __len__(self) -> int:
+        return len(self.measures)
+
+    def __iter__(self) -> Iterator[SecurityMeasure]:
+        return iter(self.measures)
+
+    def __reduce__(self):
+        return MeasureCatalog, (self.measures,)
+
+    def __deepcopy__(self, memo) -> 'MeasureCatalog':
+        return self  # Immutable and shared: copied defenders keep referencing it
+
+    def __getitem__(self, measure_id: int) -> SecurityMeasure:
+        return self.measures[measure_id]
+
+    def get(self, name: str) -> Optional[SecurityMeasure]:
+        return self.by_key.get(measure_key(name))
+
+    def for_strategy(self, strategy: SecurityStrategy) -> Tuple[SecurityMeasure, ...]:
+        return self.by_strategy[strategy]
+
+
+def measure_catalog() -> MeasureCatalog:
+    """
+    The catalog of the process's shared content pack.
+    """
+    from content_pack import ContentPack  # content_pack builds on SecurityMeasure
+    return ContentPack.default().catalog
+
+
+class ActiveMeasures:
+    """
+    A defender's active measures: insertion-ordered, with an id set for
+    duplicate checks and running effectiveness totals and counts per
+    strategy, updated on add/remove/clear so battles never re-sum them.
+    """
+
+    def __init__(self):
+        self._measures: List[SecurityMeasure] = []
+        self._ids: Set[int] = set()
+        self._effectiveness: Dict[SecurityStrategy, int] = dict.fromkeys(SecurityStrategy, 0)
+        self._counts: Dict[SecurityStrategy, int] = dict.fromkeys(SecurityStrategy, 0)
+
+    def __len__(self) -> int:
+        return len(self._measures)
+
+    def __iter__(self) -> Iterator[SecurityMeasure]:
+        return iter(self._measures)
+
+    def __contains__(self, measure: SecurityMeasure) -> bool:
+        return measure.id in self._ids
+
+    def __repr__(self) -> str:
+        return f"ActiveMeasures({[m.name for m in self._measures]})"
+
+    def add(self, measure: SecurityMeasure) -> bool:
+        """
+        Activates a measure; returns False if it was already active.
+        """
+        if measure.id in self._ids:
+            return False
+        self._ids.add(measure.id)
+        self._measures.append(measure)
+        self._effectiveness[measure.strategy] += measure.effectiveness
+        self._counts[measure.strategy] += 1
+        return True
+
+    def remove(self, measure: SecurityMeasure) -> bool:
+        """
+        Deactivates a measure; returns False if it was not active.
+        """
+        if measure.id not in self._ids:
+            return False
+        self._ids.discard(measure.id)
+        self._measures.remove(measure)
+        self._effectiveness[measure.strategy] -= measure.effectiveness
+        self._counts[measure.strategy] -= 1
+        return True
+
+    def clear(self):
+        self._measures.clear()
+        self._ids.clear()
+        for strategy in SecurityStrategy:
+            self._effectiveness[strategy] = 0
+            self._counts[strategy] = 0
+
+    def effectiveness(self, strategy: SecurityStrategy) -> int:
+        return self._effectiveness[strategy]
+
+    def count(self, strategy: SecurityStrategy) -> int:
+        return self._counts[strategy]
+
 
 class SecurityMeasures:
     def __init__(self):
-        self.measures = [
-            # Defensive Measures
-            SecurityMeasure(
-                name="Firewall",
-                description="Blocks unauthorized access",
-                cost=10,
-                strategy=SecurityStrategy.DEFENSIVE
-            ),
-            SecurityMeasure(
-                name="Encryption",
-                description="Secures data in transit",
-                cost=15,
-                strategy=SecurityStrategy.DEFENSIVE
-            ),
-            SecurityMeasure(
-                name="DDoS Protection",
-                description="Defends against DDoS attacks",
-                cost=20,
-                strategy=SecurityStrategy.DEFENSIVE
-            ),
-            # Offensive Measures
-            SecurityMeasure(
-                name="Penetration Test",
-                description="Simulates attacks to uncover vulnerabilities",
-                cost=18,
-                strategy=SecurityStrategy.OFFENSIVE
-            ),
-            SecurityMeasure(
-                name="Reconnaissance",
-                description="Gathers information to test defenses",
-                cost=12,
-                strategy=SecurityStrategy.OFFENSIVE
-            ),
-            SecurityMeasure(
-                name="Social Engineering Test",
-                description="Evaluates human vulnerabilities through phishing simulations",
-                cost=15,
-                strategy=SecurityStrategy.OFFENSIVE
-            ),
-            # Hybrid Measures
-            SecurityMeasure(
-                name="Security Awareness Training",
-                description="Educates employees on security best practices",
-                cost=10,
-                strategy=SecurityStrategy.HYBRID
-            ),
-            SecurityMeasure(
-                name="Incident Response Plan",
-                description="Prepares for and responds to security incidents",
-                cost=25,
-                strategy=SecurityStrategy.HYBRID
-            ),
-        ]
-
-    def get_defensive_measures(self):
-        return [measure for measure in self.measures if measure.strategy == SecurityStrategy.DEFENSIVE]
-
-    def get_offensive_measures(self):
-        return [measure for measure in self.measures if measure.strategy == SecurityStrategy.OFFENSIVE]
-
-    def get_hybrid_measures(self):
-        return [measure for measure in self.measures if measure.strategy == SecurityStrategy.HYBRID]
\ No newline at end of file
+        # Definitions are shared read-only across every defender and game.
+        self.catalog = measure_catalog()
+        self.measures: Tuple[SecurityMeasure, ...] = self.catalog.measures
+
+    def get_defensive_measures(self) -> Tuple[SecurityMeasure, ...]:
+        return self.catalog.for_strategy(SecurityStrategy.DEFENSIVE)
+
+    def get_offensive_measures(self) -> Tuple[SecurityMeasure, ...]:
+        return self.catalog.for_strategy(SecurityStrategy.OFFENSIVE)
+
+    def get_hybrid_measures(self) -> Tuple[SecurityMeasure, ...]:
+        return self.catalog.for_strategy(SecurityStrategy.HYBRID)
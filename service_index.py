@@ -0,0 +1,81 @@
+# service_index.py
+import json
+import random
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Set
+from question_bank import SCRIPT_DIR, QuestionBank, _question_text, normalize_service
+
+SERVICES_PATH = SCRIPT_DIR / "src" / "aws_services.json"
+
+
+def _searchable(text: str) -> str:
+    return " " + re.sub(r"[^a-z0-9]+", " ", text.lower()) + " "
+
+
+class ServiceQuestionIndex:
+    """
+    Inverted index from AWS service (as listed in aws_services.json) to the
+    questions whose question, options or explanation mention it.
+
+    Every service's candidate list is resolved when the index is built: its own
+    mentions, else the questions of its category, else the whole bank. Looking
+    up a tile is then one dict lookup plus one random choice.
+    """
+
+    def __init__(self, bank: QuestionBank, services: List[dict]):
+        self.bank = bank
+        self.categories: Dict[str, Set[str]] = {}
+        self.by_service: Dict[str, List[int]] = {}
+        self.by_category: Dict[str, List[int]] = {}
+
+        texts = [_searchable(_question_text(question)) for question in bank.questions]
+        for service in services:
+            key = normalize_service(service["name"])
+            # "Compute, Decision Guides" belongs to both categories
+            categories = {c.strip() for c in service.get("category", "").split(",") if c.strip()}
+            self.categories.setdefault(key, set()).update(categories)
+            if key not in self.by_service:
+                needle = f" {key} "
+                self.by_service[key] = [idx for idx, text in enumerate(texts) if needle in text]
+
+        category_ids: Dict[str, Set[int]] = {}
+        for key, categories in self.categories.items():
+            for category in categories:
+                category_ids.setdefault(category, set()).update(self.by_service[key])
+        self.by_category = {category: sorted(ids) for category, ids in category_ids.items()}
+
+        everything = list(range(len(bank.questions)))
+        self.resolved: Dict[str, List[int]] = {}
+        for key, ids in self.by_service.items():
+            if not ids:
+                ids = sorted({idx for category in self.categories[key] for idx in self.by_category[category]})
+            self.resolved[key] = ids or everything
+        self._everything = everything
+
+    @classmethod
+    def load(cls, bank: Optional[QuestionBank] = None, services_path=SERVICES_PATH) -> 'ServiceQuestionIndex':
+        with open(services_path, "r", encoding="utf-8") as f:
+            services = json.load(f)
+        return cls(bank or QuestionBank.default(), services)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def default(cls) -> 'ServiceQuestionIndex':
+        return cls.load()
+
+    def question_ids(self, service_name: str) -> List[int]:
+        """
+        Candidate question indices for a service, icon or tile name.
+        """
+        key = normalize_service(service_name)
+        ids = self.resolved.get(key)
+        if ids is None:
+            # Not in aws_services.json: fall back to the bank's own mention index.
+            ids = self.bank.by_service.get(key) or self._everything
+            self.resolved[key] = ids
+        return ids
+
+    def question_for(self, service_name: str, rng=random) -> Optional[dict]:
+        ids = self.question_ids(service_name)
+        return self.bank.questions[rng.choice(ids)] if ids else None
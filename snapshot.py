@@ -0,0 +1,467 @@
+# snapshot.py
+import io
+import json
+import os
+import random
+import struct
+import sys
+from array import array
+from dataclasses import fields
+from operator import attrgetter
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from battle_policy import GamePolicy, NullSink
+from game_engine import GameEngine
+from game_rng import GameRNG
+from resources import Resources
+from security_status import SecurityStatus, StatusType
+
+MAGIC = b"DDSN"
+SNAPSHOT_VERSION = 1
+FULL_INTERVAL = 32  # Checkpoints per full snapshot; the rest are incremental
+DIFF_BLOCK = 64     # Values compared per slice when diffing a section
+MT_WORDS = 624      # Mersenne Twister key size; the generator rewrites it every MT_WORDS draws
+MAX_ADVANCE = 64    # Key rewrites searched when encoding a generator as an advance
+
+# Sections in file order, with their array typecodes ("meta" is JSON text)
+SECTIONS: Tuple[Tuple[str, Optional[str]], ...] = (
+    ("meta", None),
+    ("game", "q"),       # session_count, max_sessions, winning_score, player_index, turn, session_points
+    ("players", "q"),    # per player: current_position, points
+    ("defenders", "q"),  # per defender: level, max/current health, preparation points, resources, status round
+    ("measures", "q"),   # per defender: count, active measure ids
+    ("statuses", "q"),   # per defender: count, (expires, name index, type, effect value, duration) each
+    ("cooldowns", "q"),  # per defender: count, (spell index, ready round) each
+    ("rng", "I"),        # Mersenne Twister key + position, game stream
+    ("dice_rng", "I"),   # Mersenne Twister key + position, dice stream
+    ("dice", "i"),       # dice generation, then per die size: sides, count, pre-drawn rolls
+)
+SECTION_INDEX = {name: index for index, (name, _) in enumerate(SECTIONS)}
+GENERATOR_SECTIONS = frozenset(("rng", "dice_rng"))
+RESOURCE_FIELDS = tuple(field.name for field in fields(Resources))
+_resource_values = attrgetter(*RESOURCE_FIELDS)
+STATUS_TYPES = tuple(StatusType)
+
+FULL = b"F"
+INCREMENTAL = b"I"
+WHOLE = 0
+SPARSE = 1
+ADVANCE = 2  # Generator state as the number of 32-bit words drawn since the previous one
+
+_FILE_HEADER = struct.Struct("<4sH")  # magic, version
+_RECORD = struct.Struct("<cIB")       # kind, checkpoint number, section count
+_SECTION = struct.Struct("<BBI")      # section index, encoding, payload length
+_LENGTH = struct.Struct("<I")
+_WORDS = struct.Struct("<Q")
+
+Sections = Dict[str, Union[str, Sequence[int]]]
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def capture(engine: GameEngine, previous: Optional[Sections] = None) -> Sections:
+    """
+    The engine's state at a turn boundary, as flat sections. Dice sections
+    are shared with `previous` (an earlier capture of the same engine)
+    while no new block of rolls has been drawn.
+    """
+    rng = engine.rng
+    dice_section = None
+    if previous is not None and previous["dice"][0] == rng.dice_generation:
+        random_state, _, _ = rng.getstate(dice=False)
+        dice_state = (None, previous["dice_rng"], None)
+        dice_section = _shrink_dice(previous["dice"], rng.dice_left())
+    else:
+        random_state, dice_state, dice = rng.getstate()
+    spell_keys = list(engine.defenders[0].spell_registry.spells) if engine.defenders else []
+    spell_index = {key: index for index, key in enumerate(spell_keys)}
+    texts = sorted({(status.name, status.description or "")
+                    for defender in engine.defenders for status in defender.status_effects})
+    text_index = {text: index for index, text in enumerate(texts)}
+
+    players = array("q")
+    for player in engine.players:
+        players.extend((player.current_position, engine.player_points.get(player.name, 0)))
+
+    defenders, measures, statuses, cooldowns = array("q"), array("q"), array("q"), array("q")
+    for defender in engine.defenders:
+        defenders.extend((defender.level, defender.max_health, defender.current_health,
+                          defender.preparation_points))
+        defenders.extend(_resource_values(defender.resources))
+        defenders.append(defender.status_effects.round)
+        measures.append(len(defender.active_measures))
+        measures.extend(measure.id for measure in defender.active_measures)
+        effects = list(defender.status_effects.entries())
+        statuses.append(len(effects))
+        for expires, status in effects:
+            statuses.extend((expires, text_index[status.name, status.description or ""],
+                             STATUS_TYPES.index(status.status_type), status.effect_value, status.duration))
+        cooldowns.append(len(defender.spell_ready))
+        for key, ready in defender.spell_ready.items():
+            cooldowns.extend((spell_index[key], ready))
+
+    if dice_section is None:
+        dice_section = array("i", (rng.dice_generation,))
+        for sides, block in dice.items():
+            dice_section.extend((sides, len(block)))
+            dice_section.extend(block)
+
+    meta = {"seed": engine.rng.seed, "block_size": engine.rng.block_size,
+            "players": [player.name for player in engine.players], "spells": spell_keys,
+            "status_texts": texts, "gauss": random_state[2]}
+    # Sections are only compared and encoded, never changed, so the 625-word
+    # generator keys stay tuples rather than being copied into arrays
+    return {
+        "meta": json.dumps(meta, separators=(",", ":")),
+        "game": array("q", (engine.session_count, engine.max_sessions, engine.winning_score,
+                            engine.player_index, engine.turn, engine.session_points)),
+        "players": players,
+        "defenders": defenders,
+        "measures": measures,
+        "statuses": statuses,
+        "cooldowns": cooldowns,
+        "rng": random_state[1],
+        "dice_rng": dice_state[1],
+        "dice": dice_section,
+    }
+
+
+def _shrink_dice(section: array, left: Dict[int, int]) -> array:
+    """
+    The dice section with each block cut to the rolls `left`; valid only
+    while no block has been redrawn (rolls are popped from the end).
+    """
+    shrunk, position = array("i", section[:1]), 1
+    while position < len(section):
+        sides, count = section[position], section[position + 1]
+        shrunk.extend((sides, left[sides]))
+        shrunk.extend(section[position + 2:position + 2 + left[sides]])
+        position += 2 + count
+    return shrunk
+
+
+def restore(sections: Sections, policy: Optional[GamePolicy] = None, sink=None) -> GameEngine:
+    """
+    A new engine in the captured state; start() resumes the game at the
+    turn the snapshot was taken.
+    """
+    meta = json.loads(sections["meta"])
+    engine = GameEngine(policy=policy, sink=sink, rng=GameRNG(meta["seed"], meta["block_size"]))
+    game_sink, engine.sink = engine.sink, NullSink()
+    for name in meta["players"]:
+        engine.add_player(name)
+    engine.sink = game_sink
+
+    (engine.session_count, engine.max_sessions, engine.winning_score,
+     engine.player_index, engine.turn, engine.session_points) = sections["game"]
+    players = sections["players"]
+    for index, player in enumerate(engine.players):
+        player.current_position = players[2 * index]
+        engine.player_points[player.name] = players[2 * index + 1]
+
+    texts = meta["status_texts"]
+    spell_keys = meta["spells"]
+    width = 5 + len(RESOURCE_FIELDS)
+    values = sections["defenders"]
+    measures = iter(sections["measures"])
+    statuses = iter(sections["statuses"])
+    cooldowns = iter(sections["cooldowns"])
+    for index, defender in enumerate(engine.defenders):
+        row = values[index * width:(index + 1) * width]
+        defender.level, defender.max_health, defender.current_health, defender.preparation_points = row[:4]
+        for name, value in zip(RESOURCE_FIELDS, row[4:-1]):
+            setattr(defender.resources, name, value)
+        defender.status_effects.round = row[-1]
+        for _ in range(next(measures)):
+            defender.active_measures.add(defender.catalog[next(measures)])
+        for _ in range(next(statuses)):
+            expires, text, kind, effect_value, duration = (next(statuses) for _ in range(5))
+            name, description = texts[text]
+            defender.status_effects.schedule(
+                SecurityStatus(name, duration, effect_value, STATUS_TYPES[kind], description or None), expires)
+        for _ in range(next(cooldowns)):
+            key = spell_keys[next(cooldowns)]
+            defender.spell_ready[key] = next(cooldowns)
+
+    dice, section, position = {}, sections["dice"], 1
+    while position < len(section):
+        sides, count = section[position], section[position + 1]
+        dice[sides] = section[position + 2:position + 2 + count].tolist()
+        position += 2 + count
+    # The dice stream only ever draws with choices(), so it never holds a spare gauss value
+    engine.rng.setstate(((3, tuple(sections["rng"]), meta["gauss"]),
+                         (3, tuple(sections["dice_rng"]), None), dice))
+    engine.rng.dice_generation = section[0]
+    return engine
+
+
+def _to_bytes(typecode: str, values) -> bytes:
+    if not isinstance(values, array) or values.typecode != typecode:
+        values = array(typecode, values)
+    if sys.byteorder == "big":
+        values = array(typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _changed(old: Sequence[int], new: Sequence[int]) -> Optional[List[int]]:
+    """
+    Indices where `new` differs from `old`, comparing DIFF_BLOCK-sized
+    slices first so unchanged stretches are skipped at C speed. None when
+    over a quarter of the blocks differ (a rewritten generator key or a
+    fresh block of dice), since the whole section is then smaller.
+    """
+    common = min(len(old), len(new))
+    starts = [start for start in range(0, common, DIFF_BLOCK)
+              if old[start:start + DIFF_BLOCK] != new[start:start + DIFF_BLOCK]]
+    if len(starts) > 1 and 4 * len(starts) > (common + DIFF_BLOCK - 1) // DIFF_BLOCK:
+        return None
+    changed = [index for start in starts for index in range(start, min(start + DIFF_BLOCK, common))
+               if old[index] != new[index]]
+    changed.extend(range(common, len(new)))
+    return changed
+
+
+def _advance(generator: random.Random, words: int):
+    while words > 0:
+        step = min(words, MT_WORDS)
+        generator.getrandbits(32 * step)  # Draws exactly `step` words
+        words -= step
+
+
+def _words_drawn(old: Sequence[int], new: Sequence[int]) -> Optional[int]:
+    """
+    How many 32-bit words take a generator from state `old` to `new`, or
+    None if that is more than MAX_ADVANCE key rewrites (or not at all).
+    """
+    generator = random.Random()
+    generator.setstate((3, tuple(old), None))
+    drawn = MT_WORDS - old[-1] + new[-1]  # Words up to the new position after one rewrite
+    _advance(generator, drawn)
+    for _ in range(MAX_ADVANCE):
+        if generator.getstate()[1] == tuple(new):
+            return drawn
+        _advance(generator, MT_WORDS)
+        drawn += MT_WORDS
+    return None
+
+
+def _section(name: str, value, previous=None) -> Optional[bytes]:
+    """
+    One encoded section: whole, or as changes against `previous`. None
+    when it is unchanged, so the reader keeps the previous copy. When a
+    generator has rewritten its key since `previous`, only the number of
+    words drawn is stored and the reader replays the draws.
+    """
+    if previous is not None and value == previous:
+        return None
+    typecode = SECTIONS[SECTION_INDEX[name]][1]
+    if typecode is None:
+        encoding, payload = WHOLE, value.encode()
+    elif (previous is not None and name in GENERATOR_SECTIONS and value[:-1] != previous[:-1]
+          and (drawn := _words_drawn(previous, value)) is not None):
+        encoding, payload = ADVANCE, _WORDS.pack(drawn)
+    else:
+        indices = None if previous is None else _changed(previous, value)
+        itemsize = array(typecode).itemsize
+        if indices is not None and _LENGTH.size + len(indices) * (4 + itemsize) < len(value) * itemsize:
+            encoding, payload = SPARSE, (_LENGTH.pack(len(value)) + _to_bytes("I", indices)
+                                         + _to_bytes(typecode, [value[index] for index in indices]))
+        else:
+            encoding, payload = WHOLE, _to_bytes(typecode, value)
+    return _SECTION.pack(SECTION_INDEX[name], encoding, len(payload)) + payload
+
+
+def encode_record(number: int, sections: Sections, previous: Optional[Sections] = None) -> bytes:
+    """
+    A full record, or an incremental one holding only what changed since `previous`.
+    """
+    parts = [_section(name, sections[name], previous[name] if previous else None) for name, _ in SECTIONS]
+    parts = [part for part in parts if part is not None]
+    return _RECORD.pack(INCREMENTAL if previous else FULL, number, len(parts)) + b"".join(parts)
+
+
+def _apply(data: bytes, offset: int, count: int, sections: Sections) -> int:
+    for _ in range(count):
+        index, encoding, length = _SECTION.unpack_from(data, offset)
+        offset += _SECTION.size
+        payload = data[offset:offset + length]
+        offset += length
+        name, typecode = SECTIONS[index]
+        if typecode is None:
+            sections[name] = payload.decode()
+        elif encoding == WHOLE:
+            sections[name] = _from_bytes(typecode, payload)
+        elif encoding == ADVANCE:
+            generator = random.Random()
+            generator.setstate((3, tuple(sections[name]), None))
+            _advance(generator, _WORDS.unpack(payload)[0])
+            sections[name] = generator.getstate()[1]
+        else:
+            size, = _LENGTH.unpack_from(payload)
+            changes = (len(payload) - _LENGTH.size) // (4 + array(typecode).itemsize)
+            indices = _from_bytes("I", payload[_LENGTH.size:_LENGTH.size + 4 * changes])
+            values = _from_bytes(typecode, payload[_LENGTH.size + 4 * changes:])
+            section = array(typecode, sections[name][:size])
+            if len(section) < size:
+                section.extend([0] * (size - len(section)))
+            for position, value in zip(indices, values):
+                section[position] = value
+            sections[name] = section
+    return offset
+
+
+def _records(data: bytes) -> Iterator[Tuple[bytes, int, int, int]]:
+    """
+    (kind, number, offset of sections, section count) per record, skipping payloads.
+    """
+    if len(data) < _FILE_HEADER.size:
+        raise SnapshotError("Snapshot file is truncated")
+    magic, version = _FILE_HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError("Not a game snapshot file")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Snapshot version {version} is not supported (expected {SNAPSHOT_VERSION})")
+    offset = _FILE_HEADER.size
+    while offset + _RECORD.size <= len(data):
+        kind, number, count = _RECORD.unpack_from(data, offset)
+        start = offset + _RECORD.size
+        offset = _skip_sections(data, start, count)
+        if offset > len(data):
+            return  # Truncated by a crash mid-write; earlier records still count
+        yield kind, number, start, count
+
+
+def _skip_sections(data: bytes, offset: int, count: int) -> int:
+    for _ in range(count):
+        if offset + _SECTION.size > len(data):
+            return len(data) + 1
+        offset += _SECTION.size + _SECTION.unpack_from(data, offset)[2]
+    return offset
+
+
+def load_sections(data: bytes, checkpoint: Optional[int] = None) -> Sections:
+    """
+    The state at `checkpoint` (default: the last one): the nearest full
+    record before it plus the incremental records after that.
+    """
+    records = [record for record in _records(data) if checkpoint is None or record[1] <= checkpoint]
+    base = max((position for position, record in enumerate(records) if record[0] == FULL), default=None)
+    if base is None:
+        raise SnapshotError("No full snapshot to restore from")
+    sections: Sections = {}
+    for _, _, offset, count in records[base:]:
+        _apply(data, offset, count, sections)
+    return sections
+
+
+def resume(source: Union[str, bytes], checkpoint: Optional[int] = None,
+           policy: Optional[GamePolicy] = None, sink=None) -> GameEngine:
+    """
+    An engine restored from a checkpoint file (path) or its bytes.
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            source = f.read()
+    return restore(load_sections(source, checkpoint), policy=policy, sink=sink)
+
+
+class Checkpointer:
+    """
+    Writes a checkpoint of a GameEngine at every turn boundary.
+
+    Every FULL_INTERVAL-th checkpoint is a full snapshot; the others are
+    copy-on-write increments that store only the sections that changed
+    since the previous checkpoint, each as whole bytes or as (index, value)
+    changes, whichever is smaller. Unchanged sections are shared with the
+    earlier record, so a typical turn costs a few hundred bytes. Each
+    record is flushed as it is written (and fsynced with `sync`), so a
+    crash loses at most the turn in progress.
+
+        engine.checkpointer = Checkpointer.open("tournament.ckpt")
+        ...
+        engine = resume("tournament.ckpt", policy=policy)
+        engine.start()
+    """
+
+    def __init__(self, stream: Optional[BinaryIO] = None, full_interval: int = FULL_INTERVAL,
+                 sync: bool = False):
+        self.stream = stream if stream is not None else io.BytesIO()
+        self.full_interval = full_interval
+        self.sync = sync  # fsync every record, not just hand it to the OS
+        self.count = 0
+        self.previous: Optional[Sections] = None
+        if self.stream.tell() == 0:
+            self.stream.write(_FILE_HEADER.pack(MAGIC, SNAPSHOT_VERSION))
+            self.flush()
+
+    @classmethod
+    def open(cls, path: str, full_interval: int = FULL_INTERVAL, sync: bool = False,
+             append: bool = False) -> 'Checkpointer':
+        """
+        A checkpointer writing to `path`. With `append`, an existing file
+        is kept: a record cut short by a crash is dropped, numbering carries
+        on and the next checkpoint is a full one.
+        """
+        if append and os.path.exists(path):
+            with open(path, "rb") as f:
+                data = f.read()
+            records = list(_records(data))
+            if records:
+                _, number, start, count = records[-1]
+                end = _skip_sections(data, start, count)
+                stream = open(path, "r+b")
+                stream.truncate(end)
+                stream.seek(end)
+                checkpointer = cls(stream, full_interval, sync)
+                checkpointer.count = number + 1
+                return checkpointer
+        return cls(open(path, "wb"), full_interval, sync)
+
+    def checkpoint(self, engine: GameEngine) -> int:
+        """
+        Appends a checkpoint of `engine` and returns its size in bytes.
+        """
+        sections = capture(engine, self.previous)
+        previous = None if self.count % self.full_interval == 0 else self.previous
+        record = encode_record(self.count, sections, previous)
+        self.stream.write(record)
+        self.flush()
+        self.previous = sections
+        self.count += 1
+        return len(record)
+
+    def flush(self):
+        self.stream.flush()
+        if self.sync:
+            os.fsync(self.stream.fileno())
+
+    def close(self):
+        self.stream.close()
+
+
+if __name__ == "__main__":
+    import time
+    from battle_policy import AutoPlayPolicy
+
+    engine = GameEngine(policy=AutoPlayPolicy(), sink=NullSink(), rng=GameRNG(7))
+    for name in ("Alice", "Bob", "Carol"):
+        engine.add_player(name)
+    checkpointer = engine.checkpointer = Checkpointer()
+    winner = engine.play_sessions()
+    data = checkpointer.stream.getvalue()
+    print(f"{checkpointer.count} checkpoints in {len(data)} bytes; winner {winner}")
+
+    started = time.perf_counter()
+    resumed = resume(data, checkpoint=checkpointer.count // 2, policy=AutoPlayPolicy(), sink=NullSink())
+    print(f"Resumed checkpoint {checkpointer.count // 2} in {1000 * (time.perf_counter() - started):.2f} ms; "
+          f"replayed winner {resumed.play_sessions()}")
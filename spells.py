@@ -1,52 +1,121 @@
 # spells.py
 from abc import ABC, abstractmethod
-from typing import Dict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple, Type
 from security_status import SecurityStatus, StatusType
 
 
 class ServerlessSpell(ABC):
+    description: str = ""
+    cooldown: int = 0  # Battle rounds before the same defender can cast it again
+
     def __init__(self, name: str, cost: Dict[str, int]):
         self.name = name
         self.cost = cost
+        self.key = name.lower()
+        # (compute, network, storage), checked against Resources in one call
+        self.cost_vector: Tuple[int, int, int] = (cost.get("compute", 0), cost.get("network", 0),
+                                                  cost.get("storage", 0))
 
-    @abstractmethod
     def cast(self, caster) -> bool:
-        pass
+        """
+        Pays the spell's cost from the caster's resources and applies its effect.
+        """
+        if caster.resources.try_consume(*self.cost_vector):
+            self.apply(caster)
+            return True
+        return False
+
+    @abstractmethod
+    def apply(self, caster):
+        """
+        The spell's effect, once its cost has been paid.
+        """
 
 
 class LambdaEdgeSpell(ServerlessSpell):
+    description = "Boosts counter-attacks with computing power at edge locations"
+    cooldown = 2
+
     def __init__(self):
         super().__init__("Lambda Edge", {"compute": 20, "network": 15})
 
-    def cast(self, caster) -> bool:
-        if caster.resources.consume(self.cost):
-            caster.status_effects.append(
-                SecurityStatus(
-                    name="Edge Computing",
-                    duration=3,
-                    effect_value=15,
-                    status_type=StatusType.BUFF,
-                    description="Increased computing power at edge locations"
-                )
+    def apply(self, caster):
+        caster.status_effects.append(
+            SecurityStatus(
+                name="Edge Computing",
+                duration=3,
+                effect_value=15,
+                status_type=StatusType.BUFF,
+                description="Increased computing power at edge locations"
             )
-            return True
-        return False
+        )
 
 
 class CloudFrontSpell(ServerlessSpell):
+    description = "Boosts counter-attacks with computing power from the CloudFront edge network"
+    cooldown = 3
+
     def __init__(self):
         super().__init__("CloudFront Shield", {"compute": 25, "network": 25})
 
-    def cast(self, caster) -> bool:
-        if caster.resources.consume(self.cost):
-            caster.status_effects.append(
+    def apply(self, caster):
+        caster.status_effects.append(
             SecurityStatus(
                 name="Edge Computing",
                 duration=3,
                 effect_value=15,
                 status_type=StatusType.BUFF,
                 description="Increased computing power at edge locations",
-                )
             )
-            return True
-        return False
+        )
+
+
+def _concrete_subclasses(base: Type[ServerlessSpell]) -> List[Type[ServerlessSpell]]:
+    found = []
+    for cls in base.__subclasses__():
+        if not getattr(cls, "__abstractmethods__", None):
+            found.append(cls)
+        found.extend(_concrete_subclasses(cls))
+    return found
+
+
+class SpellRegistry:
+    """
+    Every concrete ServerlessSpell subclass, instantiated once and keyed by
+    lower-case name. Spells hold no per-caster state, so the instances are
+    shared by all defenders; cooldowns live on the defender.
+    """
+
+    def __init__(self, spell_classes: List[Type[ServerlessSpell]]):
+        spells: Dict[str, ServerlessSpell] = {}
+        for cls in spell_classes:
+            spell = cls()
+            spells.setdefault(spell.key, spell)
+        self.spells: Mapping[str, ServerlessSpell] = MappingProxyType(spells)
+
+    @classmethod
+    def discover(cls) -> 'SpellRegistry':
+        """
+        Builds a registry from the ServerlessSpell subclasses defined so far.
+        """
+        return cls(_concrete_subclasses(ServerlessSpell))
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def default(cls) -> 'SpellRegistry':
+        return cls.discover()
+
+    def __reduce__(self):
+        return SpellRegistry, ([type(spell) for spell in self.spells.values()],)
+
+    def __deepcopy__(self, memo) -> 'SpellRegistry':
+        return self  # Shared by every defender
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.spells
+
+    def get(self, key: str):
+        spell = self.spells.get(key)
+        return spell if spell is not None else self.spells.get(key.strip().lower())
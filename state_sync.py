@@ -0,0 +1,155 @@
+# state_sync.py
+import json
+import struct
+import sys
+from array import array
+from enum import Enum
+from typing import List, Optional, Tuple
+
+KEYFRAME = b"K"
+DELTA = b"D"
+KEYFRAME_INTERVAL = 64  # Deltas between periodic keyframes
+
+# Per-player slots of the state vector, after the game-wide ones
+GAME_FIELDS = ("session", "game_over")
+PLAYER_FIELDS = ("position", "points", "health", "max_health", "level", "measures")
+
+_HEADER = struct.Struct("<cIH")   # kind, sequence number, slot/change count
+_LENGTH = struct.Struct("<I")     # length of the JSON tail
+
+
+def json_default(value):
+    """
+    JSON fallback for event data: enums by value, game objects by name.
+    """
+    if isinstance(value, Enum):
+        return value.value
+    name = getattr(value, "name", None)
+    return name if isinstance(name, str) else str(value)
+
+
+def board_layout(board) -> dict:
+    """
+    The static part of the board, sent once per keyframe.
+    """
+    return {
+        "regions": [{"name": region.name, "azs": [az.name for az in region.azs],
+                     "special_access": region.special_access_required} for region in board.regions],
+        "edges": [[source, target, kind.value] for source, edges in enumerate(board.edges)
+                  for kind, target in edges],
+    }
+
+
+def state_vector(engine) -> array:
+    """
+    The engine's dynamic state as a flat int32 vector laid out by
+    GAME_FIELDS and then PLAYER_FIELDS for each player.
+    """
+    values = array("i", (engine.session_count, engine.winner is not None))
+    for player in engine.players:
+        defender = player.defender
+        values.extend((player.current_position, engine.player_points.get(player.name, 0),
+                       defender.current_health, defender.max_health, defender.level,
+                       len(defender.active_measures)))
+    return values
+
+
+class StateEncoder:
+    """
+    Encodes one game's state for browser clients as binary frames.
+
+    A keyframe carries the whole state vector plus the board layout; a
+    delta carries only the (slot, value) pairs that changed since the
+    previous frame. Both end in a length-prefixed JSON tail for events and
+    the pending decision, left empty when there is nothing to say, so a
+    frame costs a few bytes per changed value rather than the full state.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.sequence = 0
+        self.last: Optional[array] = None
+        self.players: Tuple[str, ...] = ()
+        self.since_keyframe = 0
+
+    def frame(self, tail: Optional[dict] = None) -> bytes:
+        """
+        The next frame for all subscribers: a delta, or a keyframe when the
+        player list changed or KEYFRAME_INTERVAL deltas have gone out.
+        """
+        names = tuple(player.name for player in self.engine.players)
+        if self.last is None or names != self.players or self.since_keyframe >= KEYFRAME_INTERVAL:
+            return self.keyframe(tail)
+        current = state_vector(self.engine)
+        changes: List[int] = []
+        for index, (old, new) in enumerate(zip(self.last, current)):
+            if old != new:
+                changes += (index, new)
+        self.last = current
+        self.sequence += 1
+        self.since_keyframe += 1
+        count = len(changes) // 2
+        return (_HEADER.pack(DELTA, self.sequence, count) + struct.pack("<" + "Hi" * count, *changes)
+                + _tail(tail))
+
+    def keyframe(self, tail: Optional[dict] = None) -> bytes:
+        """
+        A frame with the full state; later deltas are relative to it.
+        """
+        self.players = tuple(player.name for player in self.engine.players)
+        self.last = state_vector(self.engine)
+        self.sequence += 1
+        self.since_keyframe = 0
+        return self._keyframe_bytes(tail)
+
+    def snapshot(self, tail: Optional[dict] = None) -> bytes:
+        """
+        A keyframe for one newly joined client. When the state is what the
+        last frame sent, it reuses that frame's sequence number so the other
+        clients' delta chain is untouched.
+        """
+        names = tuple(player.name for player in self.engine.players)
+        if self.last is None or names != self.players or state_vector(self.engine) != self.last:
+            return self.keyframe(tail)
+        return self._keyframe_bytes(tail)
+
+    def _keyframe_bytes(self, tail: Optional[dict]) -> bytes:
+        values = self.last
+        if sys.byteorder == "big":
+            values = array("i", values)
+            values.byteswap()
+        layout = {"game_fields": GAME_FIELDS, "player_fields": PLAYER_FIELDS,
+                  "players": self.players, "board": board_layout(self.engine.game_board)}
+        return (_HEADER.pack(KEYFRAME, self.sequence, len(values)) + values.tobytes()
+                + _tail(dict(tail or {}, layout=layout)))
+
+
+def _tail(data: Optional[dict]) -> bytes:
+    if not data:
+        return _LENGTH.pack(0)
+    body = json.dumps(data, separators=(",", ":"), default=json_default).encode()
+    return _LENGTH.pack(len(body)) + body
+
+
+def decode_frame(frame: bytes, state: Optional[List[int]] = None) -> Tuple[bytes, int, List[int], dict]:
+    """
+    Decodes a frame into (kind, sequence, state, tail). A delta is applied
+    to a copy of `state`, the vector from the previous frame.
+    """
+    kind, sequence, count = _HEADER.unpack_from(frame)
+    offset = _HEADER.size
+    if kind == KEYFRAME:
+        state = list(struct.unpack_from(f"<{count}i", frame, offset))
+        offset += 4 * count
+    else:
+        if state is None:
+            raise ValueError("A delta needs the state from the previous frame")
+        state = list(state)
+        pairs = struct.unpack_from("<" + "Hi" * count, frame, offset)
+        for index in range(0, len(pairs), 2):
+            state[pairs[index]] = pairs[index + 1]
+        offset += 6 * count
+    length, = _LENGTH.unpack_from(frame, offset)
+    offset += _LENGTH.size
+    tail = json.loads(frame[offset:offset + length]) if length else {}
+    return kind, sequence, state, tail
@@ -0,0 +1,104 @@
+# status_effects.py
+from typing import Dict, Iterator, List, Tuple
+from security_status import SecurityStatus, StatusType
+
+
+class StatusEffects:
+    """
+    A defender's active SecurityStatus effects.
+
+    Each effect is filed in a bucket keyed by the round it expires in, so
+    advancing a round only touches the effects expiring then. BUFF and DEBUFF
+    totals are cached and updated as effects are applied and expire:
+    buffs add to the defender's counter-attack power, debuffs add to the
+    damage each threat attack deals.
+    """
+
+    def __init__(self):
+        self.round = 0
+        self._buckets: Dict[int, List[SecurityStatus]] = {}
+        self._expiry: Dict[int, int] = {}  # id(status) -> expiry round
+        self._active: Dict[int, SecurityStatus] = {}
+        self.buff_total = 0
+        self.debuff_total = 0
+
+    def __len__(self) -> int:
+        return len(self._active)
+
+    def __iter__(self) -> Iterator[SecurityStatus]:
+        return iter(self._active.values())
+
+    def __repr__(self) -> str:
+        return f"StatusEffects({[s.name for s in self._active.values()]})"
+
+    def append(self, status: SecurityStatus):
+        """
+        Applies an effect for `status.duration` rounds (list-style, as spells call it).
+        """
+        if status.duration <= 0:
+            return
+        self.schedule(status, self.round + status.duration)
+
+    def schedule(self, status: SecurityStatus, expires: int):
+        """
+        Applies an effect until round `expires` (used when restoring a snapshot).
+        """
+        if id(status) in self._active:
+            return
+        self._buckets.setdefault(expires, []).append(status)
+        self._expiry[id(status)] = expires
+        self._active[id(status)] = status
+        if status.status_type is StatusType.BUFF:
+            self.buff_total += status.effect_value
+        else:
+            self.debuff_total += status.effect_value
+
+    def entries(self) -> Iterator[Tuple[int, SecurityStatus]]:
+        """
+        (expiry round, effect) pairs, bucket by bucket in insertion order.
+        """
+        for expires, bucket in self._buckets.items():
+            for status in bucket:
+                yield expires, status
+
+    def remaining(self, status: SecurityStatus) -> int:
+        """
+        Rounds left on an active effect, 0 if it is not active.
+        """
+        expires = self._expiry.get(id(status))
+        return 0 if expires is None else expires - self.round
+
+    def remove(self, status: SecurityStatus) -> bool:
+        expires = self._expiry.pop(id(status), None)
+        if expires is None:
+            return False
+        bucket = self._buckets[expires]
+        bucket.remove(status)
+        if not bucket:
+            del self._buckets[expires]
+        self._deactivate(status)
+        return True
+
+    def tick(self) -> List[SecurityStatus]:
+        """
+        Advances one round and returns the effects that expired.
+        """
+        self.round += 1
+        expired = self._buckets.pop(self.round, [])
+        for status in expired:
+            del self._expiry[id(status)]
+            self._deactivate(status)
+        return expired
+
+    def clear(self):
+        self._buckets.clear()
+        self._expiry.clear()
+        self._active.clear()
+        self.buff_total = self.debuff_total = 0
+
+    def _deactivate(self, status: SecurityStatus):
+        del self._active[id(status)]
+        if status.status_type is StatusType.BUFF:
+            self.buff_total -= status.effect_value
+        else:
+            self.debuff_total -= status.effect_value
@@ -0,0 +1,95 @@
+# test_game_server.py
+import asyncio
+import json
+import pytest
+from game_server import GameServer
+
+
+async def _exchange(request: bytes) -> bytes:
+    server = await asyncio.start_server(GameServer().handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(request)
+        await writer.drain()
+        reply = await asyncio.wait_for(reader.read(), 5)  # Until the server closes
+        writer.close()
+        return reply
+
+
+@pytest.mark.parametrize("request_line", [b"GET \r\n", b"GET /\r\n", b"GET    \r\n"])
+def test_malformed_request_line_gets_400_and_close(request_line):
+    reply = asyncio.run(_exchange(request_line + b"\r\n"))
+    assert reply.startswith(b"HTTP/1.1 400 Bad Request\r\n")
+    assert b'"type":"error"' not in reply
+
+
+def test_static_file_is_served_and_closed():
+    reply = asyncio.run(_exchange(b"GET /webgl.js HTTP/1.1\r\nHost: localhost\r\n\r\n"))
+    assert reply.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert b"socket.onclose" in reply
+    assert b'"type":"error"' not in reply
+
+
+class _Client:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    async def send(self, command: dict) -> dict:
+        self.writer.write(json.dumps(command).encode() + b"\n")
+        await self.writer.drain()
+        return await self.receive()
+
+    async def receive(self) -> dict:
+        return json.loads(await asyncio.wait_for(self.reader.readline(), 5))
+
+
+async def _with_clients(count: int, scenario):
+    game_server = GameServer()
+    server = await asyncio.start_server(game_server.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        clients = [_Client(*await asyncio.open_connection("127.0.0.1", port)) for _ in range(count)]
+        try:
+            return await scenario(game_server, *clients)
+        finally:
+            for client in clients:
+                client.writer.close()
+
+
+def test_join_cannot_take_a_seat_held_by_a_live_connection():
+    async def scenario(game_server, owner, intruder):
+        game = (await owner.send({"op": "create", "players": ["alice"]}))["game"]
+        reply = await intruder.send({"op": "join", "game": game, "player": "alice"})
+        assert reply["type"] == "error"
+        reply = await intruder.send({"op": "submit", "game": game, "answer": "roll"})
+        assert reply == {"type": "error", "message": "It is not your turn"}
+
+    asyncio.run(_with_clients(2, scenario))
+
+
+def test_room_is_discarded_when_its_last_player_leaves_spectators_behind():
+    async def scenario(game_server, owner, spectator):
+        game = (await owner.send({"op": "create", "players": ["alice", "bob"]}))["game"]
+        assert (await spectator.send({"op": "join", "game": game}))["type"] == "joined"
+        owner.writer.close()
+        notice = await spectator.receive()
+        assert notice["type"] == "error" and notice["game"] == game
+        assert game not in game_server.rooms
+
+    asyncio.run(_with_clients(2, scenario))
+
+
+def test_seat_is_released_when_its_owner_disconnects():
+    async def scenario(game_server, alice, bob, newcomer):
+        game = (await alice.send({"op": "create", "players": ["alice", "bob"]}))["game"]
+        room = game_server.rooms[game]
+        room.owners["bob"] = None  # Created by alice; leave bob's seat open
+        assert (await bob.send({"op": "join", "game": game, "player": "bob"}))["type"] == "joined"
+        bob.writer.close()
+        await asyncio.sleep(0.1)
+        assert room.owners["bob"] is None and game in game_server.rooms
+        assert (await newcomer.send({"op": "join", "game": game, "player": "bob"}))["type"] == "joined"
+
+    asyncio.run(_with_clients(3, scenario))
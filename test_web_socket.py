@@ -0,0 +1,50 @@
+# test_web_socket.py
+import asyncio
+import os
+import struct
+import pytest
+from web_socket import (OP_BINARY, OP_CONTINUATION, OP_PING, OP_PONG, OP_TEXT, WebSocketError,
+                        read_message)
+
+
+def client_frame(payload: bytes, opcode: int, final: bool = True) -> bytes:
+    """
+    A masked client-to-server frame.
+    """
+    mask = os.urandom(4)
+    masked = bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+    return struct.pack("!BB", (0x80 if final else 0) | opcode, 0x80 | len(payload)) + mask + masked
+
+
+def read(data: bytes, on_ping=None):
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await read_message(reader, 1024, on_ping)
+    return asyncio.run(run())
+
+
+def test_fragmented_message_is_joined():
+    data = client_frame(b"hel", OP_TEXT, final=False) + client_frame(b"lo", OP_CONTINUATION)
+    assert read(data) == (OP_TEXT, b"hello")
+
+
+def test_ping_between_fragments_keeps_the_message():
+    pings = []
+    data = (client_frame(b"hel", OP_TEXT, final=False) + client_frame(b"are you there", OP_PING)
+            + client_frame(b"", OP_PONG) + client_frame(b"lo", OP_CONTINUATION))
+    assert read(data, pings.append) == (OP_TEXT, b"hello")
+    assert pings == [b"are you there"]
+
+
+def test_ping_before_a_message_is_answered_and_skipped():
+    pings = []
+    data = client_frame(b"x", OP_PING) + client_frame(b"\x01\x02", OP_BINARY)
+    assert read(data, pings.append) == (OP_BINARY, b"\x01\x02")
+    assert pings == [b"x"]
+
+
+def test_continuation_without_a_message_is_rejected():
+    with pytest.raises(WebSocketError):
+        read(client_frame(b"lo", OP_CONTINUATION))
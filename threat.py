@@ -1,12 +1,26 @@
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 import random
-from security_common import SecurityStrategy
 
 if TYPE_CHECKING:
     from vpc_defender import VPCDefender
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class ThreatTemplate:
+    """
+    Immutable definition of a threat; battles use mutable Threat instances made from it.
+    `weight` is its relative spawn chance among the templates of a region.
+    """
+    name: str
+    attack_type: str
+    power: int
+    persistence: int
+    adaptability: int
+    scale: int = 1
+    weight: float = 1.0
+
+
+@dataclass(slots=True)
 class Threat:
     name: str
     attack_type: str
@@ -15,25 +29,29 @@ class Threat:
     adaptability: int
     scale: int
 
-    def calculate_damage(self, defender: 'VPCDefender') -> int:
+    def calculate_damage(self, defender: 'VPCDefender', rng=random) -> int:
         """
         Calculates the damage inflicted by the threat on the defender.
+        `rng` only needs a randint(a, b) method; defaults to the random module.
         """
-        base_damage = random.randint(self.power - 5, self.power + 5)
+        base_damage = rng.randint(self.power - 5, self.power + 5)
         
         # Incorporate persistence and adaptability into the damage calculation
         persistence_factor = self.persistence / 10
         adaptability_factor = self.adaptability / 10
         base_damage = int(base_damage * (1 + persistence_factor + adaptability_factor))
         
-        # Apply defender's defensive measures
-        for measure in defender.active_measures:
-            if measure.strategy == SecurityStrategy.DEFENSIVE:
-                base_damage = max(0, base_damage - measure.effectiveness)
+        # Apply defender's defensive measures (their running total; clamping
+        # once equals clamping per measure because effectiveness is never negative)
+        if defender.has_defense:
+            base_damage = max(0, base_damage - defender.defensive_power)
         
         # Apply defender's stats for further damage reduction
         damage_reduction = (defender.stats.fault_tolerance +
                             defender.stats.resilience) / 100
         final_damage = int(base_damage * (1 - damage_reduction))
+
+        # Active debuffs make every hit land harder
+        final_damage += defender.status_effects.debuff_total
         
         return final_damage
\ No newline at end of file
@@ -1,41 +1,138 @@
 # threat_generator.py
 
-from threat import Threat
-from typing import Dict
-
-
-def generate_threat_for_region(region: str) -> Threat:
-    """
-    Generates a threat based on the region.
-    """
-    region_threats = {
-        "US East (N. Virginia)": Threat(
-            name="DDoS Attack",
-            attack_type="Network Flood",
-            power=25,
-            persistence=3,
-            adaptability=60
-        ),
-        "US West (Oregon)": Threat(
-            name="Data Breach",
-            attack_type="Unauthorized Access",
-            power=30,
-            persistence=4,
-            adaptability=70
-        ),
-        "Special Region": Threat(
-            name="Advanced Threat",
-            attack_type="Multi-vector Attack",
-            power=35,
-            persistence=5,
-            adaptability=80
-        ),
-        # Add more regions and corresponding threats
-    }
-    return region_threats.get(region, Threat(
-        name="Generic Threat",
-        attack_type="Unknown",
-        power=20,
-        persistence=2,
-        adaptability=50
-    ))
+import random
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+from alias_sampler import AliasTable
+from threat import Threat, ThreatTemplate
+from content_pack import ContentPack
+
+# Difficulty added per defender level above 1
+POWER_PER_LEVEL = 3
+ADAPTABILITY_PER_LEVEL = 2
+LEVELS_PER_PERSISTENCE = 3  # +1 persistence every few levels
+MAX_ADAPTABILITY = 100
+SESSIONS_PER_LEVEL = 2  # Every few sessions, threats act one level stronger
+
+
+def effective_level(level: int = 1, session: int = 1) -> int:
+    return max(1, level) + max(0, session - 1) // SESSIONS_PER_LEVEL
+
+
+def scaled_stats(template: ThreatTemplate, level: int = 1, session: int = 1) -> Tuple[int, int, int, int]:
+    """
+    (power, persistence, adaptability, scale) of a template at a defender
+    level and session number. Level 1 in session 1 is the template itself.
+    """
+    bonus = effective_level(level, session) - 1
+    return (template.power + POWER_PER_LEVEL * bonus,
+            template.persistence + bonus // LEVELS_PER_PERSISTENCE,
+            min(MAX_ADAPTABILITY, template.adaptability + ADAPTABILITY_PER_LEVEL * bonus),
+            template.scale + bonus)
+
+
+class ThreatPool:
+    """
+    Free list of Threat instances. Battles mutate their threat, so released
+    instances are reset from a template instead of allocating new ones.
+    """
+
+    def __init__(self):
+        self._free: List[Threat] = []
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    def acquire(self, template: ThreatTemplate, level: int = 1, session: int = 1) -> Threat:
+        power, persistence, adaptability, scale = scaled_stats(template, level, session)
+        if not self._free:
+            return Threat(template.name, template.attack_type, power, persistence, adaptability, scale)
+        threat = self._free.pop()
+        threat.name = template.name
+        threat.attack_type = template.attack_type
+        threat.power = power
+        threat.persistence = persistence
+        threat.adaptability = adaptability
+        threat.scale = scale
+        return threat
+
+    def release(self, threat: Threat):
+        """
+        Returns a threat to the pool; the caller must not use it afterwards.
+        """
+        self._free.append(threat)
+
+
+class ThreatRegistry:
+    """
+    Immutable threat templates keyed by region, with weighted selection and
+    level/session scaling. Battle instances come from a ThreatPool.
+
+    Each region's spawn table is an AliasTable built once, so a draw is O(1)
+    however many archetypes the region lists.
+    """
+
+    def __init__(self, templates: Dict[str, Sequence[ThreatTemplate]], default: ThreatTemplate,
+                 pool: Optional[ThreatPool] = None):
+        self.templates: Dict[str, Tuple[ThreatTemplate, ...]] = {
+            region: tuple(entries) for region, entries in templates.items() if entries
+        }
+        self.default_template = default
+        self.pool = pool or ThreatPool()
+        self.spawn_tables: Dict[str, AliasTable[ThreatTemplate]] = {
+            region: AliasTable(entries, [template.weight for template in entries])
+            for region, entries in self.templates.items()
+        }
+
+    @classmethod
+    def from_pack(cls, pack: ContentPack) -> 'ThreatRegistry':
+        return cls(pack.threat_templates, pack.default_threat)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def default(cls) -> 'ThreatRegistry':
+        """
+        The shared registry for the process's content pack.
+        """
+        return cls.from_pack(ContentPack.default())
+
+    def templates_for(self, region: str) -> Tuple[ThreatTemplate, ...]:
+        return self.templates.get(region, (self.default_template,))
+
+    def choose(self, region: str, rng=random) -> ThreatTemplate:
+        """
+        Picks a template for the region by weight. A region with a single
+        template does not consume any randomness.
+        """
+        table = self.spawn_tables.get(region)
+        if table is None:
+            return self.default_template
+        if len(table) == 1:
+            return table.items[0]
+        return table.sample(rng)
+
+    def choose_many(self, region: str, count: int, rng=random) -> List[ThreatTemplate]:
+        """
+        `count` weighted draws for the region, for bulk simulation.
+        """
+        table = self.spawn_tables.get(region)
+        if table is None:
+            return [self.default_template] * count
+        return table.sample_many(count, rng)
+
+    def spawn(self, region: str, level: int = 1, rng=random, session: int = 1) -> Threat:
+        """
+        A battle-ready threat for the region, scaled to the defender's level
+        and the session number. Hand it back with release() once the battle is over.
+        """
+        return self.pool.acquire(self.choose(region, rng), level, session)
+
+    def release(self, threat: Threat):
+        self.pool.release(threat)
+
+
+def generate_threat_for_region(region: str, level: int = 1, rng=random, session: int = 1) -> Threat:
+    """
+    Generates a threat based on the region, the defender's level and the session.
+    """
+    return ThreatRegistry.default().spawn(region, level, rng, session)
@@ -1,5 +1,15 @@
 import tkinter as tk
-from game_engine import GameEngine
+from battle_policy import ConsoleSink, GamePhase
+from game_engine import GAME_MESSAGES, GameEngine
+
+DECISION_PROMPTS = {
+    GamePhase.MOVE: "{name}: roll the die or draw a card to move?",
+    GamePhase.SETUP: "{name}: implement a security measure, or finish setup?",
+    GamePhase.MEASURE: "{name}: which security measure?",
+    GamePhase.BATTLE_ACTION: "{name}: attack or cast a spell?",
+    GamePhase.BATTLE_SPELL: "{name}: which spell?",
+    GamePhase.CONTINUE: "{name}: continue to the next turn?",
+}
 
 class GameUI:
     def __init__(self, root, font_style=("Helvetica", 16), text_color="white", bg_color="black", max_messages=100):
@@ -32,6 +42,7 @@ class GameUI:
         if len(self.messages) >= self.max_messages:
             self.messages.pop(0)  # Remove the oldest message to maintain the queue size
         self.messages.append(message)
+        self.next_button.config(state="normal")
         if len(self.messages) == 1:  # If this is the first message, display it immediately
             self.show_message()
 
@@ -75,10 +86,25 @@ class GameUI:
             button.pack(pady=5)
             option_buttons.append(button)
 
+class UISink(ConsoleSink):
+    """
+    Shows game events in the dialogue box instead of printing them.
+    """
+
+    def __init__(self, ui: GameUI):
+        super().__init__(GAME_MESSAGES)
+        self.ui = ui
+
+    def emit(self, kind: str, **data):
+        text = self.format(kind, **data)
+        if text is not None:
+            self.ui.add_message(text.strip())
+
+
 class GameController:
     def __init__(self, root):
         self.ui = GameUI(root)
-        self.engine = GameEngine()
+        self.engine = GameEngine(sink=UISink(self.ui))
 
         # Start the game when the UI is ready
         self.ui.add_message("Welcome to the Cloud Security Battle!")
@@ -87,6 +113,7 @@ class GameController:
 
     def start_game(self):
         self.ui.reset_ui()  # Reset UI to handle clean restarts
+        self.ui.next_button.config(command=self.ui.next_message)
         self.ui.add_message("Initializing game...")
         self.ui.add_message("Enter the number of players:")
 
@@ -96,8 +123,9 @@ class GameController:
                 entry.delete(0, tk.END)  # Clear the entry field
                 entry.config(state="disabled")  # Disable the entry field
                 submit_button.config(state="disabled")  # Disable the submit button
-                self.engine.initialize_game(number_of_players)
-                self.play_next_turn()
+                self.engine.initialize_game(
+                    player_names=[f"Player {i + 1}" for i in range(number_of_players)])
+                self.show_decision(self.engine.start())
             except ValueError:
                 self.ui.add_message("Invalid input. Please enter a number.")
 
@@ -108,19 +136,20 @@ class GameController:
         )
         submit_button.pack()
 
-    def play_next_turn(self):
-        self.ui.add_message("Playing the next turn...")
-        # Logic to play a turn via the GameUI (replace print and input)
-
-        # Example of using the GameUI for input:
-        def on_user_choice(choice):
-            self.ui.add_message(f"You selected: {choice}")
-            # Handle game logic based on choice
-
+    def show_decision(self, decision):
+        """
+        Offers the engine's pending decision as buttons; each click resumes
+        the engine up to its next decision, so the UI never blocks.
+        """
+        if decision is None:
+            self.ui.add_message(f"Game over! The winner is {self.engine.winner}.")
+            return
+        who = decision.player or decision.defender
+        prompt = DECISION_PROMPTS[decision.phase].format(name=who.name if who else "")
         self.ui.show_options(
-            "What would you like to do?",
-            ["Roll dice", "Draw card"],
-            callback=on_user_choice
+            prompt,
+            decision.options or ("skip",),
+            callback=lambda choice: self.show_decision(self.engine.submit(choice))
         )
 
 if __name__ == "__main__":
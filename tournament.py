@@ -0,0 +1,134 @@
+# tournament.py
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+from battle_policy import AutoPlayPolicy, NullSink
+from content_pack import ContentPack
+from game_engine import GameEngine
+from game_rng import GameRNG
+from snapshot import Checkpointer, SnapshotError, resume
+
+
+@dataclass(frozen=True)
+class TournamentSettings:
+    """
+    Rules shared by every game in a tournament.
+    """
+    max_sessions: int = 5
+    winning_score: int = 500
+    turns_per_session: int = 3
+
+
+@dataclass(frozen=True)
+class GameSpec:
+    """
+    One independent game: its table of players and its RNG seed.
+    """
+    players: Tuple[str, ...]
+    seed: str
+
+
+def game_seed(tournament_seed, round_index: int, table: int) -> str:
+    """
+    Derives a per-game seed, so each game's stream is the same in every worker
+    and independent of how games are sharded.
+    """
+    return GameRNG(tournament_seed).spawn(round_index, table).seed
+
+
+def play_game(spec: GameSpec, settings: TournamentSettings,
+              checkpoint_dir: Optional[str] = None) -> Dict[str, int]:
+    """
+    Plays one headless AI-vs-AI game and returns its player_points. With
+    `checkpoint_dir`, the game is checkpointed every turn and, when run
+    again after a crash, resumes from its last checkpoint.
+    """
+    policy = AutoPlayPolicy(max_turns=settings.turns_per_session)
+    engine = path = None
+    if checkpoint_dir is not None:
+        path = os.path.join(checkpoint_dir, spec.seed.replace("/", "-") + ".ckpt")
+        if os.path.exists(path):
+            try:
+                engine = resume(path, policy=policy, sink=NullSink())
+            except SnapshotError:
+                pass  # Crashed before the first checkpoint: start over
+    resumed = engine is not None
+    if not resumed:
+        engine = GameEngine(policy=policy, sink=NullSink(), rng=GameRNG(spec.seed))
+        engine.max_sessions = settings.max_sessions
+        engine.winning_score = settings.winning_score
+        for name in spec.players:
+            engine.add_player(name)
+    if path is None:
+        engine.play_sessions()
+        return engine.player_points
+    engine.checkpointer = Checkpointer.open(path, append=resumed)
+    try:
+        engine.play_sessions()
+    finally:
+        engine.checkpointer.close()
+    return engine.player_points
+
+
+def _play_shard(shard: Tuple[Sequence[GameSpec], TournamentSettings, Optional[str]]) -> Counter:
+    specs, settings, checkpoint_dir = shard
+    points = Counter()
+    for spec in specs:
+        points.update(play_game(spec, settings, checkpoint_dir))
+    return points
+
+
+def schedule_games(players: Sequence[str], players_per_game: int, rounds: int, seed) -> List[GameSpec]:
+    """
+    Splits the players into tables, reshuffling them (deterministically) every round.
+    """
+    specs = []
+    order = list(players)
+    for round_index in range(rounds):
+        GameRNG(game_seed(seed, round_index, "tables")).shuffle(order)
+        for table, start in enumerate(range(0, len(order), players_per_game)):
+            specs.append(GameSpec(tuple(order[start:start + players_per_game]),
+                                  game_seed(seed, round_index, table)))
+    return specs
+
+
+def run_tournament(players: Sequence[str], players_per_game: int = 4, rounds: int = 1,
+                   settings: TournamentSettings = TournamentSettings(), seed=0,
+                   workers: Optional[int] = None, checkpoint_dir: Optional[str] = None) -> List[Tuple[str, int]]:
+    """
+    Plays every scheduled game across a process pool and returns the merged
+    leaderboard, highest score first. With `checkpoint_dir`, every game is
+    checkpointed there each turn, and rerunning the same tournament after a
+    crash resumes each game from where it stopped.
+    """
+    specs = schedule_games(players, players_per_game, rounds, seed)
+    if checkpoint_dir is not None:
+        os.makedirs(checkpoint_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    # A few shards per worker keeps the pool busy without per-game IPC overhead.
+    shard_count = min(len(specs), workers * 4) or 1
+    shards = [(specs[i::shard_count], settings, checkpoint_dir) for i in range(shard_count)]
+
+    leaderboard = Counter({name: 0 for name in players})
+    if workers == 1:
+        for shard in shards:
+            leaderboard.update(_play_shard(shard))
+    else:
+        # Each worker loads the compiled content pack once, up front.
+        with ProcessPoolExecutor(max_workers=workers, initializer=ContentPack.default) as pool:
+            for points in pool.map(_play_shard, shards):
+                leaderboard.update(points)
+    return sorted(leaderboard.items(), key=lambda item: (-item[1], item[0]))
+
+
+if __name__ == "__main__":
+    bots = [f"bot-{i:05d}" for i in range(2000)]
+    started = time.perf_counter()
+    standings = run_tournament(bots, rounds=2)
+    elapsed = time.perf_counter() - started
+    print(f"Played {len(bots)} players x 2 rounds in {elapsed:.2f}s on {os.cpu_count()} cores")
+    for rank, (name, points) in enumerate(standings[:10], start=1):
+        print(f"{rank:>3}. {name}: {points} points")
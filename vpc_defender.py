@@ -1,20 +1,30 @@
-from typing import List
 from character_stats import CharacterStats
-from security_measures import SecurityMeasure, SecurityMeasures
+from security_measures import ActiveMeasures, SecurityMeasures
 from security_common import SecurityStrategy
 from resources import Resources
+from status_effects import StatusEffects
+from spells import SpellRegistry
 
 class VPCDefender:
+    __slots__ = ("name", "stats", "level", "max_health", "current_health", "catalog", "offensive_measures",
+                 "defensive_measures", "hybrid_measures", "active_measures", "preparation_points",
+                 "resources", "status_effects", "spell_registry", "spell_ready")
+
     def __init__(self, name: str, stats: CharacterStats):
         self.name = name
         self.stats = stats
         self.level = 1
         self.max_health = self.calculate_max_health()
         self.current_health = self.max_health
-        self.offensive_measures = SecurityMeasures().get_offensive_measures()
-        self.defensive_measures = SecurityMeasures().get_defensive_measures()
-        self.hybrid_measures = SecurityMeasures().get_hybrid_measures()
-        self.active_measures: List[SecurityMeasure] = []
+        measures = SecurityMeasures()  # Shared definitions; nothing is copied per defender
+        self.catalog = measures.catalog
+        self.offensive_measures = measures.get_offensive_measures()
+        self.defensive_measures = measures.get_defensive_measures()
+        self.hybrid_measures = measures.get_hybrid_measures()
+        self.active_measures = ActiveMeasures()
+        self.status_effects = StatusEffects()
+        self.spell_registry = SpellRegistry.default()  # Shared, read-only
+        self.spell_ready = {}  # spell key -> status_effects round it can be cast again
         self.preparation_points = 100
         self.resources = Resources(
             compute_points=100,
@@ -28,16 +38,76 @@ class VPCDefender:
     def is_alive(self) -> bool:
         return self.current_health > 0
 
+    @property
+    def offensive_power(self) -> int:
+        return self.active_measures.effectiveness(SecurityStrategy.OFFENSIVE) + self.status_effects.buff_total
+
+    @property
+    def defensive_power(self) -> int:
+        return self.active_measures.effectiveness(SecurityStrategy.DEFENSIVE)
+
+    @property
+    def hybrid_power(self) -> int:
+        return self.active_measures.effectiveness(SecurityStrategy.HYBRID)
+
+    @property
+    def has_defense(self) -> bool:
+        return self.active_measures.count(SecurityStrategy.DEFENSIVE) > 0
+
+    def clear_active_measures(self):
+        self.active_measures.clear()
+
+    def take_damage(self, amount: int):
+        self.current_health = max(0, self.current_health - max(0, amount))
+
     def level_up(self):
         self.level += 1
         self.max_health = self.calculate_max_health()
         self.current_health = self.max_health
-        print(f"{self.name} has leveled up to Level {self.level}!")
 
     def add_active_measure(self, measure_name: str) -> str:
-        measure = next((m for m in self.defensive_measures + self.offensive_measures + self.hybrid_measures if m.name.lower() == measure_name.lower()), None)
+        measure = self.catalog.get(measure_name)
+        if measure and measure in self.active_measures:
+            return f"{measure.name} is already active."
         if measure and self.preparation_points >= measure.cost:
-            self.active_measures.append(measure)
+            self.active_measures.add(measure)
             self.preparation_points -= measure.cost
             return f"Implemented {measure.name} with effectiveness bonus of {measure.effectiveness}."
-        return "Insufficient preparation points or invalid measure."
\ No newline at end of file
+        return "Insufficient preparation points or invalid measure."
+
+    @property
+    def spells(self):
+        return self.spell_registry.spells
+
+    def can_cast(self, spell_key: str) -> bool:
+        spell = self.spell_registry.spells.get(spell_key)
+        return (spell is not None
+                and self.spell_ready.get(spell_key, 0) <= self.status_effects.round
+                and self.resources.can_afford(*spell.cost_vector))
+
+    def first_castable_spell(self):
+        """
+        Key of the first spell that is off cooldown and affordable, or None.
+        """
+        now = self.status_effects.round
+        resources = self.resources
+        for key, spell in self.spell_registry.spells.items():
+            compute, network, storage = spell.cost_vector
+            if (self.spell_ready.get(key, 0) <= now and resources.compute_points >= compute
+                    and resources.network_bandwidth >= network and resources.storage_capacity >= storage):
+                return key
+        return None
+
+    def cast_spell(self, spell_key: str) -> str:
+        spell = self.spell_registry.get(spell_key)
+        if spell is None:
+            return f"Unknown spell: {spell_key}"
+        now = self.status_effects.round
+        ready = self.spell_ready.get(spell.key, 0)
+        if ready > now:
+            return f"{spell.name} is on cooldown for {ready - now} more round(s)."
+        if not spell.cast(self):
+            return f"Insufficient resources to cast {spell.name}."
+        if spell.cooldown:
+            self.spell_ready[spell.key] = now + spell.cooldown
+        return f"Cast {spell.name}: {spell.description}."
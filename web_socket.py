@@ -0,0 +1,110 @@
+# web_socket.py
+import asyncio
+import base64
+import hashlib
+import struct
+from typing import Callable, Dict, Optional, Tuple
+
+GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+
+class WebSocketError(ValueError):
+    pass
+
+
+async def read_http_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+    """
+    Reads request headers up to the blank line, with lower-cased names.
+    """
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if not line or line in (b"\r\n", b"\n"):
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+def handshake_response(headers: Dict[str, str]) -> bytes:
+    """
+    The 101 response accepting a WebSocket upgrade (RFC 6455 section 4.2.2).
+    """
+    key = headers.get("sec-websocket-key")
+    if headers.get("upgrade", "").lower() != "websocket" or not key:
+        raise WebSocketError("Not a WebSocket upgrade request")
+    accept = base64.b64encode(hashlib.sha1((key + GUID).encode()).digest()).decode()
+    return ("HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode()
+
+
+def encode_frame(payload: bytes, opcode: int = OP_BINARY) -> bytes:
+    """
+    One unmasked, unfragmented server-to-client frame.
+    """
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+async def read_frame(reader: asyncio.StreamReader, max_size: int) -> Tuple[bool, int, bytes]:
+    """
+    Reads one client frame and returns (final fragment, opcode, unmasked payload).
+    """
+    first, second = await reader.readexactly(2)
+    opcode, length = first & 0x0F, second & 0x7F
+    if length == 126:
+        length, = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        length, = struct.unpack("!Q", await reader.readexactly(8))
+    if length > max_size:
+        raise WebSocketError(f"Frame of {length} bytes is over the {max_size} byte limit")
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask is not None:
+        # XOR with the repeated 4-byte mask as one big-int operation
+        repeated = (mask * (length // 4 + 1))[:length]
+        payload = (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(length, "big")
+    return bool(first & 0x80), opcode, payload
+
+
+async def read_message(reader: asyncio.StreamReader, max_size: int,
+                       on_ping: Optional[Callable[[bytes], None]] = None) -> Optional[Tuple[int, bytes]]:
+    """
+    Reads the next data message as (opcode, payload), joining fragmented
+    frames. Control frames may arrive between fragments: pings are handed
+    to `on_ping` and pongs dropped without losing the message being read.
+    None means the client sent a close frame.
+    """
+    message_opcode, parts, size = None, [], 0
+    while True:
+        final, opcode, payload = await read_frame(reader, max_size)
+        if opcode == OP_CLOSE:
+            return None
+        if opcode in (OP_PING, OP_PONG):
+            if opcode == OP_PING and on_ping is not None:
+                on_ping(payload)
+            continue
+        if opcode != OP_CONTINUATION:
+            message_opcode = opcode
+        elif message_opcode is None:
+            raise WebSocketError("Continuation frame without a message to continue")
+        size += len(payload)
+        if size > max_size:
+            raise WebSocketError(f"Message is over the {max_size} byte limit")
+        parts.append(payload)
+        if final:
+            return message_opcode, b"".join(parts)
@@ -1,28 +1,207 @@
+// webgl.js
+// Browser client for game_server.py: receives binary keyframe/delta state
+// frames over a WebSocket (format in state_sync.py), draws the players on
+// the board with WebGL, and sends the player's answers back.
+
+const KEYFRAME = 0x4B; // "K"
+const DELTA = 0x44;    // "D"
+const MARKER_COLOURS = [[1, 0.3, 0.3], [0.3, 1, 0.3], [0.3, 0.6, 1], [1, 0.9, 0.2], [1, 0.4, 1], [0.2, 1, 1]];
+
+const sync = { sequence: 0, state: null, layout: null, game: null };
+const textDecoder = new TextDecoder();
+
+// --- Frame decoding -------------------------------------------------------
+
+function decodeFrame(buffer) {
+    const view = new DataView(buffer);
+    const kind = view.getUint8(0);
+    const sequence = view.getUint32(1, true);
+    const count = view.getUint16(5, true);
+    let offset = 7;
+    let state;
+    if (kind === KEYFRAME) {
+        state = new Int32Array(count);
+        for (let i = 0; i < count; i++, offset += 4) state[i] = view.getInt32(offset, true);
+    } else {
+        state = Int32Array.from(sync.state);
+        for (let i = 0; i < count; i++, offset += 6) {
+            state[view.getUint16(offset, true)] = view.getInt32(offset + 2, true);
+        }
+    }
+    const length = view.getUint32(offset, true);
+    const tail = length ? JSON.parse(textDecoder.decode(new Uint8Array(buffer, offset + 4, length))) : {};
+    return { kind, sequence, state, tail };
+}
+
+function playerField(index, field) {
+    const layout = sync.layout;
+    const base = layout.game_fields.length + index * layout.player_fields.length;
+    return sync.state[base + layout.player_fields.indexOf(field)];
+}
+
+// --- WebGL markers --------------------------------------------------------
+
 const canvas = document.createElement('canvas');
-document.body.appendChild(canvas);
+canvas.className = 'overlay';
+document.querySelector('.container').appendChild(canvas);
 const gl = canvas.getContext('webgl');
 
-// Shader sources
 const vertexShaderSource = `
-    attribute vec4 position;
-    uniform mat4 matrix;
+    attribute vec2 position;
+    attribute vec3 colour;
+    varying vec3 vColour;
     void main() {
-        gl_Position = matrix * position;
+        gl_Position = vec4(position, 0.0, 1.0);
+        gl_PointSize = 22.0;
+        vColour = colour;
     }
 `;
 const fragmentShaderSource = `
+    precision mediump float;
+    varying vec3 vColour;
     void main() {
-        gl_FragColor = vec4(0.0, 1.0, 0.0, 1.0);
+        if (length(gl_PointCoord - vec2(0.5)) > 0.5) discard;
+        gl_FragColor = vec4(vColour, 1.0);
     }
 `;
 
-// Shader compilation omitted for brevity
-// Setup buffers, compile shaders, set up uniform matrix, etc.
+function compileShader(type, source) {
+    const shader = gl.createShader(type);
+    gl.shaderSource(shader, source);
+    gl.compileShader(shader);
+    if (!gl.getShaderParameter(shader, gl.COMPILE_STATUS)) throw new Error(gl.getShaderInfoLog(shader));
+    return shader;
+}
+
+const program = gl.createProgram();
+gl.attachShader(program, compileShader(gl.VERTEX_SHADER, vertexShaderSource));
+gl.attachShader(program, compileShader(gl.FRAGMENT_SHADER, fragmentShaderSource));
+gl.linkProgram(program);
+gl.useProgram(program);
+const vertexBuffer = gl.createBuffer();
+const positionAttribute = gl.getAttribLocation(program, 'position');
+const colourAttribute = gl.getAttribLocation(program, 'colour');
+
+// Regions sit on an ellipse in board order; players on the same region fan out.
+function markerVertices() {
+    const regions = sync.layout.board.regions.length;
+    const vertices = [];
+    sync.layout.players.forEach((name, index) => {
+        const angle = 2 * Math.PI * playerField(index, 'position') / regions + index * 0.04;
+        const colour = MARKER_COLOURS[index % MARKER_COLOURS.length];
+        vertices.push(0.8 * Math.cos(angle), 0.7 * Math.sin(angle), ...colour);
+    });
+    return new Float32Array(vertices);
+}
+
+let dirty = false;
 
-// Animation loop
 function animate() {
-    // Update matrix for rotation
-    // Render using WebGL API
+    if (dirty && sync.layout) {
+        canvas.width = canvas.clientWidth;
+        canvas.height = canvas.clientHeight;
+        gl.viewport(0, 0, canvas.width, canvas.height);
+        gl.clearColor(0, 0, 0, 0);
+        gl.clear(gl.COLOR_BUFFER_BIT);
+        const vertices = markerVertices();
+        gl.bindBuffer(gl.ARRAY_BUFFER, vertexBuffer);
+        gl.bufferData(gl.ARRAY_BUFFER, vertices, gl.DYNAMIC_DRAW);
+        gl.enableVertexAttribArray(positionAttribute);
+        gl.vertexAttribPointer(positionAttribute, 2, gl.FLOAT, false, 20, 0);
+        gl.enableVertexAttribArray(colourAttribute);
+        gl.vertexAttribPointer(colourAttribute, 3, gl.FLOAT, false, 20, 8);
+        gl.drawArrays(gl.POINTS, 0, vertices.length / 5);
+        dirty = false;
+    }
     requestAnimationFrame(animate);
 }
 animate();
+
+// --- Panel ----------------------------------------------------------------
+
+const playersList = document.getElementById('players');
+const eventLog = document.getElementById('events');
+const promptLine = document.getElementById('prompt');
+const options = document.getElementById('options');
+
+function renderPlayers() {
+    const regions = sync.layout.board.regions;
+    playersList.innerHTML = '';
+    sync.layout.players.forEach((name, index) => {
+        const item = document.createElement('li');
+        item.textContent = `${name}: ${regions[playerField(index, 'position')].name}, ` +
+            `${playerField(index, 'points')} pts, health ${playerField(index, 'health')}` +
+            `/${playerField(index, 'max_health')}, level ${playerField(index, 'level')}, ` +
+            `${playerField(index, 'measures')} measures`;
+        playersList.appendChild(item);
+    });
+}
+
+function logEvents(events) {
+    for (const [kind, data] of events) {
+        const line = document.createElement('div');
+        line.textContent = `${kind} ${JSON.stringify(data)}`;
+        eventLog.prepend(line);
+    }
+    while (eventLog.childElementCount > 200) eventLog.lastChild.remove();
+}
+
+function showDecision(tail) {
+    options.innerHTML = '';
+    if (tail.decision === null || tail.decision === undefined) {
+        promptLine.textContent = tail.winner ? `Game over! The winner is ${tail.winner}.` : '';
+        return;
+    }
+    const decision = tail.decision;
+    promptLine.textContent = `${decision.player || ''}: ${decision.phase} (turn ${decision.turn})`;
+    for (const option of decision.options) {
+        const button = document.createElement('button');
+        button.textContent = option;
+        button.onclick = () => send({ op: 'submit', game: sync.game, answer: option });
+        options.appendChild(button);
+    }
+}
+
+// --- Connection -----------------------------------------------------------
+
+const socket = new WebSocket(`ws://${location.host || 'localhost:8765'}/ws`);
+socket.binaryType = 'arraybuffer';
+
+function send(command) {
+    socket.send(JSON.stringify(command));
+}
+
+socket.onopen = () => {
+    const params = new URLSearchParams(location.search);
+    if (params.has('game')) {
+        send({ op: 'join', game: Number(params.get('game')), player: params.get('player') || undefined });
+    } else {
+        send({ op: 'create', players: (params.get('players') || 'Player 1,Player 2').split(',') });
+    }
+};
+
+socket.onmessage = (message) => {
+    if (typeof message.data === 'string') {
+        const reply = JSON.parse(message.data);
+        if (reply.type === 'error') logEvents([['error', reply.message]]);
+        return;
+    }
+    const kind = new Uint8Array(message.data, 0, 1)[0];
+    if (kind === DELTA && (sync.state === null ||
+            new DataView(message.data).getUint32(1, true) !== sync.sequence + 1)) {
+        // Missed a frame: deltas no longer apply, so ask for a keyframe
+        if (sync.game !== null) send({ op: 'sync', game: sync.game });
+        return;
+    }
+    const frame = decodeFrame(message.data);
+    sync.sequence = frame.sequence;
+    sync.state = frame.state;
+    if (frame.tail.layout) sync.layout = frame.tail.layout;
+    if (frame.tail.game !== undefined) sync.game = frame.tail.game;
+    logEvents(frame.tail.events || []);
+    if ('decision' in frame.tail) showDecision(frame.tail);
+    renderPlayers();
+    dirty = true;
+};
+
+socket.onclose = () => { promptLine.textContent = 'Disconnected from the game server.'; };